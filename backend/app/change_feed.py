@@ -0,0 +1,138 @@
+"""
+Feed de cambios en tiempo real (Postgres LISTEN/NOTIFY → suscriptores SSE).
+
+Cada proceso abre UNA conexión asyncpg dedicada con LISTEN lifehub_changes (los triggers
+de migrations/0007_change_notify.py hacen pg_notify al confirmar) y reparte cada evento
+a las colas de los suscriptores de ese usuario. Un cliente conectado cuesta una cola
+acotada y una corrutina; no hay consultas por cliente.
+
+Backpressure: si la cola de un cliente lento se llena se vacía y se marca como
+desbordada; el stream le envía un evento `resync` para que recargue con GET /sync.
+Lo mismo a todos los clientes si se pierde la conexión de LISTEN (pueden faltar eventos).
+"""
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+
+import asyncpg
+
+from app.database import DATABASE_URL
+
+# LISTEN necesita una sesión real: con PgBouncer en modo transacción apuntar aquí a Postgres directo
+CHANGE_FEED_DATABASE_URL = os.getenv("CHANGE_FEED_DATABASE_URL", DATABASE_URL)
+CHANGE_FEED_CHANNEL = "lifehub_changes"
+CHANGE_FEED_QUEUE_SIZE = int(os.getenv("CHANGE_FEED_QUEUE_SIZE", "256"))
+CHANGE_FEED_RECONNECT_SECONDS = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class Subscriber:
+    """Un cliente conectado: cola acotada de eventos del usuario."""
+
+    user_id: int
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=CHANGE_FEED_QUEUE_SIZE))
+    overflowed: bool = False
+
+    def push(self, event: dict) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.mark_overflowed()
+
+    def mark_overflowed(self) -> None:
+        """Descarta lo pendiente; el stream enviará `resync` en su lugar."""
+        self.overflowed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)  # despierta al stream
+
+
+class ChangeFeed:
+    def __init__(self, dsn: str) -> None:
+        self.dsn = dsn
+        self._subscribers: dict[int, set[Subscriber]] = {}
+        self._task: asyncio.Task | None = None
+        self.events_received = 0
+        self.events_dropped = 0
+
+    def subscribe(self, user_id: int) -> Subscriber:
+        self.start()
+        subscriber = Subscriber(user_id)
+        self._subscribers.setdefault(user_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        subscribers = self._subscribers.get(subscriber.user_id)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[subscriber.user_id]
+
+    def start(self) -> None:
+        """Arranca la tarea de LISTEN (idempotente). Se llama en el lifespan de la app."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        self.events_received += 1
+        event = json.loads(payload)
+        for subscriber in self._subscribers.get(event.pop("user_id"), ()):
+            if event.get("op") == "resync":  # cambio masivo (POST /import): recargar entero
+                subscriber.mark_overflowed()
+                continue
+            if subscriber.overflowed:
+                self.events_dropped += 1
+            subscriber.push(event)
+
+    async def _listen_forever(self) -> None:
+        """Mantiene la conexión de LISTEN; al reconectar pide resync a todos los clientes."""
+        first = True
+        while True:
+            try:
+                conn = await asyncpg.connect(self.dsn)
+            except (OSError, asyncpg.PostgresError) as exc:
+                logger.warning("Change feed: no se pudo conectar (%s); reintentando", exc)
+                await asyncio.sleep(CHANGE_FEED_RECONNECT_SECONDS)
+                continue
+            lost = asyncio.Event()
+            conn.add_termination_listener(lambda _conn: lost.set())
+            try:
+                await conn.add_listener(CHANGE_FEED_CHANNEL, self._on_notification)
+                if not first:
+                    for subscribers in self._subscribers.values():
+                        for subscriber in subscribers:
+                            subscriber.mark_overflowed()
+                first = False
+                await lost.wait()
+                logger.warning("Change feed: conexión de LISTEN perdida; reconectando")
+            finally:
+                if not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(CHANGE_FEED_RECONNECT_SECONDS)
+
+    def snapshot(self) -> dict:
+        return {
+            "listening": self._task is not None and not self._task.done(),
+            "users": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "events_received": self.events_received,
+            "events_dropped": self.events_dropped,
+        }
+
+
+change_feed = ChangeFeed(CHANGE_FEED_DATABASE_URL)
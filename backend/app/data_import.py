@@ -0,0 +1,429 @@
+"""
+Importación masiva (POST /import): el formato de GET /export (NDJSON, CSV o JSON) leído
+en streaming y cargado con COPY en una sola transacción.
+
+1. El cuerpo se parsea según llega (línea a línea, registro CSV a registro CSV, o valor a
+   valor en JSON) y cada fila se valida con los schemas ImportXRow.
+2. Las filas válidas se acumulan en bloques de IMPORT_CHUNK_ROWS y se copian con COPY a
+   tablas de staging temporales (ON COMMIT DROP).
+3. Al final, por tabla y en orden padre → hijo: se reservan ids nuevos con nextval, se
+   comprueban duplicados y referencias huérfanas, y un INSERT ... SELECT con JOIN contra el
+   staging del padre traduce los ids del fichero a los nuevos.
+
+Los triggers de NOTIFY se saltan (lifehub.skip_notify) y al final se manda un único
+evento `resync` al usuario: los clientes recargan con GET /sync en vez de recibir una
+notificación por fila.
+"""
+import codecs
+import csv
+import json
+import os
+import time
+import zlib
+from collections.abc import AsyncIterator
+
+import orjson
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.change_feed import CHANGE_FEED_CHANNEL
+from app.schemas import ImportAreaRow, ImportNextActionRow, ImportProjectRow, ImportRow
+
+IMPORT_CHUNK_ROWS = int(os.getenv("IMPORT_CHUNK_ROWS", "5000"))
+IMPORT_MAX_ROWS = int(os.getenv("IMPORT_MAX_ROWS", "1000000"))
+# Una fila (línea NDJSON, registro CSV, objeto JSON) no puede pasar de esto: un fichero
+# mal formado no debe hacer crecer el buffer hasta el final del cuerpo.
+IMPORT_MAX_ROW_BYTES = 1024 * 1024
+IMPORT_MAX_ERRORS = 20
+
+# Claves del JSON de GET /export → `type` de la fila
+JSON_TABLE_KEYS = {
+    "areas": "area",
+    "projects": "project",
+    "project_next_actions": "project_next_action",
+    "one_shot_tasks": "one_shot_task",
+}
+
+_row_adapter = TypeAdapter(ImportRow)
+
+
+class ImportFormatError(ValueError):
+    """El cuerpo no se puede leer en el formato indicado."""
+
+
+# --- Lectura del cuerpo ---
+
+async def gunzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    decompressor = zlib.decompressobj(31)  # wbits 31 = formato gzip
+    async for chunk in chunks:
+        try:
+            data = decompressor.decompress(chunk)
+        except zlib.error as exc:
+            raise ImportFormatError(f"gzip inválido: {exc}") from None
+        if data:
+            yield data
+    yield decompressor.flush()
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Líneas completas (con su '\\n') según van llegando los trozos."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            yield buffer[start : end + 1]
+            start = end + 1
+        buffer = buffer[start:]
+        if len(buffer) > IMPORT_MAX_ROW_BYTES:
+            raise ImportFormatError("línea demasiado larga")
+    if buffer:
+        yield buffer
+
+
+async def ndjson_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    async for line in _lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            row = orjson.loads(line)
+        except orjson.JSONDecodeError as exc:
+            raise ImportFormatError(f"JSON inválido: {exc}") from None
+        if not isinstance(row, dict):
+            raise ImportFormatError("cada línea debe ser un objeto")
+        yield row
+
+
+async def csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    """
+    CSV con cabecera (la de GET /export). Un registro puede ocupar varias líneas si un
+    campo entrecomillado lleva saltos de línea: se junta hasta que las comillas cuadran.
+    Las celdas vacías son null.
+    """
+    header = None
+    record: list[str] = []
+    quotes = 0
+    line_number = 0
+    async for raw in _lines(chunks):
+        line_number += 1
+        try:
+            line = raw.decode("utf-8-sig" if header is None and not record else "utf-8")
+        except UnicodeDecodeError:
+            raise ImportFormatError(f"CSV inválido: UTF-8 incorrecto en la línea {line_number}") from None
+        record.append(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            if sum(map(len, record)) > IMPORT_MAX_ROW_BYTES:
+                raise ImportFormatError("registro CSV demasiado largo")
+            continue
+        try:
+            values = next(csv.reader(record), [])
+        except csv.Error as exc:
+            raise ImportFormatError(f"CSV inválido: {exc}") from None
+        record, quotes = [], 0
+        if not values:
+            continue
+        if header is None:
+            header = values
+            continue
+        yield {name: value for name, value in zip(header, values) if value != ""}
+    if record:
+        raise ImportFormatError("CSV inválido: comillas sin cerrar")
+
+
+class _JsonReader:
+    """Lector incremental de JSON: valores completos con raw_decode, leyendo más si hace falta."""
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        self._chunks = chunks.__aiter__()
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self._bytes_read = 0
+
+    async def _more(self) -> bool:
+        """Añade el siguiente trozo al buffer; False si ya no queda cuerpo."""
+        if self.eof:
+            return False
+        pending = len(self._decoder.getstate()[0])
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.eof = True
+            chunk = b""
+        try:
+            data = self._decoder.decode(chunk, final=self.eof)
+        except UnicodeDecodeError as exc:
+            # exc.start cuenta desde los bytes pendientes del trozo anterior
+            offset = self._bytes_read - pending + exc.start
+            raise ImportFormatError(f"JSON inválido: UTF-8 incorrecto en el byte {offset}") from None
+        self._bytes_read += len(chunk)
+        self.buffer = self.buffer[self.pos :] + data
+        self.pos = 0
+        if len(self.buffer) > IMPORT_MAX_ROW_BYTES:
+            raise ImportFormatError("valor JSON demasiado largo")
+        return True
+
+    async def peek(self) -> str:
+        """Siguiente carácter que no es espacio ('' al final del cuerpo)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not await self._more():
+                return ""
+
+    async def expect(self, char: str) -> None:
+        if await self.peek() != char:
+            raise ImportFormatError(f"JSON inválido: se esperaba '{char}'")
+        self.pos += 1
+
+    async def value(self):
+        await self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as exc:
+                if await self._more():
+                    continue
+                raise ImportFormatError(f"JSON inválido: {exc.msg}") from None
+            # Un número al final del buffer puede estar cortado: confirmarlo con más datos.
+            if end == len(self.buffer) and isinstance(value, (int, float)) and await self._more():
+                continue
+            self.pos = end
+            return value
+
+
+async def json_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    """Objeto {"areas": [...], "projects": [...], ...} de GET /export, fila a fila."""
+    reader = _JsonReader(chunks)
+    await reader.expect("{")
+    if await reader.peek() == "}":
+        return
+    while True:
+        key = await reader.value()
+        kind = JSON_TABLE_KEYS.get(key) if isinstance(key, str) else None
+        if kind is None:
+            raise ImportFormatError(f"tabla desconocida: {key!r}")
+        await reader.expect(":")
+        await reader.expect("[")
+        if await reader.peek() != "]":
+            while True:
+                row = await reader.value()
+                if not isinstance(row, dict):
+                    raise ImportFormatError(f"{key}: cada elemento debe ser un objeto")
+                yield {**row, "type": kind}
+                if await reader.peek() != ",":
+                    break
+                reader.pos += 1
+        await reader.expect("]")
+        if await reader.peek() != ",":
+            break
+        reader.pos += 1
+    await reader.expect("}")
+
+
+# --- Carga ---
+
+STAGING = {
+    "area": ("import_areas", ("seq", "src_id", "name", "description", "color", "created_at")),
+    "project": (
+        "import_projects",
+        ("seq", "src_id", "src_area_id", "icon", "name", "description", "pinned", "created_at"),
+    ),
+    "project_next_action": ("import_next_actions", ("seq", "src_project_id", "title", "done", "created_at")),
+    "one_shot_task": ("import_one_shot_tasks", ("seq", "src_area_id", "title", "done", "created_at")),
+}
+
+CREATE_STAGING = [
+    """
+    CREATE TEMP TABLE import_areas (
+        seq integer, src_id integer, new_id integer,
+        name text, description text, color text, created_at timestamptz
+    ) ON COMMIT DROP
+    """,
+    """
+    CREATE TEMP TABLE import_projects (
+        seq integer, src_id integer, new_id integer, src_area_id integer,
+        icon text, name text, description text, pinned boolean, created_at timestamptz
+    ) ON COMMIT DROP
+    """,
+    """
+    CREATE TEMP TABLE import_next_actions (
+        seq integer, src_project_id integer, title text, done boolean, created_at timestamptz
+    ) ON COMMIT DROP
+    """,
+    """
+    CREATE TEMP TABLE import_one_shot_tasks (
+        seq integer, src_area_id integer, title text, done boolean, created_at timestamptz
+    ) ON COMMIT DROP
+    """,
+]
+
+# (comprobación que debe salir vacía, mensaje) antes de insertar; devuelven seq.
+CHECKS = [
+    (
+        """
+        SELECT max(seq) FROM import_areas GROUP BY src_id HAVING count(*) > 1 ORDER BY 1 LIMIT :n
+        """,
+        "id de área repetido",
+    ),
+    (
+        """
+        SELECT max(seq) FROM import_projects GROUP BY src_id HAVING count(*) > 1 ORDER BY 1 LIMIT :n
+        """,
+        "id de proyecto repetido",
+    ),
+    (
+        """
+        SELECT p.seq FROM import_projects p
+        WHERE NOT EXISTS (SELECT 1 FROM import_areas a WHERE a.src_id = p.src_area_id)
+        ORDER BY 1 LIMIT :n
+        """,
+        "area_id no está en el fichero",
+    ),
+    (
+        """
+        SELECT n.seq FROM import_next_actions n
+        WHERE NOT EXISTS (SELECT 1 FROM import_projects p WHERE p.src_id = n.src_project_id)
+        ORDER BY 1 LIMIT :n
+        """,
+        "project_id no está en el fichero",
+    ),
+    (
+        """
+        SELECT t.seq FROM import_one_shot_tasks t
+        WHERE t.src_area_id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM import_areas a WHERE a.src_id = t.src_area_id)
+        ORDER BY 1 LIMIT :n
+        """,
+        "area_id no está en el fichero",
+    ),
+]
+
+# Ids nuevos reservados en staging para que los hijos puedan resolver los suyos con un JOIN.
+INSERTS = [
+    "UPDATE import_areas SET new_id = nextval(pg_get_serial_sequence('areas', 'id'))",
+    "UPDATE import_projects SET new_id = nextval(pg_get_serial_sequence('projects', 'id'))",
+    """
+    INSERT INTO areas (id, user_id, name, description, color, created_at)
+    SELECT new_id, :user_id, name, description, color, coalesce(created_at, now())
+    FROM import_areas ORDER BY seq
+    """,
+    """
+    INSERT INTO projects (id, area_id, icon, name, description, pinned, created_at)
+    SELECT p.new_id, a.new_id, p.icon, p.name, p.description, p.pinned, coalesce(p.created_at, now())
+    FROM import_projects p JOIN import_areas a ON a.src_id = p.src_area_id
+    ORDER BY p.seq
+    """,
+    """
+    INSERT INTO project_next_actions (project_id, title, done, created_at)
+    SELECT p.new_id, n.title, n.done, coalesce(n.created_at, now())
+    FROM import_next_actions n JOIN import_projects p ON p.src_id = n.src_project_id
+    ORDER BY n.seq
+    """,
+    """
+    INSERT INTO one_shot_tasks (user_id, area_id, title, done, created_at)
+    SELECT :user_id, a.new_id, t.title, t.done, coalesce(t.created_at, now())
+    FROM import_one_shot_tasks t LEFT JOIN import_areas a ON a.src_id = t.src_area_id
+    ORDER BY t.seq
+    """,
+]
+
+
+def _staging_record(seq: int, row) -> tuple:
+    if isinstance(row, ImportAreaRow):
+        return (seq, row.id, row.name, row.description, row.color, row.created_at)
+    if isinstance(row, ImportProjectRow):
+        return (seq, row.id, row.area_id, row.icon, row.name, row.description, row.pinned, row.created_at)
+    if isinstance(row, ImportNextActionRow):
+        return (seq, row.project_id, row.title.strip(), row.done, row.created_at)
+    return (seq, row.area_id, row.title.strip(), row.done, row.created_at)
+
+
+def _unprocessable(errors: list[dict]) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=errors)
+
+
+async def import_rows(db: AsyncSession, user_id: int, rows: AsyncIterator[dict]) -> dict:
+    """
+    Valida y carga las filas en la transacción de `db` (no hace commit). Si hay errores
+    lanza 422 con la lista de filas afectadas (numeradas desde 1) y no inserta nada.
+    """
+    started = time.perf_counter()
+    for sql in CREATE_STAGING:
+        await db.execute(text(sql))  # abre la transacción antes del COPY por el driver
+    raw = await (await db.connection()).get_raw_connection()
+    pg = raw.driver_connection
+
+    pending: dict[str, list[tuple]] = {kind: [] for kind in STAGING}
+    counts = dict.fromkeys(STAGING, 0)
+    errors: list[dict] = []
+
+    async def flush() -> None:
+        for kind, records in pending.items():
+            if records:
+                table, columns = STAGING[kind]
+                await pg.copy_records_to_table(table, records=records, columns=columns)
+                records.clear()
+
+    seq = 0
+    try:
+        async for data in rows:
+            seq += 1
+            if seq > IMPORT_MAX_ROWS:
+                errors.append({"row": seq, "error": f"más de {IMPORT_MAX_ROWS} filas"})
+                break
+            try:
+                row = _row_adapter.validate_python(data)
+            except ValidationError as exc:
+                first = exc.errors()[0]
+                field = ".".join(str(part) for part in first["loc"][1:]) or "type"
+                errors.append({"row": seq, "error": f"{field}: {first['msg']}"})
+                if len(errors) >= IMPORT_MAX_ERRORS:
+                    break
+                continue
+            if errors:
+                continue  # solo se siguen buscando errores
+            pending[row.type].append(_staging_record(seq, row))
+            counts[row.type] += 1
+            if seq % IMPORT_CHUNK_ROWS == 0:
+                await flush()
+    except ImportFormatError as exc:
+        errors.append({"row": seq + 1, "error": str(exc)})
+    if errors:
+        raise _unprocessable(errors)
+    await flush()
+
+    await db.execute(text("ANALYZE import_areas, import_projects, import_next_actions, import_one_shot_tasks"))
+    for sql, message in CHECKS:
+        bad = (await db.execute(text(sql), {"n": IMPORT_MAX_ERRORS - len(errors)})).scalars().all()
+        errors.extend({"row": row, "error": message} for row in bad)
+        if len(errors) >= IMPORT_MAX_ERRORS:
+            break
+    if errors:
+        raise _unprocessable(sorted(errors, key=lambda e: e["row"]))
+
+    await db.execute(text("SET LOCAL lifehub.skip_notify = 'on'"))
+    for sql in INSERTS:
+        await db.execute(text(sql), {"user_id": user_id})
+    await db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": CHANGE_FEED_CHANNEL, "payload": json.dumps({"user_id": user_id, "op": "resync"})},
+    )
+
+    elapsed = time.perf_counter() - started
+    return {
+        "areas": counts["area"],
+        "projects": counts["project"],
+        "project_next_actions": counts["project_next_action"],
+        "one_shot_tasks": counts["one_shot_task"],
+        "rows": seq,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(seq / elapsed) if elapsed else 0.0,
+    }
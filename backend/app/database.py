@@ -1,6 +1,12 @@
 import os
-from sqlalchemy import create_engine
+import time
+from contextvars import ContextVar
+from uuid import uuid4
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
@@ -11,15 +17,162 @@ DATABASE_URL = os.getenv(
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
+# La API usa el driver async (asyncpg); se deriva de DATABASE_URL salvo que se indique otra.
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1),
+)
+
+# Pool de conexiones de la API (engine async). Con DB_PGBOUNCER=true no hay pool propio
+# (NullPool: PgBouncer hace de pool) y se desactivan los prepared statements de asyncpg,
+# incompatibles con PgBouncer en modo transaction.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # segundos; -1 = nunca
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() in ("1", "true", "yes")
+
+# Presupuesto de consultas por petición (0 = sin límite). En modo estricto,
+# superar el presupuesto lanza QueryBudgetExceeded (útil en desarrollo/CI para detectar N+1).
+DB_QUERY_BUDGET = int(os.getenv("DB_QUERY_BUDGET", "0"))
+DB_STRICT_QUERY_BUDGET = os.getenv("DB_STRICT_QUERY_BUDGET", "false").lower() in ("1", "true", "yes")
+
+# Engine síncrono: scripts de migración y utilidades de línea de comandos.
 engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+class PoolStats:
+    """Métricas acumuladas del pool de la API: esperas en checkout y timeouts."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.waiting = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def snapshot(self, pool) -> dict:
+        stats = {
+            "pool_class": type(pool).__name__,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "waiting": self.waiting,
+            "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats.update(
+                size=pool.size(),
+                max_overflow=DB_MAX_OVERFLOW,
+                checked_out=pool.checkedout(),
+                idle=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return stats
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Pool async que mide cuánto espera cada checkout y cuenta los timeouts."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        pool_stats.waiting += 1
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.timeouts += 1
+            raise
+        finally:
+            pool_stats.waiting -= 1
+        waited = time.perf_counter() - started
+        pool_stats.checkouts += 1
+        pool_stats.total_wait += waited
+        pool_stats.max_wait = max(pool_stats.max_wait, waited)
+        return conn
+
+
+def _async_engine_options() -> dict:
+    if DB_PGBOUNCER:
+        return {
+            "poolclass": NullPool,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            },
+        }
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+# Engine asíncrono: routers de la API (async def), sin pasar por el threadpool.
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_async_engine_options())
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
-def get_db():
-    """Dependencia para obtener sesión de base de datos."""
-    db = SessionLocal()
-    try:
+class QueryBudgetExceeded(RuntimeError):
+    """Una petición ha lanzado más consultas SQL de las permitidas por DB_QUERY_BUDGET."""
+
+
+class QueryStats:
+    """Contador de sentencias SQL y tiempo en BD de una petición."""
+
+    __slots__ = ("count", "elapsed")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.elapsed = 0.0
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def start_query_stats() -> QueryStats:
+    """Empieza a contar consultas en el contexto actual (una vez por petición)."""
+    stats = QueryStats()
+    _query_stats.set(stats)
+    return stats
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _query_stats.get()
+    if stats is None:
+        return
+    if DB_STRICT_QUERY_BUDGET and DB_QUERY_BUDGET and stats.count >= DB_QUERY_BUDGET:
+        raise QueryBudgetExceeded(
+            f"Presupuesto de {DB_QUERY_BUDGET} consultas superado; siguiente: {statement[:200]}"
+        )
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _query_stats.get()
+    if stats is None:
+        return
+    started = conn.info["query_start_time"].pop()
+    stats.count += 1
+    stats.elapsed += time.perf_counter() - started
+
+
+for _engine in (engine, async_engine.sync_engine):
+    event.listen(_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+async def get_db():
+    """Dependencia para obtener sesión (async) de base de datos."""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,82 @@
+"""
+ETag / If-None-Match para los GET de listados y detalles.
+
+La etiqueta se calcula en SQL a partir de los datos (número de filas, max(updated_at)
+y suma de los updated_at) sin cargar ni serializar las filas: si el cliente manda un
+If-None-Match que coincide se responde 304 directamente. La suma detecta cambios que
+no mueven el máximo (p. ej. una transacción larga que confirma con un now() anterior).
+
+En los listados la huella es de las filas que devuelve la propia consulta del endpoint
+(rows_fingerprint): con ?limit= solo las de la página (y la de más que decide
+X-Next-Cursor), así que cada página cuesta lo mismo que leerla, no lo que el histórico.
+"""
+import hashlib
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import extract, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def fingerprint(id_column, updated_at_column, *summed_columns) -> list:
+    """
+    Columnas agregadas que resumen un conjunto de filas: (count, max, suma de updated_at).
+    summed_columns: columnas enteras que pueden cambiar sin tocar updated_at (p. ej. una FK
+    ON DELETE SET NULL); se añade la suma de cada una, con NULL como 0.
+    """
+    return [
+        func.count(id_column),
+        func.max(updated_at_column),
+        func.sum(extract("epoch", updated_at_column)),
+        *(func.sum(func.coalesce(column, 0)) for column in summed_columns),
+    ]
+
+
+def rows_fingerprint(stmt, id_column, updated_at_column, *summed_columns):
+    """
+    Consulta de huella de las filas de `stmt` (con su WHERE, ORDER BY y LIMIT): se queda
+    con las columnas de la huella, la envuelve en una subconsulta y agrega sobre ella.
+    Sin LIMIT conviene pasar stmt.order_by(None): el orden no cambia la huella.
+    """
+    rows = stmt.with_only_columns(id_column, updated_at_column, *summed_columns).subquery()
+    return select(*fingerprint(*rows.c))
+
+
+def make_etag(*parts) -> str:
+    """ETag débil: resume los datos, no los bytes exactos de la respuesta."""
+    raw = "|".join(str(p) for p in parts)
+    return f'W/"{hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Comparación débil con la cabecera If-None-Match (lista separada por comas o *)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+async def conditional_get(
+    db: AsyncSession,
+    request: Request,
+    response: Response,
+    stmt,
+    user_id: int,
+    not_found: str | None = None,
+) -> Response | None:
+    """
+    Ejecuta la consulta de huella (una fila de agregados cuyo primer valor es el count)
+    y pone la cabecera ETag. Devuelve una respuesta 304 si If-None-Match coincide, o
+    None para que el endpoint siga con la consulta normal.
+    Con not_found, un count 0 se traduce en 404 (detalle inexistente o ajeno).
+    """
+    row = (await db.execute(stmt)).one()
+    if not_found is not None and not row[0]:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found)
+    etag = make_etag(user_id, request.url.path, request.url.query, *row)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
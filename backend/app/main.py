@@ -1,33 +1,63 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import select
 
-from app.database import engine, SessionLocal
-from app.models import Base, User
-from app.routers import auth, areas, projects, one_shot_tasks, project_next_actions
-from app.security import get_password_hash
+from app.database import async_engine, AsyncSessionLocal, start_query_stats
+from app.etag import etag_matches
+from app.models import User
+from app.pagination import NEXT_CURSOR_HEADER
+from app.response_cache import (
+    RESPONSE_CACHE_MAX_ENTRY_BYTES,
+    STORED_HEADERS,
+    CachedResponse,
+    cache_key,
+    cache_stats,
+    invalidates_cache,
+    is_cached_path,
+    response_cache,
+    user_id_from_request,
+)
+from app.change_feed import change_feed
+from app.routers import (
+    auth,
+    areas,
+    projects,
+    one_shot_tasks,
+    project_next_actions,
+    dashboard,
+    metrics,
+    sync,
+    changes,
+    export,
+    imports,
+    search,
+    quick_find,
+    stats,
+)
+from app.security import PasswordHasherBusy, get_password_hash_async
+from app.user_cache import user_cache
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Crear tablas y usuario test al arrancar la aplicación."""
-    Base.metadata.create_all(bind=engine)
-    db: Session = SessionLocal()
-    try:
-        test_user = db.query(User).filter(User.email == "test@lifehub.local").first()
+    """Usuario test y feed de cambios al arrancar. El esquema lo crea scripts/run_migrations.py."""
+    async with AsyncSessionLocal() as db:
+        test_user = await db.scalar(select(User).where(User.email == "test@lifehub.local"))
         if not test_user:
             db.add(
                 User(
                     email="test@lifehub.local",
-                    password_hash=get_password_hash("test123"),
+                    password_hash=await get_password_hash_async("test123"),
                     full_name="Usuario Test",
                 )
             )
-            db.commit()
-    finally:
-        db.close()
+            await db.commit()
+    change_feed.start()
     yield
+    await change_feed.stop()
+    await async_engine.dispose()
 
 
 app = FastAPI(
@@ -37,19 +67,111 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+
+@app.middleware("http")
+async def cached_responses(request: Request, call_next):
+    """
+    Caché de GET por (usuario, versión, ruta, query). Las escrituras 2xx del usuario
+    incrementan su versión. Se declara antes que db_query_stats para quedar por dentro
+    y que un acierto salga con X-DB-Queries: 0.
+    """
+    if response_cache is None or not invalidates_cache(request.url.path):
+        return await call_next(request)
+    user_id = user_id_from_request(request)
+    if user_id is None:
+        return await call_next(request)
+
+    if request.method in ("POST", "PUT", "PATCH", "DELETE"):
+        response = await call_next(request)
+        if 200 <= response.status_code < 300:
+            await response_cache.bump_version(user_id)
+            cache_stats.invalidations += 1
+        return response
+    if request.method != "GET" or not is_cached_path(request.url.path):
+        return await call_next(request)
+
+    version = await response_cache.get_version(user_id)
+    key = cache_key(user_id, version, request.url.path, request.url.query)
+    cached = await response_cache.get(key)
+    # Un acierto no pasa por get_current_user: solo se sirve si el usuario está en user_cache
+    # (existe y no se ha borrado vía ORM); si no, la petición sigue y get_current_user lo
+    # comprueba en la BD (401 si ya no existe) y lo vuelve a cachear.
+    if cached is not None and user_cache.get(user_id) is None:
+        cached = None
+    if cached is not None:
+        cache_stats.hits += 1
+        etag = cached.headers.get("etag")
+        if etag and etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "X-Cache": "HIT"})
+        return Response(
+            content=cached.body,
+            status_code=cached.status_code,
+            headers={**cached.headers, "X-Cache": "HIT"},
+        )
+
+    cache_stats.misses += 1
+    response = await call_next(request)
+    if response.status_code != status.HTTP_200_OK:
+        response.headers["X-Cache"] = "MISS"
+        return response
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    if len(body) <= RESPONSE_CACHE_MAX_ENTRY_BYTES:
+        headers = {k: v for k, v in response.headers.items() if k in STORED_HEADERS}
+        await response_cache.set(key, CachedResponse(response.status_code, headers, body))
+        cache_stats.stores += 1
+    return Response(
+        content=body,
+        status_code=response.status_code,
+        headers={**response.headers, "X-Cache": "MISS"},
+    )
+
+
+@app.middleware("http")
+async def db_query_stats(request: Request, call_next):
+    """Expone el nº de consultas SQL y el tiempo en BD de cada petición como cabeceras."""
+    stats = start_query_stats()
+    response = await call_next(request)
+    response.headers["X-DB-Queries"] = str(stats.count)
+    response.headers["X-DB-Time-ms"] = f"{stats.elapsed * 1000:.1f}"
+    return response
+
+
+# CORS se registra después de los middlewares http para quedar por fuera de todos:
+# los aciertos de caché salen antes de llegar a la app y también necesitan sus cabeceras.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Queries", "X-DB-Time-ms", NEXT_CURSOR_HEADER, "ETag", "X-Cache", "Content-Disposition"],
 )
 
+
 app.include_router(auth.router)
 app.include_router(areas.router)
 app.include_router(projects.router)
 app.include_router(one_shot_tasks.router)
 app.include_router(project_next_actions.router)
+app.include_router(dashboard.router)
+app.include_router(sync.router)
+app.include_router(changes.router)
+app.include_router(export.router)
+app.include_router(imports.router)
+app.include_router(search.router)
+app.include_router(quick_find.router)
+app.include_router(stats.router)
+app.include_router(metrics.router)
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Cola de bcrypt llena (avalancha de logins): 503 para que el cliente reintente."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Servidor ocupado, inténtalo de nuevo en unos segundos"},
+        headers={"Retry-After": "1"},
+    )
 
 
 @app.get("/")
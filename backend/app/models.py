@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Boolean, Column, Date, Integer, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -6,6 +6,8 @@ from app.database import Base
 
 class User(Base):
     __tablename__ = "users"
+    # INSERT/UPDATE ... RETURNING de id, created_at, updated_at y server_default: sin refresh tras commit
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
@@ -13,14 +15,19 @@ class User(Base):
     full_name = Column(String(255), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    areas = relationship("Area", back_populates="user", cascade="all, delete-orphan")
-    one_shot_tasks = relationship("OneShotTask", back_populates="user", cascade="all, delete-orphan")
+    # passive_deletes: los hijos los borra Postgres (ON DELETE CASCADE / SET NULL); el ORM
+    # no los carga en memoria ni emite un DELETE por fila al borrar el padre.
+    areas = relationship("Area", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    one_shot_tasks = relationship(
+        "OneShotTask", back_populates="user", cascade="all, delete-orphan", passive_deletes=True
+    )
 
 
 class Area(Base):
     """Área de vida (ej: Salud, Trabajo, Familia). Pertenece a un usuario."""
 
     __tablename__ = "areas"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -30,15 +37,23 @@ class Area(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Listado de áreas: WHERE user_id = ? ORDER BY name
+        Index("ix_areas_user_id_name", user_id, name),
+        # Sincronización incremental (GET /sync): cambios del usuario desde un instante
+        Index("ix_areas_user_id_updated_at", user_id, updated_at),
+    )
+
     user = relationship("User", back_populates="areas")
-    projects = relationship("Project", back_populates="area", cascade="all, delete-orphan")
-    one_shot_tasks = relationship("OneShotTask", back_populates="area")
+    projects = relationship("Project", back_populates="area", cascade="all, delete-orphan", passive_deletes=True)
+    one_shot_tasks = relationship("OneShotTask", back_populates="area", passive_deletes=True)
 
 
 class Project(Base):
     """Proyecto dentro de un área. Jerarquía: Area -> Project."""
 
     __tablename__ = "projects"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     area_id = Column(Integer, ForeignKey("areas.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -49,11 +64,18 @@ class Project(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Proyectos de un área por nombre (listado filtrado, dashboard, paginación por (name, id))
+        Index("ix_projects_area_id_name_id", area_id, name, id),
+        Index("ix_projects_area_id_updated_at", area_id, updated_at),
+    )
+
     area = relationship("Area", back_populates="projects")
     next_actions = relationship(
         "ProjectNextAction",
         back_populates="project",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         order_by="ProjectNextAction.id",
     )
 
@@ -62,6 +84,7 @@ class ProjectNextAction(Base):
     """Siguiente acción GTD de un proyecto. Un proyecto tiene varias."""
 
     __tablename__ = "project_next_actions"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -70,6 +93,12 @@ class ProjectNextAction(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Siguientes acciones de un proyecto en orden de creación
+        Index("ix_project_next_actions_project_id_id", project_id, id),
+        Index("ix_project_next_actions_project_id_updated_at", project_id, updated_at),
+    )
+
     project = relationship("Project", back_populates="next_actions")
 
 
@@ -77,6 +106,7 @@ class OneShotTask(Base):
     """Tarea sin proyecto (one-shot). Pertenece a un usuario. Opcionalmente ligada a un área (area_id null = One shot)."""
 
     __tablename__ = "one_shot_tasks"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -86,5 +116,65 @@ class OneShotTask(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Listado: WHERE user_id = ? ORDER BY done, created_at DESC, id DESC
+        Index("ix_one_shot_tasks_user_done_created", user_id, done, created_at.desc(), id.desc()),
+        # Solo pendientes (?done=false): índice parcial, mucho más pequeño que el histórico
+        Index(
+            "ix_one_shot_tasks_user_pending",
+            user_id,
+            created_at.desc(),
+            id.desc(),
+            postgresql_where=text("done = false"),
+        ),
+        # Filtro por área (?area_id=) con el mismo orden
+        Index("ix_one_shot_tasks_area_done_created", area_id, done, created_at.desc(), id.desc()),
+        Index("ix_one_shot_tasks_user_id_updated_at", user_id, updated_at),
+    )
+
     user = relationship("User", back_populates="one_shot_tasks")
     area = relationship("Area", back_populates="one_shot_tasks")
+
+
+class DeletedRecord(Base):
+    """
+    Tombstone de una fila borrada (para GET /sync). Lo escribe el trigger record_deletion
+    (migrations/0006_sync_tracking.py); sin FK a users para sobrevivir al borrado del usuario.
+    """
+
+    __tablename__ = "deleted_records"
+
+    id = Column(BigInteger, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    table_name = Column(String(50), nullable=False)
+    record_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (Index("ix_deleted_records_user_id_deleted_at", user_id, deleted_at),)
+
+
+class ProgressStat(Base):
+    """
+    Pendientes / hechas de un usuario, un área o un proyecto (GET /stats). Proyecto: sus
+    siguientes acciones; área: las de sus proyectos más sus one-shots; usuario: todas.
+    Las mantienen triggers en la misma transacción que cada escritura
+    (migrations/0009_progress_stats.py); no se escriben desde la API.
+    """
+
+    __tablename__ = "progress_stats"
+
+    scope = Column(String(10), primary_key=True)  # 'user', 'area' o 'project'
+    scope_id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    pending = Column(Integer, nullable=False, server_default="0")
+    done = Column(Integer, nullable=False, server_default="0")
+
+
+class DailyCompletion(Base):
+    """Siguientes acciones y one-shots hechas por día de compleción (UTC). Mismos triggers que ProgressStat."""
+
+    __tablename__ = "daily_completions"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    completed = Column(Integer, nullable=False, server_default="0")
@@ -0,0 +1,68 @@
+"""
+Paginación por cursor (keyset) para los listados.
+
+El cliente pide `?limit=N` y, si hay más filas, la respuesta trae la cabecera
+X-Next-Cursor con un cursor opaco; se pasa tal cual en `?cursor=` para la página
+siguiente. Sin `limit` se devuelve el listado completo (compatibilidad con el frontend).
+El coste de cada página depende de su tamaño, no del histórico: el cursor se traduce
+en un WHERE sobre las columnas del ORDER BY, que aprovecha el índice.
+"""
+import base64
+import json
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException, Response, status
+
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Codifica los valores de ordenación de la última fila en un cursor opaco."""
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def aware_datetime(value: str) -> datetime:
+    """datetime.fromisoformat que exige zona horaria (los cursores siempre la llevan)."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        raise ValueError("fecha sin zona horaria")
+    return parsed
+
+
+def decode_cursor(cursor: str, *types: Callable[[Any], Any]) -> list[Any]:
+    """Decodifica un cursor aplicando a cada valor su tipo (p. ej. bool, aware_datetime, int)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("longitud inesperada")
+        return [convert(value) for convert, value in zip(types, values)]
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor inválido",
+        )
+
+
+def paginate(
+    rows: Sequence[Any],
+    limit: int | None,
+    response: Response,
+    cursor_values: Callable[[Any], Sequence[Any]],
+) -> list[Any]:
+    """
+    Recorta a `limit` filas las `limit + 1` leídas y, si sobraba alguna, pone X-Next-Cursor
+    con los valores de ordenación de la última fila devuelta.
+    """
+    if limit is None or len(rows) <= limit:
+        return list(rows)
+    page = list(rows[:limit])
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(cursor_values(page[-1]))
+    return page
@@ -0,0 +1,82 @@
+"""
+Contadores de progreso (progress_stats, daily_completions) recalculados desde las tablas.
+
+Los triggers de migrations/0009_progress_stats.py los mantienen al día fila a fila; esto
+es la referencia con la que se comparan (deriva) y se reconstruyen con
+scripts/rebuild_progress_stats.py. Las migraciones no lo importan: llevan su propio SQL.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Siguientes acciones (con el área y el usuario de su proyecto) y one-shots
+ITEMS = """
+    SELECT a.user_id, a.id AS area_id, p.id AS project_id, n.done, n.completed_at
+    FROM project_next_actions n
+    JOIN projects p ON p.id = n.project_id
+    JOIN areas a ON a.id = p.area_id
+    UNION ALL
+    SELECT user_id, area_id, NULL, done, completed_at FROM one_shot_tasks
+"""
+
+EXPECTED_PROGRESS = f"""
+    WITH items AS ({ITEMS})
+    SELECT 'user' AS scope, user_id AS scope_id, user_id,
+           count(*) FILTER (WHERE NOT done) AS pending, count(*) FILTER (WHERE done) AS done
+    FROM items GROUP BY user_id
+    UNION ALL
+    SELECT 'area', area_id, user_id, count(*) FILTER (WHERE NOT done), count(*) FILTER (WHERE done)
+    FROM items WHERE area_id IS NOT NULL GROUP BY area_id, user_id
+    UNION ALL
+    SELECT 'project', project_id, user_id, count(*) FILTER (WHERE NOT done), count(*) FILTER (WHERE done)
+    FROM items WHERE project_id IS NOT NULL GROUP BY project_id, user_id
+"""
+
+EXPECTED_COMPLETIONS = f"""
+    WITH items AS ({ITEMS})
+    SELECT user_id, (completed_at AT TIME ZONE 'UTC')::date AS day, count(*) AS completed
+    FROM items WHERE done GROUP BY 1, 2
+"""
+
+# Filas que no cuadran; una fila que falta cuenta como 0 (los triggers dejan filas a 0).
+PROGRESS_DRIFT = f"""
+    SELECT coalesce(e.scope, s.scope) AS scope, coalesce(e.scope_id, s.scope_id) AS scope_id,
+           coalesce(e.pending, 0) AS expected_pending, coalesce(s.pending, 0) AS pending,
+           coalesce(e.done, 0) AS expected_done, coalesce(s.done, 0) AS done
+    FROM ({EXPECTED_PROGRESS}) e
+    FULL JOIN progress_stats s ON s.scope = e.scope AND s.scope_id = e.scope_id
+    WHERE coalesce(e.pending, 0) <> coalesce(s.pending, 0) OR coalesce(e.done, 0) <> coalesce(s.done, 0)
+    ORDER BY 1, 2
+"""
+
+COMPLETIONS_DRIFT = f"""
+    SELECT coalesce(e.user_id, c.user_id) AS user_id, coalesce(e.day, c.day) AS day,
+           coalesce(e.completed, 0) AS expected_completed, coalesce(c.completed, 0) AS completed
+    FROM ({EXPECTED_COMPLETIONS}) e
+    FULL JOIN daily_completions c ON c.user_id = e.user_id AND c.day = e.day
+    WHERE coalesce(e.completed, 0) <> coalesce(c.completed, 0)
+    ORDER BY 1, 2
+"""
+
+# Bloquea las escrituras de los triggers (otras transacciones esperan a que esta termine)
+# para que lo recalculado no se pise con un cambio concurrente.
+LOCK = "LOCK TABLE progress_stats, daily_completions IN EXCLUSIVE MODE"
+
+REBUILD = [
+    "DELETE FROM progress_stats",
+    f"INSERT INTO progress_stats (scope, scope_id, user_id, pending, done) {EXPECTED_PROGRESS}",
+    "DELETE FROM daily_completions",
+    f"INSERT INTO daily_completions (user_id, day, completed) {EXPECTED_COMPLETIONS}",
+]
+
+
+def drift(conn: Connection) -> tuple[list, list]:
+    """Filas de progress_stats y de daily_completions que no coinciden con las tablas."""
+    conn.execute(text(LOCK))
+    return conn.execute(text(PROGRESS_DRIFT)).all(), conn.execute(text(COMPLETIONS_DRIFT)).all()
+
+
+def rebuild(conn: Connection) -> None:
+    """Recalcula ambos contadores desde cero (dentro de la transacción de `conn`)."""
+    conn.execute(text(LOCK))
+    for sql in REBUILD:
+        conn.execute(text(sql))
@@ -0,0 +1,252 @@
+"""
+Índice en memoria para el buscador rápido (GET /quick-find): nombres de áreas y proyectos
+e iconos de proyectos, por usuario.
+
+Cada usuario tiene un array ordenado de claves (texto sin tildes ni mayúsculas desde el
+inicio de cada palabra, y el icono); una búsqueda es un bisect más el recorrido de como
+mucho `limit` claves, sin ir a la BD. El índice se construye con dos
+consultas la primera vez que el usuario lo usa y después lo mantienen los handlers de
+areas y projects. LRU acotado por memoria (QUICK_FIND_MAX_BYTES).
+
+Es local al proceso: las escrituras de otros workers o de scripts no se ven hasta que el
+índice del usuario se descarta (LRU, QUICK_FIND_TTL_SECONDS o POST /import).
+"""
+import bisect
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Area, Project
+
+QUICK_FIND_MAX_BYTES = int(os.getenv("QUICK_FIND_MAX_BYTES", str(32 * 1024 * 1024)))
+QUICK_FIND_TTL_SECONDS = float(os.getenv("QUICK_FIND_TTL_SECONDS", "3600"))
+
+# Bytes estimados por clave y por elemento además del texto (tuplas, str, dataclass);
+# medido con tracemalloc en scripts/bench_quick_find.py.
+KEY_OVERHEAD_BYTES = 115
+ITEM_OVERHEAD_BYTES = 160
+
+# Grupos de claves, en el orden en que se devuelven: inicio del nombre, inicio de otra palabra, icono
+NAME_START, WORD_START, ICON = 0, 1, 2
+
+
+def normalize(value: str) -> str:
+    """Sin tildes ni mayúsculas y con las palabras separadas por un espacio ('Niños-Cole' -> 'ninos cole')."""
+    folded = "".join(c for c in unicodedata.normalize("NFKD", value) if not unicodedata.combining(c)).casefold()
+    return " ".join(re.findall(r"\w+", folded))
+
+
+def prefix_key(prefix: str) -> str:
+    """Prefijo a buscar; si no tiene letras ni números (un emoji), se compara con los iconos tal cual."""
+    return normalize(prefix) or prefix.strip().casefold()
+
+
+@dataclass(frozen=True, slots=True)
+class QuickFindItem:
+    type: str  # "area" o "project"
+    id: int
+    name: str
+    icon: str | None
+    area_id: int  # el propio id en las áreas
+
+    @classmethod
+    def from_area(cls, area) -> "QuickFindItem":
+        return cls("area", area.id, area.name, None, area.id)
+
+    @classmethod
+    def from_project(cls, project) -> "QuickFindItem":
+        return cls("project", project.id, project.name, project.icon, project.area_id)
+
+    def keys(self) -> list[tuple[int, str, str, int]]:
+        """Claves (orden, texto, type, id) del elemento en el array ordenado."""
+        name = normalize(self.name)
+        keys = [(NAME_START if m.start() == 0 else WORD_START, name[m.start():], self.type, self.id)
+                for m in re.finditer(r"\w+", name)]
+        if self.icon and self.icon.strip():
+            keys.append((ICON, self.icon.strip().casefold(), self.type, self.id))
+        return keys
+
+    def size(self) -> int:
+        return ITEM_OVERHEAD_BYTES + len(self.name) + sum(KEY_OVERHEAD_BYTES + len(k[1]) for k in self.keys())
+
+
+class UserIndex:
+    """Elementos de un usuario y sus claves ordenadas. Se modifica solo con el lock de QuickFindIndex."""
+
+    __slots__ = ("items", "keys", "bytes", "expires_at")
+
+    def __init__(self, items: list[QuickFindItem], ttl_seconds: float) -> None:
+        self.items = {(item.type, item.id): item for item in items}
+        self.keys = sorted(key for item in items for key in item.keys())
+        self.bytes = sum(item.size() for item in items)
+        self.expires_at = time.monotonic() + ttl_seconds
+
+    def add(self, item: QuickFindItem) -> None:
+        self.remove(item.type, item.id)
+        self.items[(item.type, item.id)] = item
+        for key in item.keys():
+            bisect.insort(self.keys, key)
+        self.bytes += item.size()
+
+    def remove(self, type: str, id: int) -> None:
+        item = self.items.pop((type, id), None)
+        if item is None:
+            return
+        for key in item.keys():
+            i = bisect.bisect_left(self.keys, key)
+            if i < len(self.keys) and self.keys[i] == key:
+                del self.keys[i]
+        self.bytes -= item.size()
+
+    def find(self, prefix: str, limit: int) -> list[QuickFindItem]:
+        """
+        Primero los que empiezan por `prefix` desde el inicio del nombre, luego por otra
+        palabra y luego por el icono; dentro de cada grupo, por el texto que coincide. Las
+        claves ya están en ese orden: se para en cuanto hay `limit` resultados, así que el
+        coste no depende de cuántos elementos coincidan.
+        """
+        found: dict[tuple[str, int], QuickFindItem] = {}
+        for order in (NAME_START, WORD_START, ICON):
+            i = bisect.bisect_left(self.keys, (order, prefix))
+            while i < len(self.keys) and len(found) < limit:
+                key_order, text, type, id = self.keys[i]
+                if key_order != order or not text.startswith(prefix):
+                    break
+                found.setdefault((type, id), self.items[(type, id)])
+                i += 1
+        return list(found.values())
+
+
+class QuickFindIndex:
+    """LRU de UserIndex acotado por bytes estimados. Thread-safe, como el resto de cachés en proceso."""
+
+    def __init__(self, max_bytes: int, ttl_seconds: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._users: OrderedDict[int, UserIndex] = OrderedDict()
+        # Usuarios con el índice construyéndose -> si hubo escrituras entretanto
+        self._building: dict[int, bool] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+        self.evictions = 0
+
+    async def find(self, db: AsyncSession, user_id: int, prefix: str, limit: int) -> list[QuickFindItem]:
+        with self._lock:
+            index = self._get(user_id)
+            if index is not None:
+                self.hits += 1
+                return index.find(prefix, limit)
+        index = await self._build(db, user_id)
+        with self._lock:
+            return index.find(prefix, limit)
+
+    def upsert(self, user_id: int, item: QuickFindItem) -> None:
+        """Alta o cambio tras un commit. Si el índice del usuario no está cargado no hay nada que hacer."""
+        with self._lock:
+            if user_id in self._building:
+                self._building[user_id] = True
+            index = self._users.get(user_id)
+            if index is not None:
+                self._bytes -= index.bytes
+                index.add(item)
+                self._bytes += index.bytes
+                self._evict()
+
+    def remove(self, user_id: int, type: str, id: int) -> None:
+        """Baja tras un commit; al borrar un área se quitan también sus proyectos (ON DELETE CASCADE)."""
+        with self._lock:
+            if user_id in self._building:
+                self._building[user_id] = True
+            index = self._users.get(user_id)
+            if index is None:
+                return
+            self._bytes -= index.bytes
+            index.remove(type, id)
+            if type == "area":
+                for item in [i for i in index.items.values() if i.type == "project" and i.area_id == id]:
+                    index.remove(item.type, item.id)
+            self._bytes += index.bytes
+
+    def invalidate(self, user_id: int) -> None:
+        """Descarta el índice del usuario (escrituras masivas); se reconstruye en la siguiente búsqueda."""
+        with self._lock:
+            if user_id in self._building:
+                self._building[user_id] = True
+            self._discard(user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+            self._bytes = 0
+
+    def snapshot(self) -> dict:
+        """Contadores para /metrics/quick-find."""
+        return {
+            "users": len(self._users),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "builds": self.builds,
+            "evictions": self.evictions,
+        }
+
+    def _get(self, user_id: int) -> UserIndex | None:
+        index = self._users.get(user_id)
+        if index is None:
+            return None
+        if index.expires_at < time.monotonic():
+            self._discard(user_id)
+            return None
+        self._users.move_to_end(user_id)
+        return index
+
+    async def _build(self, db: AsyncSession, user_id: int) -> UserIndex:
+        """
+        Carga las áreas y proyectos del usuario. Si una escritura llega mientras tanto, el
+        resultado puede no incluirla: se usa para esta búsqueda pero no se guarda.
+        """
+        with self._lock:
+            self._building.setdefault(user_id, False)
+        try:
+            areas = await db.execute(select(Area.id, Area.name).where(Area.user_id == user_id))
+            projects = await db.execute(
+                select(Project.id, Project.name, Project.icon, Project.area_id)
+                .join(Area)
+                .where(Area.user_id == user_id)
+            )
+            items = [QuickFindItem.from_area(a) for a in areas]
+            items += [QuickFindItem.from_project(p) for p in projects]
+            index = UserIndex(items, self.ttl_seconds)
+        finally:
+            with self._lock:
+                stale = self._building.pop(user_id, True)
+        with self._lock:
+            self.builds += 1
+            if not stale and index.bytes <= self.max_bytes:
+                self._discard(user_id)
+                self._users[user_id] = index
+                self._bytes += index.bytes
+                self._evict()
+        return index
+
+    def _discard(self, user_id: int) -> None:
+        index = self._users.pop(user_id, None)
+        if index is not None:
+            self._bytes -= index.bytes
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._users:
+            self._discard(next(iter(self._users)))
+            self.evictions += 1
+
+
+quick_find_index = QuickFindIndex(QUICK_FIND_MAX_BYTES, QUICK_FIND_TTL_SECONDS)
@@ -0,0 +1,230 @@
+"""
+Caché de respuestas GET por usuario, versionada.
+
+Clave: (usuario, versión del usuario, ruta, query string). Cada escritura con éxito
+(POST/PATCH/PUT/DELETE 2xx) en los routers de datos incrementa la versión del usuario,
+así que las entradas antiguas dejan de ser alcanzables sin tener que buscarlas y borrarlas:
+nunca se sirve una respuesta anterior a una escritura del propio usuario.
+
+Backends (RESPONSE_CACHE_BACKEND):
+- memory (por defecto): LRU en proceso con tope de memoria. Versiones locales al proceso,
+  válido con un solo worker; se guardan como mucho RESPONSE_CACHE_MAX_USERS.
+- redis: compartido entre workers/instancias (REDIS_URL, paquete redis de requirements.txt).
+- off: desactivada.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from fastapi import Request
+
+from app.security import decode_access_token
+
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory").lower()
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024)))
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+RESPONSE_CACHE_MAX_USERS = int(os.getenv("RESPONSE_CACHE_MAX_USERS", "100000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Rutas cuyos GET se cachean y cuyas escrituras invalidan la caché del usuario
+CACHED_PREFIXES = ("/areas", "/projects", "/one-shot-tasks", "/project-next-actions", "/dashboard", "/stats")
+# Rutas que solo escriben pero también invalidan (cargas masivas)
+INVALIDATING_PREFIXES = CACHED_PREFIXES + ("/import",)
+# Cabeceras de la respuesta original que se guardan con el cuerpo
+STORED_HEADERS = ("content-type", "etag", "x-next-cursor")
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    status_code: int
+    headers: dict[str, str]
+    body: bytes
+
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+    def dumps(self) -> bytes:
+        meta = json.dumps({"status_code": self.status_code, "headers": self.headers}).encode()
+        return meta + b"\n" + self.body
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "CachedResponse":
+        meta, body = raw.split(b"\n", 1)
+        data = json.loads(meta)
+        return cls(status_code=data["status_code"], headers=data["headers"], body=body)
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    invalidations: int = 0
+
+
+class MemoryCacheBackend:
+    """
+    LRU en proceso acotado por bytes, con caducidad por entrada.
+
+    Las versiones salen de un contador global y se guardan en otro LRU de como mucho
+    max_users usuarios. Un usuario sin versión guardada (nunca escribió o se desalojó)
+    tiene la versión `_floor`, que al desalojar sube al valor actual del contador: nunca
+    baja, así que una clave anterior a la última escritura no vuelve a ser alcanzable.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_bytes: int, ttl_seconds: int, max_users: int) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._entries: OrderedDict[str, tuple[float, CachedResponse]] = OrderedDict()
+        self._versions: OrderedDict[int, int] = OrderedDict()
+        self._counter = 0
+        self._floor = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    async def get_version(self, user_id: int) -> int:
+        with self._lock:
+            version = self._versions.get(user_id)
+            if version is None:
+                return self._floor
+            self._versions.move_to_end(user_id)
+            return version
+
+    async def bump_version(self, user_id: int) -> None:
+        with self._lock:
+            self._counter += 1
+            self._versions[user_id] = self._counter
+            self._versions.move_to_end(user_id)
+            while len(self._versions) > self.max_users:
+                self._versions.popitem(last=False)
+                self._floor = self._counter
+
+    async def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, cached = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return cached
+
+    async def set(self, key: str, cached: CachedResponse) -> None:
+        size = cached.size()
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, cached)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1].size()
+
+    def info(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "users": len(self._versions),
+        }
+
+
+class RedisCacheBackend:
+    """Backend compartido: versiones con INCR y entradas con SET EX (las versiones viejas caducan solas)."""
+
+    name = "redis"
+
+    def __init__(self, url: str, ttl_seconds: int) -> None:
+        try:
+            import redis.asyncio as redis
+        except ImportError as exc:  # dependencia opcional
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis requiere el paquete 'redis'") from exc
+        self.ttl_seconds = ttl_seconds
+        self._redis = redis.from_url(url)
+
+    async def get_version(self, user_id: int) -> int:
+        version = await self._redis.get(f"rc:v:{user_id}")
+        return int(version) if version is not None else 0
+
+    async def bump_version(self, user_id: int) -> None:
+        await self._redis.incr(f"rc:v:{user_id}")
+
+    async def get(self, key: str) -> CachedResponse | None:
+        raw = await self._redis.get(f"rc:{key}")
+        return CachedResponse.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, cached: CachedResponse) -> None:
+        await self._redis.set(f"rc:{key}", cached.dumps(), ex=self.ttl_seconds)
+
+    def info(self) -> dict:
+        return {}
+
+
+def _build_backend():
+    if RESPONSE_CACHE_BACKEND == "off":
+        return None
+    if RESPONSE_CACHE_BACKEND == "redis":
+        return RedisCacheBackend(REDIS_URL, RESPONSE_CACHE_TTL_SECONDS)
+    return MemoryCacheBackend(RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_USERS)
+
+
+response_cache = _build_backend()
+cache_stats = CacheStats()
+
+
+def _matches(path: str, prefixes: tuple[str, ...]) -> bool:
+    return any(path == p or path.startswith(p + "/") for p in prefixes)
+
+
+def is_cached_path(path: str) -> bool:
+    return _matches(path, CACHED_PREFIXES)
+
+
+def invalidates_cache(path: str) -> bool:
+    return _matches(path, INVALIDATING_PREFIXES)
+
+
+def user_id_from_request(request: Request) -> int | None:
+    """Usuario del Bearer JWT sin ir a la BD; None si no hay token válido (la petición sigue sin caché)."""
+    auth = request.headers.get("authorization", "")
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = decode_access_token(token)
+    sub = payload.get("sub") if payload else None
+    try:
+        return int(sub) if sub is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def cache_key(user_id: int, version: int, path: str, query: str) -> str:
+    return f"{user_id}:{version}:{path}?{query}"
+
+
+def snapshot() -> dict:
+    """Contadores de la caché para /metrics/response-cache."""
+    lookups = cache_stats.hits + cache_stats.misses
+    return {
+        "backend": response_cache.name if response_cache else "off",
+        "hits": cache_stats.hits,
+        "misses": cache_stats.misses,
+        "hit_ratio": round(cache_stats.hits / lookups, 3) if lookups else None,
+        "stores": cache_stats.stores,
+        "invalidations": cache_stats.invalidations,
+        **(response_cache.info() if response_cache else {}),
+    }
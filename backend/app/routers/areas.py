@@ -1,28 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models import User, Area
+from app.etag import conditional_get, fingerprint, rows_fingerprint
+from app.models import Area
+from app.quick_find import QuickFindItem, quick_find_index
 from app.schemas import AreaCreate, AreaUpdate, AreaResponse
+from app.serialization import AREA_COLUMNS, encode_area, json_response
 from app.routers.auth import get_current_user
+from app.user_cache import CurrentUser
 
 router = APIRouter(prefix="/areas", tags=["areas"])
 
 
+async def _get_area_for_user(db: AsyncSession, area_id: int, user_id: int) -> Area:
+    """Devuelve el área si existe y pertenece al usuario; si no, 404."""
+    area = await db.scalar(select(Area).where(Area.id == area_id, Area.user_id == user_id))
+    if not area:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Área no encontrada",
+        )
+    return area
+
+
+def areas_list_query(user_id: int):
+    """Consulta de GET /areas y la de su huella (también para scripts/check_query_plans.py)."""
+    q = select(*AREA_COLUMNS).where(Area.user_id == user_id).order_by(Area.name)
+    return q, rows_fingerprint(q.order_by(None), Area.id, Area.updated_at)
+
+
 @router.get("", response_model=list[AreaResponse])
-def list_areas(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def list_areas(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    """Lista todas las áreas del usuario."""
-    return db.query(Area).filter(Area.user_id == current_user.id).order_by(Area.name).all()
+    """Lista todas las áreas del usuario. Soporta If-None-Match (304)."""
+    q, fp = areas_list_query(current_user.id)
+    not_modified = await conditional_get(db, request, response, fp, current_user.id)
+    if not_modified:
+        return not_modified
+    result = await db.execute(q)
+    return json_response([encode_area(area) for area in result.all()], response)
 
 
 @router.post("", response_model=AreaResponse, status_code=status.HTTP_201_CREATED)
-def create_area(
+async def create_area(
     data: AreaCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Crea una nueva área para el usuario."""
     area = Area(
@@ -32,65 +61,87 @@ def create_area(
         color=data.color,
     )
     db.add(area)
-    db.commit()
-    db.refresh(area)
+    await db.commit()
+    quick_find_index.upsert(current_user.id, QuickFindItem.from_area(area))
     return area
 
 
 @router.get("/{area_id}", response_model=AreaResponse)
-def get_area(
+async def get_area(
     area_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    """Obtiene un área por id (solo si pertenece al usuario)."""
-    area = db.query(Area).filter(Area.id == area_id, Area.user_id == current_user.id).first()
-    if not area:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Área no encontrada",
-        )
-    return area
+    """Obtiene un área por id (solo si pertenece al usuario). Soporta If-None-Match (304)."""
+    not_modified = await conditional_get(
+        db,
+        request,
+        response,
+        select(*fingerprint(Area.id, Area.updated_at)).where(
+            Area.id == area_id, Area.user_id == current_user.id
+        ),
+        current_user.id,
+        not_found="Área no encontrada",
+    )
+    if not_modified:
+        return not_modified
+    return await _get_area_for_user(db, area_id, current_user.id)
 
 
 @router.patch("/{area_id}", response_model=AreaResponse)
-def update_area(
+async def update_area(
     area_id: int,
     data: AreaUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Actualiza un área (solo si pertenece al usuario)."""
-    area = db.query(Area).filter(Area.id == area_id, Area.user_id == current_user.id).first()
-    if not area:
+    # Un único UPDATE ... RETURNING: el 404 sale de que no haya fila afectada, sin cargar
+    # antes la entidad
+    owned = (Area.id == area_id, Area.user_id == current_user.id)
+    values = data.model_dump(exclude_none=True)
+    if values:
+        stmt = (
+            update(Area)
+            .where(*owned)
+            .values(**values)
+            .returning(*AREA_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        stmt = select(*AREA_COLUMNS).where(*owned)
+    area = (await db.execute(stmt)).first()
+    if area is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Área no encontrada",
         )
-    if data.name is not None:
-        area.name = data.name
-    if data.description is not None:
-        area.description = data.description
-    if data.color is not None:
-        area.color = data.color
-    db.commit()
-    db.refresh(area)
+    await db.commit()
+    quick_find_index.upsert(current_user.id, QuickFindItem.from_area(area))
     return area
 
 
 @router.delete("/{area_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_area(
+async def delete_area(
     area_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Elimina un área y sus proyectos (solo si pertenece al usuario)."""
-    area = db.query(Area).filter(Area.id == area_id, Area.user_id == current_user.id).first()
-    if not area:
+    # Proyectos y acciones caen por ON DELETE CASCADE y las one-shot quedan sin área (SET NULL)
+    deleted = await db.scalar(
+        delete(Area)
+        .where(Area.id == area_id, Area.user_id == current_user.id)
+        .returning(Area.id)
+        .execution_options(synchronize_session=False)
+    )
+    if deleted is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Área no encontrada",
         )
-    db.delete(area)
-    db.commit()
+    await db.commit()
+    quick_find_index.remove(current_user.id, "area", deleted)
     return None
@@ -1,25 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models import User
 from app.schemas import UserCreate, UserLogin, UserResponse, Token
 from app.security import (
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
+    password_needs_rehash,
     create_access_token,
     decode_access_token,
 )
+from app.user_cache import CurrentUser, user_cache
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 security = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
+    db: AsyncSession = Depends(get_db),
+) -> CurrentUser:
     if not credentials or credentials.credentials is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -40,20 +43,30 @@ def get_current_user(
             detail="Token inválido",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    return await load_current_user(int(user_id), db)
+
+
+async def load_current_user(user_id: int, db: AsyncSession) -> CurrentUser:
+    """Usuario ya autenticado por su token: de user_cache o de la BD (401 si ya no existe)."""
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+    user = await db.scalar(select(User).where(User.id == user_id))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuario no encontrado",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    return user
+    principal = CurrentUser.from_user(user)
+    user_cache.set(principal)
+    return principal
 
 
 @router.post("/register", response_model=UserResponse)
-def register(user_in: UserCreate, db: Session = Depends(get_db)):
+async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     """Registrar un nuevo usuario."""
-    existing = db.query(User).filter(User.email == user_in.email.lower()).first()
+    existing = await db.scalar(select(User).where(User.email == user_in.email.lower()))
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -61,29 +74,32 @@ def register(user_in: UserCreate, db: Session = Depends(get_db)):
         )
     user = User(
         email=user_in.email.lower(),
-        password_hash=get_password_hash(user_in.password),
+        password_hash=await get_password_hash_async(user_in.password),
         full_name=user_in.full_name,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
     return user
 
 
 @router.post("/login", response_model=Token)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     """Iniciar sesión y obtener token JWT."""
-    user = db.query(User).filter(User.email == credentials.email.lower()).first()
-    if not user or not verify_password(credentials.password, user.password_hash):
+    user = await db.scalar(select(User).where(User.email == credentials.email.lower()))
+    if not user or not await verify_password_async(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email o contraseña incorrectos",
         )
+    if password_needs_rehash(user.password_hash):
+        # Hash con un coste de bcrypt antiguo: se actualiza aprovechando que tenemos la contraseña
+        user.password_hash = await get_password_hash_async(credentials.password)
+        await db.commit()
     access_token = create_access_token(data={"sub": str(user.id)})
     return Token(access_token=access_token)
 
 
 @router.get("/me", response_model=UserResponse)
-def me(current_user: User = Depends(get_current_user)):
+async def me(current_user: CurrentUser = Depends(get_current_user)):
     """Obtener el usuario actual (requiere token)."""
     return current_user
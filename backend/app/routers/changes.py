@@ -0,0 +1,108 @@
+import asyncio
+import json
+import os
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.change_feed import change_feed
+from app.database import AsyncSessionLocal
+from app.routers.auth import get_current_user, load_current_user, security
+from app.schemas import StreamToken
+from app.security import STREAM_TOKEN_EXPIRE_SECONDS, create_stream_token, decode_access_token, decode_stream_token
+from app.user_cache import CurrentUser
+
+CHANGE_FEED_HEARTBEAT_SECONDS = float(os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", "15"))
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+async def _stream_user(
+    stream_token: str | None = Query(None, description="Token de POST /changes/stream-token (EventSource no permite cabeceras)"),
+    credentials: HTTPAuthorizationCredentials | None = Depends(security),
+) -> tuple[CurrentUser, float | None]:
+    """
+    Usuario del Bearer o de ?stream_token=, y el instante en que caduca su sesión.
+    Usa una sesión propia y breve: get_db mantendría una conexión del pool
+    durante toda la vida del stream.
+    """
+    async with AsyncSessionLocal() as db:
+        if credentials is None and stream_token:
+            payload = decode_stream_token(stream_token)
+            try:
+                user_id = int(payload["sub"]) if payload else None
+            except (KeyError, TypeError, ValueError):
+                user_id = None
+            if user_id is None:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token de stream inválido o expirado",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            return await load_current_user(user_id, db), payload.get("session_exp")
+        user = await get_current_user(credentials, db)
+    payload = decode_access_token(credentials.credentials) or {}
+    return user, payload.get("exp")
+
+
+@router.post("/stream-token", response_model=StreamToken)
+async def issue_stream_token(
+    current_user: CurrentUser = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+):
+    """Token de vida corta para abrir /changes/stream con EventSource sin poner el JWT en la URL."""
+    payload = decode_access_token(credentials.credentials) or {}
+    return StreamToken(
+        stream_token=create_stream_token(current_user.id, payload.get("exp")),
+        expires_in=STREAM_TOKEN_EXPIRE_SECONDS,
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+@router.get("/stream")
+async def stream_changes(request: Request, auth: tuple[CurrentUser, float | None] = Depends(_stream_user)):
+    """
+    Server-Sent Events con los cambios del usuario en áreas, proyectos, siguientes acciones
+    y one-shots (`event: change`, data = tabla, operación, id y fila nueva).
+    Comentario `: ping` cada CHANGE_FEED_HEARTBEAT_SECONDS. `event: resync` = se han perdido
+    eventos (cliente lento o reconexión): recargar con GET /sync. El stream se cierra al
+    caducar el token de sesión; el cliente reconecta con uno nuevo.
+    """
+    user, expires_at = auth
+    subscriber = change_feed.subscribe(user.id)
+
+    async def events():
+        try:
+            yield _sse("ready", {"user_id": user.id})
+            while True:
+                timeout = CHANGE_FEED_HEARTBEAT_SECONDS
+                if expires_at is not None:
+                    remaining = expires_at - time.time()
+                    if remaining <= 0:
+                        return
+                    timeout = min(timeout, remaining)
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": ping\n\n"
+                    continue
+                if event is None:
+                    subscriber.overflowed = False
+                    yield _sse("resync", {"reason": "eventos perdidos, recargar con GET /sync"})
+                else:
+                    yield _sse("change", event)
+        finally:
+            change_feed.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
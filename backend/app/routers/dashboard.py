@@ -0,0 +1,104 @@
+from collections import defaultdict
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.etag import conditional_get, fingerprint
+from app.models import Area, Project, ProjectNextAction, OneShotTask
+from app.schemas import DashboardResponse
+from app.serialization import (
+    AREA_COLUMNS,
+    NEXT_ACTION_COLUMNS,
+    ONE_SHOT_TASK_COLUMNS,
+    PROJECT_COLUMNS,
+    encode_area,
+    encode_one_shot_task,
+    encode_project,
+    group_by,
+    json_response,
+)
+from app.routers.auth import get_current_user
+from app.user_cache import CurrentUser
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+def _fingerprint_subqueries(model, *where) -> list:
+    """Huella de una tabla como subconsultas escalares, para combinar varias en un SELECT."""
+    return [select(col).where(*where).scalar_subquery() for col in fingerprint(model.id, model.updated_at)]
+
+
+def dashboard_queries(user_id: int):
+    """Huella y las cuatro consultas de GET /dashboard (también para scripts/check_query_plans.py)."""
+    fp = select(
+        *_fingerprint_subqueries(Area, Area.user_id == user_id),
+        *_fingerprint_subqueries(Project, Project.area_id == Area.id, Area.user_id == user_id),
+        *_fingerprint_subqueries(
+            ProjectNextAction,
+            ProjectNextAction.project_id == Project.id,
+            Project.area_id == Area.id,
+            Area.user_id == user_id,
+        ),
+        *_fingerprint_subqueries(OneShotTask, OneShotTask.user_id == user_id),
+    )
+    areas = select(*AREA_COLUMNS).where(Area.user_id == user_id).order_by(Area.name)
+    projects = select(*PROJECT_COLUMNS).join(Area).where(Area.user_id == user_id).order_by(Project.name, Project.id)
+    next_actions = (
+        select(*NEXT_ACTION_COLUMNS)
+        .join(Project)
+        .join(Area)
+        .where(Area.user_id == user_id)
+        .order_by(ProjectNextAction.project_id, ProjectNextAction.id)
+    )
+    tasks = (
+        select(*ONE_SHOT_TASK_COLUMNS)
+        .where(OneShotTask.user_id == user_id)
+        .order_by(OneShotTask.done.asc(), OneShotTask.created_at.desc(), OneShotTask.id.desc())
+    )
+    return fp, areas, projects, next_actions, tasks
+
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Árbol completo del usuario en una sola petición: áreas con sus proyectos
+    (y siguientes acciones) y tareas one-shot agrupadas por área.
+    Número de consultas fijo: áreas, proyectos, siguientes acciones y tareas, cada una
+    con solo las columnas de la respuesta (Rows de Core) y montadas en Python.
+    Soporta If-None-Match (304): la huella de las cuatro tablas va en una sola consulta.
+    """
+    fp, areas_q, projects_q, next_actions_q, tasks_q = dashboard_queries(current_user.id)
+    not_modified = await conditional_get(db, request, response, fp, current_user.id)
+    if not_modified:
+        return not_modified
+    areas = (await db.execute(areas_q)).all()
+    projects = group_by((await db.execute(projects_q)).all(), "area_id")
+    next_actions = group_by((await db.execute(next_actions_q)).all(), "project_id")
+    tasks = (await db.execute(tasks_q)).all()
+    tasks_by_area: dict[int | None, list[dict]] = defaultdict(list)
+    for task in tasks:
+        tasks_by_area[task.area_id].append(encode_one_shot_task(task))
+
+    return json_response(
+        {
+            "areas": [
+                {
+                    **encode_area(area),
+                    "projects": [
+                        encode_project(p, next_actions.get(p.id, ())) for p in projects.get(area.id, ())
+                    ],
+                    "one_shot_tasks": tasks_by_area.get(area.id, []),
+                }
+                for area in areas
+            ],
+            "one_shot_tasks": tasks_by_area.get(None, []),
+        },
+        response,
+    )
@@ -0,0 +1,189 @@
+"""
+"Descargar mis datos": GET /export vuelca áreas, proyectos, siguientes acciones y one-shots
+del usuario como NDJSON, CSV o JSON en streaming.
+
+Las filas se leen con cursores del servidor (stream + yield_per) en bloques de
+EXPORT_CHUNK_ROWS y cada bloque se codifica y se envía antes de leer el siguiente: la
+memoria no depende del tamaño de la cuenta. El orden (áreas, proyectos, acciones,
+one-shots; por id) deja los padres antes que los hijos, que es lo que espera POST /import.
+"""
+import csv
+import io
+import os
+import zlib
+from collections.abc import AsyncIterator
+from datetime import date
+from enum import Enum
+
+import orjson
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncSessionLocal
+from app.models import Area, OneShotTask, Project, ProjectNextAction
+from app.routers.auth import get_current_user
+from app.schemas import AreaResponse, OneShotTaskResponse, ProjectNextActionResponse, ProjectSummaryResponse
+from app.serialization import (
+    AREA_COLUMNS,
+    NEXT_ACTION_COLUMNS,
+    ONE_SHOT_TASK_COLUMNS,
+    PROJECT_COLUMNS,
+    encode_area,
+    encode_next_action,
+    encode_one_shot_task,
+    encode_project_summary,
+)
+from app.user_cache import CurrentUser
+
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "1000"))
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+    json = "json"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+    ExportFormat.json: "application/json",
+}
+
+# (tipo de fila, clave en el JSON, consulta de columnas, encoder); padres antes que hijos.
+EXPORT_TABLES = (
+    ("area", "areas", lambda uid: select(*AREA_COLUMNS).where(Area.user_id == uid).order_by(Area.id), encode_area),
+    (
+        "project",
+        "projects",
+        lambda uid: select(*PROJECT_COLUMNS).join(Area).where(Area.user_id == uid).order_by(Project.id),
+        encode_project_summary,
+    ),
+    (
+        "project_next_action",
+        "project_next_actions",
+        lambda uid: select(*NEXT_ACTION_COLUMNS)
+        .join(Project)
+        .join(Area)
+        .where(Area.user_id == uid)
+        .order_by(ProjectNextAction.id),
+        encode_next_action,
+    ),
+    (
+        "one_shot_task",
+        "one_shot_tasks",
+        lambda uid: select(*ONE_SHOT_TASK_COLUMNS).where(OneShotTask.user_id == uid).order_by(OneShotTask.id),
+        encode_one_shot_task,
+    ),
+)
+
+# CSV único para las cuatro tablas: columna `type` + unión de los campos de los schemas.
+CSV_FIELDS = ["type"] + list(
+    dict.fromkeys(
+        name
+        for schema in (AreaResponse, ProjectSummaryResponse, ProjectNextActionResponse, OneShotTaskResponse)
+        for name in schema.model_fields
+    )
+)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+async def _partitions(db: AsyncSession, query, encode) -> AsyncIterator[list[dict]]:
+    """Bloques de filas (como dict) de una consulta, leídos con cursor del servidor."""
+    result = await db.stream(query.execution_options(yield_per=EXPORT_CHUNK_ROWS))
+    async for rows in result.partitions():
+        yield [encode(row) for row in rows]
+
+
+async def export_chunks(db: AsyncSession, user_id: int, fmt: ExportFormat) -> AsyncIterator[bytes]:
+    """Cuerpo de la exportación en bloques de bytes (uno por bloque de filas leído)."""
+    if fmt is ExportFormat.csv:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(CSV_FIELDS)
+        yield buffer.getvalue().encode()
+    elif fmt is ExportFormat.json:
+        # Un objeto {"areas": [...], "projects": [...], ...} escrito por trozos.
+        yield b"{"
+    for i, (kind, key, query, encode) in enumerate(EXPORT_TABLES):
+        if fmt is ExportFormat.json:
+            yield (b"," if i else b"") + orjson.dumps(key) + b":["
+        first = True
+        async for rows in _partitions(db, query(user_id), encode):
+            if fmt is ExportFormat.ndjson:
+                yield b"".join(
+                    orjson.dumps({"type": kind, **row}, option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE)
+                    for row in rows
+                )
+            elif fmt is ExportFormat.csv:
+                buffer.seek(0)
+                buffer.truncate()
+                for row in rows:
+                    row["type"] = kind
+                    writer.writerow([_csv_value(row.get(name)) for name in CSV_FIELDS])
+                yield buffer.getvalue().encode()
+            else:
+                yield (b"" if first else b",") + b",".join(
+                    orjson.dumps(row, option=orjson.OPT_UTC_Z) for row in rows
+                )
+            first = False
+        if fmt is ExportFormat.json:
+            yield b"]"
+    if fmt is ExportFormat.json:
+        yield b"}"
+
+
+async def _gzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = formato gzip
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@router.get("")
+async def export_data(
+    format: ExportFormat = Query(ExportFormat.ndjson, description="ndjson, csv o json"),
+    gzip: bool = Query(False, description="Comprimir al vuelo (.gz)"),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Descarga todos los datos del usuario (áreas, proyectos, siguientes acciones y one-shots).
+    NDJSON y CSV: una fila por línea con su `type`; JSON: un objeto con una lista por tabla.
+    Se lee en una transacción REPEATABLE READ (instantánea coherente) con sesión propia:
+    la de get_db se cerraría antes de terminar el streaming.
+    """
+    user_id = current_user.id
+
+    async def body() -> AsyncIterator[bytes]:
+        async with AsyncSessionLocal() as db:
+            await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            async for chunk in export_chunks(db, user_id, format):
+                yield chunk
+
+    filename = f"lifehub-export-{date.today():%Y%m%d}.{format.value}"
+    media_type = MEDIA_TYPES[format]
+    content = body()
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+        content = _gzip(content)
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
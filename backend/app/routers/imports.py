@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.data_import import csv_rows, gunzip, import_rows, json_rows, ndjson_rows
+from app.database import get_db
+from app.quick_find import quick_find_index
+from app.routers.auth import get_current_user
+from app.routers.export import ExportFormat
+from app.schemas import ImportResponse
+from app.user_cache import CurrentUser
+
+router = APIRouter(prefix="/import", tags=["import"])
+
+PARSERS = {
+    ExportFormat.ndjson: ndjson_rows,
+    ExportFormat.csv: csv_rows,
+    ExportFormat.json: json_rows,
+}
+
+
+@router.post("", response_model=ImportResponse)
+async def import_data(
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.ndjson, description="ndjson, csv o json"),
+    gzip: bool = Query(False, description="Cuerpo comprimido con gzip"),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Importa áreas, proyectos, siguientes acciones y one-shots en el formato de GET /export
+    (cuerpo crudo, no multipart). Se lee en streaming y se carga con COPY en una sola
+    transacción: o entra todo o nada (422 con las filas erróneas). Los ids del fichero solo
+    enlazan la jerarquía; las filas se crean con ids nuevos para el usuario actual.
+    """
+    chunks = request.stream()
+    if gzip:
+        chunks = gunzip(chunks)
+    result = await import_rows(db, current_user.id, PARSERS[format](chunks))
+    await db.commit()
+    quick_find_index.invalidate(current_user.id)
+    return result
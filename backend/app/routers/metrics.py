@@ -0,0 +1,53 @@
+"""
+Métricas internas (pool, cachés, stream de cambios). No son datos de usuario sino de
+operación, así que no se sirven a cualquiera: solo con la cabecera X-Metrics-Token igual
+a METRICS_TOKEN. Sin METRICS_TOKEN configurado, /metrics/* responde 404.
+"""
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from app import response_cache
+from app.change_feed import change_feed
+from app.database import async_engine, pool_stats
+from app.quick_find import quick_find_index
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
+def require_metrics_token(x_metrics_token: str | None = Header(None)) -> None:
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Métricas desactivadas")
+    if not x_metrics_token or not hmac.compare_digest(x_metrics_token, METRICS_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Token de métricas incorrecto")
+
+
+router = APIRouter(prefix="/metrics", tags=["metrics"], dependencies=[Depends(require_metrics_token)])
+
+
+@router.get("/db-pool")
+async def db_pool_metrics():
+    """
+    Estado del pool de conexiones de la API: conexiones en uso e inactivas, overflow,
+    checkouts esperando, tiempos de espera y timeouts acumulados desde el arranque.
+    """
+    return pool_stats.snapshot(async_engine.pool)
+
+
+@router.get("/response-cache")
+async def response_cache_metrics():
+    """Aciertos, fallos, entradas guardadas e invalidaciones de la caché de respuestas."""
+    return response_cache.snapshot()
+
+
+@router.get("/change-feed")
+async def change_feed_metrics():
+    """Clientes conectados al stream de cambios y eventos recibidos / descartados por backpressure."""
+    return change_feed.snapshot()
+
+
+@router.get("/quick-find")
+async def quick_find_metrics():
+    """Usuarios con índice de búsqueda rápida en memoria, bytes estimados, aciertos, construcciones y desalojos."""
+    return quick_find_index.snapshot()
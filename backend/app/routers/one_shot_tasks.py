@@ -1,47 +1,152 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import (
+    Boolean,
+    Integer,
+    String,
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models import User, OneShotTask, Area
-from app.schemas import OneShotTaskCreate, OneShotTaskUpdate, OneShotTaskResponse
+from app.etag import conditional_get, fingerprint, rows_fingerprint
+from app.models import OneShotTask, Area
+from app.pagination import MAX_PAGE_SIZE, aware_datetime, decode_cursor, paginate
+from app.schemas import (
+    OneShotTaskCreate,
+    OneShotTaskUpdate,
+    OneShotTaskResponse,
+    OneShotTaskBatchRequest,
+    OneShotTaskBatchResponse,
+    OneShotTaskBatchResult,
+)
 from app.routers.auth import get_current_user
+from app.serialization import ONE_SHOT_TASK_COLUMNS, encode_one_shot_task, json_response
+from app.user_cache import CurrentUser
 
 
-def _ensure_area_belongs_to_user(db: Session, area_id: int, user_id: int) -> None:
+async def _ensure_area_belongs_to_user(db: AsyncSession, area_id: int, user_id: int) -> None:
     """Lanza 404 si el área no existe o no pertenece al usuario."""
-    area = db.query(Area).filter(Area.id == area_id, Area.user_id == user_id).first()
+    area = await db.scalar(select(Area.id).where(Area.id == area_id, Area.user_id == user_id))
     if not area:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Área no encontrada",
         )
 
+
+async def _get_task_for_user(db: AsyncSession, task_id: int, user_id: int) -> OneShotTask:
+    """Devuelve la tarea si existe y pertenece al usuario; si no, 404."""
+    task = await db.scalar(
+        select(OneShotTask).where(OneShotTask.id == task_id, OneShotTask.user_id == user_id)
+    )
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tarea no encontrada",
+        )
+    return task
+
+
+def _task_order(columns) -> tuple:
+    """Orden del listado (pendientes primero, más recientes antes) sobre el modelo o una subconsulta."""
+    return (columns.done.asc(), columns.created_at.desc(), columns.id.desc())
+
+
+def tasks_list_query(
+    user_id: int,
+    *,
+    done: bool | None = None,
+    area_id: int | None = None,
+    no_area: bool = False,
+    after: tuple | None = None,
+    limit: int | None = None,
+):
+    """
+    Consulta de GET /one-shot-tasks (con limit + 1 filas) y la de su huella para el ETag.
+    after: (done, created_at, id) de la última fila de la página anterior.
+    También la usan scripts/check_query_plans.py y scripts/bench_etag.py.
+    """
+    filters = [OneShotTask.user_id == user_id]
+    if done is not None:
+        filters.append(OneShotTask.done == done)
+    if no_area:
+        filters.append(OneShotTask.area_id.is_(None))
+    elif area_id is not None:
+        filters.append(OneShotTask.area_id == area_id)
+    q = select(*ONE_SHOT_TASK_COLUMNS).where(*filters)
+    columns = OneShotTask
+    if after is not None:
+        c_done, c_created_at, c_id = after
+        # Resto del grupo del cursor y después los grupos con done mayor: dos rangos del
+        # índice (user_id, done, created_at desc, id desc), cada uno con su ORDER BY y LIMIT.
+        # Con un OR de ambas condiciones Postgres recorre el índice desde el principio del
+        # grupo y cada página cuesta según su posición en el listado.
+        branches = [
+            q.where(
+                OneShotTask.done == c_done,
+                tuple_(OneShotTask.created_at, OneShotTask.id) < tuple_(c_created_at, c_id),
+            ),
+            q.where(OneShotTask.done > literal(c_done)),
+        ]
+        if limit is not None:
+            branches = [branch.order_by(*_task_order(OneShotTask)).limit(limit + 1) for branch in branches]
+        columns = union_all(*branches).subquery().c
+        q = select(*columns)
+    q = q.order_by(*_task_order(columns))
+    if limit is not None:
+        q = q.limit(limit + 1)
+    fp = rows_fingerprint(
+        q if limit is not None else q.order_by(None), columns.id, columns.updated_at, columns.area_id
+    )
+    return q, fp
+
+
 router = APIRouter(prefix="/one-shot-tasks", tags=["one-shot-tasks"])
 
 
 @router.get("", response_model=list[OneShotTaskResponse])
-def list_one_shot_tasks(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def list_one_shot_tasks(
+    request: Request,
+    response: Response,
+    done: bool | None = Query(None, description="Filtrar por hecha / pendiente"),
+    area_id: int | None = Query(None, description="Filtrar por área"),
+    no_area: bool = Query(False, description="Solo tareas sin área (One shot)"),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Tamaño de página"),
+    cursor: str | None = Query(None, description="Cursor X-Next-Cursor de la página anterior"),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    """Lista las tareas one-shot del usuario (sin proyecto)."""
-    return (
-        db.query(OneShotTask)
-        .filter(OneShotTask.user_id == current_user.id)
-        .order_by(OneShotTask.done.asc(), OneShotTask.created_at.desc())
-        .all()
-    )
+    """
+    Lista las tareas one-shot del usuario (sin proyecto): pendientes primero, más recientes antes.
+    Paginación por cursor sobre (done, created_at, id). Soporta If-None-Match (304).
+    """
+    after = decode_cursor(cursor, bool, aware_datetime, int) if cursor is not None else None
+    q, fp = tasks_list_query(current_user.id, done=done, area_id=area_id, no_area=no_area, after=after, limit=limit)
+    not_modified = await conditional_get(db, request, response, fp, current_user.id)
+    if not_modified:
+        return not_modified
+    rows = (await db.execute(q)).all()
+    page = paginate(rows, limit, response, lambda t: (t.done, t.created_at, t.id))
+    return json_response([encode_one_shot_task(task) for task in page], response)
 
 
 @router.post("", response_model=OneShotTaskResponse, status_code=status.HTTP_201_CREATED)
-def create_one_shot_task(
+async def create_one_shot_task(
     data: OneShotTaskCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Crea una tarea one-shot. area_id null = One shot."""
     if data.area_id is not None:
-        _ensure_area_belongs_to_user(db, data.area_id, current_user.id)
+        await _ensure_area_belongs_to_user(db, data.area_id, current_user.id)
     task = OneShotTask(
         user_id=current_user.id,
         title=data.title.strip(),
@@ -49,78 +154,242 @@ def create_one_shot_task(
         done=False,
     )
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await db.commit()
     return task
 
 
+@router.post("/batch", response_model=OneShotTaskBatchResponse)
+async def batch_one_shot_tasks(
+    data: OneShotTaskBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Aplica varias altas, cambios y bajas de tareas one-shot en una sola transacción."""
+    ops = data.operations
+    area_ids = {op.area_id for op in ops if op.op != "delete" and op.area_id is not None}
+    task_ids = {op.id for op in ops if op.op != "create" and op.id is not None}
+    # Una consulta por tipo valida la propiedad y bloquea hasta el commit (tareas FOR UPDATE
+    # en orden de id, áreas FOR KEY SHARE): no pueden borrarse ni cambiar de dueño a mitad
+    # del lote. Las operaciones inválidas se informan en su resultado sin abortar el resto.
+    owned_areas = set(
+        (
+            await db.scalars(
+                select(Area.id)
+                .where(Area.id.in_(area_ids), Area.user_id == current_user.id)
+                .order_by(Area.id)
+                .with_for_update(read=True, key_share=True)
+            )
+        ).all()
+        if area_ids
+        else ()
+    )
+    owned_tasks = set(
+        (
+            await db.scalars(
+                select(OneShotTask.id)
+                .where(OneShotTask.id.in_(task_ids), OneShotTask.user_id == current_user.id)
+                .order_by(OneShotTask.id)
+                .with_for_update()
+            )
+        ).all()
+        if task_ids
+        else ()
+    )
+
+    results = [OneShotTaskBatchResult(index=i, op=op.op, ok=False, id=op.id) for i, op in enumerate(ops)]
+    creates: list[tuple[int, dict]] = []
+    updates: list[tuple[int, dict]] = []
+    deletes: list[int] = []
+    seen: set[int] = set()
+    for i, op in enumerate(ops):
+        title = op.title.strip() if op.title is not None else None
+        if op.op == "create":
+            if not title:
+                results[i].detail = "El título es obligatorio"
+                continue
+        elif op.id is None:
+            results[i].detail = "Falta el id de la tarea"
+            continue
+        elif op.id not in owned_tasks:
+            results[i].detail = "Tarea no encontrada"
+            continue
+        elif op.id in seen:
+            results[i].detail = "Tarea repetida en el lote"
+            continue
+        elif op.op == "update" and title == "":
+            results[i].detail = "El título no puede estar vacío"
+            continue
+        if op.op != "delete" and op.area_id is not None and op.area_id not in owned_areas:
+            results[i].detail = "Área no encontrada"
+            continue
+
+        if op.op == "create":
+            creates.append(
+                (
+                    i,
+                    {
+                        "user_id": current_user.id,
+                        "title": title,
+                        "area_id": op.area_id,
+                        "done": bool(op.done),
+                    },
+                )
+            )
+        elif op.op == "update":
+            seen.add(op.id)
+            updates.append((i, {"b_id": op.id, "b_title": title, "b_done": op.done, "b_area_id": op.area_id}))
+        else:
+            seen.add(op.id)
+            deletes.append(i)
+
+    # Escrituras multi-fila (INSERT, UPDATE executemany, DELETE ... RETURNING) filtradas
+    # también por usuario; ok sale de las filas que devuelven
+    if creates:
+        created = (
+            await db.scalars(
+                insert(OneShotTask).returning(OneShotTask, sort_by_parameter_order=True),
+                [row for _, row in creates],
+            )
+        ).all()
+        for (i, _), task in zip(creates, created):
+            results[i].ok, results[i].id = True, task.id
+            results[i].task = OneShotTaskResponse.model_validate(task)
+
+    if updates:
+        # Un único UPDATE ejecutado como executemany; COALESCE deja igual lo que no se envía
+        # (misma semántica que el PATCH: area_id null no quita el área).
+        t = OneShotTask.__table__
+        await db.execute(
+            update(t)
+            .where(t.c.id == bindparam("b_id"), t.c.user_id == current_user.id)
+            .values(
+                title=func.coalesce(bindparam("b_title", type_=String), t.c.title),
+                done=func.coalesce(bindparam("b_done", type_=Boolean), t.c.done),
+                area_id=func.coalesce(bindparam("b_area_id", type_=Integer), t.c.area_id),
+            ),
+            [row for _, row in updates],
+        )
+        updated = {
+            task.id: task
+            for task in (
+                await db.scalars(
+                    select(OneShotTask)
+                    .where(
+                        OneShotTask.id.in_([row["b_id"] for _, row in updates]),
+                        OneShotTask.user_id == current_user.id,
+                    )
+                    .execution_options(populate_existing=True)
+                )
+            ).all()
+        }
+        for i, row in updates:
+            task = updated.get(row["b_id"])
+            if task is None:
+                results[i].detail = "Tarea no encontrada"
+                continue
+            results[i].ok = True
+            results[i].task = OneShotTaskResponse.model_validate(task)
+
+    if deletes:
+        deleted = set(
+            (
+                await db.scalars(
+                    delete(OneShotTask)
+                    .where(OneShotTask.id.in_([ops[i].id for i in deletes]), OneShotTask.user_id == current_user.id)
+                    .returning(OneShotTask.id)
+                    .execution_options(synchronize_session=False)
+                )
+            ).all()
+        )
+        for i in deletes:
+            results[i].ok = ops[i].id in deleted
+            if not results[i].ok:
+                results[i].detail = "Tarea no encontrada"
+
+    await db.commit()
+    return {"results": results}
+
+
 @router.get("/{task_id}", response_model=OneShotTaskResponse)
-def get_one_shot_task(
+async def get_one_shot_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    """Obtiene una tarea one-shot por id."""
-    task = (
-        db.query(OneShotTask)
-        .filter(OneShotTask.id == task_id, OneShotTask.user_id == current_user.id)
-        .first()
+    """Obtiene una tarea one-shot por id. Soporta If-None-Match (304)."""
+    not_modified = await conditional_get(
+        db,
+        request,
+        response,
+        select(*fingerprint(OneShotTask.id, OneShotTask.updated_at, OneShotTask.area_id)).where(
+            OneShotTask.id == task_id, OneShotTask.user_id == current_user.id
+        ),
+        current_user.id,
+        not_found="Tarea no encontrada",
     )
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tarea no encontrada",
-        )
-    return task
+    if not_modified:
+        return not_modified
+    return await _get_task_for_user(db, task_id, current_user.id)
 
 
 @router.patch("/{task_id}", response_model=OneShotTaskResponse)
-def update_one_shot_task(
+async def update_one_shot_task(
     task_id: int,
     data: OneShotTaskUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Actualiza una tarea one-shot."""
-    task = (
-        db.query(OneShotTask)
-        .filter(OneShotTask.id == task_id, OneShotTask.user_id == current_user.id)
-        .first()
-    )
-    if not task:
+    values = data.model_dump(exclude_none=True)
+    if data.title is not None:
+        values["title"] = data.title.strip()
+    # Un único UPDATE ... RETURNING filtrado por usuario y, si cambia, por el área nueva.
+    # Sin fila afectada se mira qué falló: primero la tarea y luego el área
+    owned = (OneShotTask.id == task_id, OneShotTask.user_id == current_user.id)
+    area_owned = ()
+    if data.area_id is not None:
+        area_owned = (select(Area.id).where(Area.id == data.area_id, Area.user_id == current_user.id).exists(),)
+    if values:
+        stmt = (
+            update(OneShotTask)
+            .where(*owned, *area_owned)
+            .values(**values)
+            .returning(*ONE_SHOT_TASK_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        stmt = select(*ONE_SHOT_TASK_COLUMNS).where(*owned)
+    task = (await db.execute(stmt)).first()
+    if task is None:
+        if area_owned and await db.scalar(select(OneShotTask.id).where(*owned)) is not None:
+            await _ensure_area_belongs_to_user(db, data.area_id, current_user.id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Tarea no encontrada",
         )
-    if data.title is not None:
-        task.title = data.title.strip()
-    if data.done is not None:
-        task.done = data.done
-    if data.area_id is not None:
-        _ensure_area_belongs_to_user(db, data.area_id, current_user.id)
-        task.area_id = data.area_id
-    db.commit()
-    db.refresh(task)
+    await db.commit()
     return task
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_one_shot_task(
+async def delete_one_shot_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Elimina una tarea one-shot."""
-    task = (
-        db.query(OneShotTask)
-        .filter(OneShotTask.id == task_id, OneShotTask.user_id == current_user.id)
-        .first()
+    deleted = await db.scalar(
+        delete(OneShotTask)
+        .where(OneShotTask.id == task_id, OneShotTask.user_id == current_user.id)
+        .returning(OneShotTask.id)
+        .execution_options(synchronize_session=False)
     )
-    if not task:
+    if deleted is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Tarea no encontrada",
         )
-    db.delete(task)
-    db.commit()
+    await db.commit()
     return None
@@ -1,26 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import Boolean, String, bindparam, delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models import User, Area, Project, ProjectNextAction
+from app.etag import conditional_get, rows_fingerprint
+from app.models import Area, Project, ProjectNextAction
+from app.pagination import MAX_PAGE_SIZE, decode_cursor, paginate
 from app.schemas import (
     ProjectNextActionCreate,
     ProjectNextActionUpdate,
     ProjectNextActionResponse,
+    ProjectNextActionBatchRequest,
+    ProjectNextActionBatchResponse,
+    ProjectNextActionBatchResult,
 )
 from app.routers.auth import get_current_user
+from app.serialization import NEXT_ACTION_COLUMNS, encode_next_action, json_response
+from app.user_cache import CurrentUser
 
 router = APIRouter(tags=["project-next-actions"])
 
 
-def _get_project_for_user(db: Session, project_id: int, user_id: int) -> Project:
-    """Devuelve el proyecto si existe y su área pertenece al usuario; si no, 404."""
-    project = (
-        db.query(Project)
-        .join(Area)
-        .filter(Project.id == project_id, Area.user_id == user_id)
-        .first()
-    )
+async def _get_project_for_user(db: AsyncSession, project_id: int, user_id: int, lock: bool = False) -> Project:
+    """
+    Devuelve el proyecto si existe y su área pertenece al usuario; si no, 404.
+    Con lock=True lo bloquea (FOR KEY SHARE) hasta el commit: no se puede borrar entretanto.
+    """
+    stmt = select(Project).join(Area).where(Project.id == project_id, Area.user_id == user_id)
+    if lock:
+        stmt = stmt.with_for_update(of=Project, read=True, key_share=True)
+    project = await db.scalar(stmt)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -29,45 +38,57 @@ def _get_project_for_user(db: Session, project_id: int, user_id: int) -> Project
     return project
 
 
-def _get_next_action_for_user(
-    db: Session, next_action_id: int, user_id: int
-) -> ProjectNextAction:
-    """Devuelve la siguiente acción si existe y el proyecto es del usuario; si no, 404."""
-    na = (
-        db.query(ProjectNextAction)
-        .join(Project)
-        .join(Area)
-        .filter(
-            ProjectNextAction.id == next_action_id,
-            Area.user_id == user_id,
-        )
-        .first()
+def _owned_by(user_id: int):
+    """Predicado de propiedad sin join: el proyecto de la acción está en un área del usuario."""
+    return ProjectNextAction.project_id.in_(
+        select(Project.id).join(Area).where(Area.user_id == user_id)
     )
-    if not na:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Siguiente acción no encontrada",
-        )
-    return na
+
+
+def next_actions_list_query(project_id: int, *, after: int | None = None, limit: int | None = None):
+    """
+    Consulta de GET /projects/{id}/next-actions (con limit + 1 filas) y la de su huella.
+    after: id de la última fila de la página anterior. También la usa
+    scripts/check_query_plans.py.
+    """
+    q = select(*NEXT_ACTION_COLUMNS).where(ProjectNextAction.project_id == project_id)
+    if after is not None:
+        q = q.where(ProjectNextAction.id > after)
+    q = q.order_by(ProjectNextAction.id)
+    if limit is not None:
+        q = q.limit(limit + 1)
+    fp = rows_fingerprint(
+        q if limit is not None else q.order_by(None), ProjectNextAction.id, ProjectNextAction.updated_at
+    )
+    return q, fp
 
 
 @router.get(
     "/projects/{project_id}/next-actions",
     response_model=list[ProjectNextActionResponse],
 )
-def list_project_next_actions(
+async def list_project_next_actions(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Tamaño de página"),
+    cursor: str | None = Query(None, description="Cursor X-Next-Cursor de la página anterior"),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    """Lista las siguientes acciones de un proyecto."""
-    _get_project_for_user(db, project_id, current_user.id)
-    return (
-        db.query(ProjectNextAction)
-        .filter(ProjectNextAction.project_id == project_id)
-        .order_by(ProjectNextAction.id)
-        .all()
-    )
+    """
+    Lista las siguientes acciones de un proyecto. Paginación por cursor sobre id.
+    Soporta If-None-Match (304).
+    """
+    await _get_project_for_user(db, project_id, current_user.id)
+    after = decode_cursor(cursor, int)[0] if cursor is not None else None
+    q, fp = next_actions_list_query(project_id, after=after, limit=limit)
+    not_modified = await conditional_get(db, request, response, fp, current_user.id)
+    if not_modified:
+        return not_modified
+    rows = (await db.execute(q)).all()
+    page = paginate(rows, limit, response, lambda na: (na.id,))
+    return json_response([encode_next_action(na) for na in page], response)
 
 
 @router.post(
@@ -75,42 +96,183 @@ def list_project_next_actions(
     response_model=ProjectNextActionResponse,
     status_code=status.HTTP_201_CREATED,
 )
-def create_project_next_action(
+async def create_project_next_action(
     project_id: int,
     data: ProjectNextActionCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Añade una siguiente acción a un proyecto."""
-    project = _get_project_for_user(db, project_id, current_user.id)
+    project = await _get_project_for_user(db, project_id, current_user.id)
     na = ProjectNextAction(
         project_id=project.id,
         title=data.title.strip(),
     )
     db.add(na)
-    db.commit()
-    db.refresh(na)
+    await db.commit()
     return na
 
 
+@router.post(
+    "/projects/{project_id}/next-actions/batch",
+    response_model=ProjectNextActionBatchResponse,
+)
+async def batch_project_next_actions(
+    project_id: int,
+    data: ProjectNextActionBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Aplica varias altas, cambios y bajas de siguientes acciones de un proyecto en una sola transacción."""
+    # La propiedad del proyecto se comprueba una vez y las acciones referenciadas quedan
+    # bloqueadas (FOR UPDATE, en orden de id) hasta el commit. Las operaciones inválidas se
+    # informan en su resultado.
+    await _get_project_for_user(db, project_id, current_user.id, lock=True)
+    ops = data.operations
+    action_ids = {op.id for op in ops if op.op != "create" and op.id is not None}
+    owned = set(
+        (
+            await db.scalars(
+                select(ProjectNextAction.id)
+                .where(ProjectNextAction.id.in_(action_ids), ProjectNextAction.project_id == project_id)
+                .order_by(ProjectNextAction.id)
+                .with_for_update()
+            )
+        ).all()
+        if action_ids
+        else ()
+    )
+
+    results = [ProjectNextActionBatchResult(index=i, op=op.op, ok=False, id=op.id) for i, op in enumerate(ops)]
+    creates: list[tuple[int, dict]] = []
+    updates: list[tuple[int, dict]] = []
+    deletes: list[int] = []
+    seen: set[int] = set()
+    for i, op in enumerate(ops):
+        title = op.title.strip() if op.title is not None else None
+        if op.op == "create":
+            if not title:
+                results[i].detail = "El título es obligatorio"
+                continue
+            creates.append((i, {"project_id": project_id, "title": title, "done": bool(op.done)}))
+            continue
+        if op.id is None:
+            results[i].detail = "Falta el id de la siguiente acción"
+        elif op.id not in owned:
+            results[i].detail = "Siguiente acción no encontrada"
+        elif op.id in seen:
+            results[i].detail = "Siguiente acción repetida en el lote"
+        elif op.op == "update" and title == "":
+            results[i].detail = "El título no puede estar vacío"
+        elif op.op == "update":
+            seen.add(op.id)
+            updates.append((i, {"b_id": op.id, "b_title": title, "b_done": op.done}))
+        else:
+            seen.add(op.id)
+            deletes.append(i)
+
+    # Cada tipo de operación en una única sentencia, filtrada también por proyecto
+    if creates:
+        created = (
+            await db.scalars(
+                insert(ProjectNextAction).returning(ProjectNextAction, sort_by_parameter_order=True),
+                [row for _, row in creates],
+            )
+        ).all()
+        for (i, _), na in zip(creates, created):
+            results[i].ok, results[i].id = True, na.id
+            results[i].next_action = ProjectNextActionResponse.model_validate(na)
+
+    if updates:
+        # Un único UPDATE ejecutado como executemany; COALESCE deja igual lo que no se envía.
+        t = ProjectNextAction.__table__
+        await db.execute(
+            update(t)
+            .where(t.c.id == bindparam("b_id"), t.c.project_id == project_id)
+            .values(
+                title=func.coalesce(bindparam("b_title", type_=String), t.c.title),
+                done=func.coalesce(bindparam("b_done", type_=Boolean), t.c.done),
+            ),
+            [row for _, row in updates],
+        )
+        updated = {
+            na.id: na
+            for na in (
+                await db.scalars(
+                    select(ProjectNextAction)
+                    .where(
+                        ProjectNextAction.id.in_([row["b_id"] for _, row in updates]),
+                        ProjectNextAction.project_id == project_id,
+                    )
+                    .execution_options(populate_existing=True)
+                )
+            ).all()
+        }
+        for i, row in updates:
+            na = updated.get(row["b_id"])
+            if na is None:
+                results[i].detail = "Siguiente acción no encontrada"
+                continue
+            results[i].ok = True
+            results[i].next_action = ProjectNextActionResponse.model_validate(na)
+
+    if deletes:
+        deleted = set(
+            (
+                await db.scalars(
+                    delete(ProjectNextAction)
+                    .where(
+                        ProjectNextAction.id.in_([ops[i].id for i in deletes]),
+                        ProjectNextAction.project_id == project_id,
+                    )
+                    .returning(ProjectNextAction.id)
+                    .execution_options(synchronize_session=False)
+                )
+            ).all()
+        )
+        for i in deletes:
+            results[i].ok = ops[i].id in deleted
+            if not results[i].ok:
+                results[i].detail = "Siguiente acción no encontrada"
+
+    await db.commit()
+    return {"results": results}
+
+
 @router.patch(
     "/project-next-actions/{next_action_id}",
     response_model=ProjectNextActionResponse,
 )
-def update_project_next_action(
+async def update_project_next_action(
     next_action_id: int,
     data: ProjectNextActionUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Actualiza una siguiente acción (título o hecho)."""
-    na = _get_next_action_for_user(db, next_action_id, current_user.id)
+    values = data.model_dump(exclude_none=True)
     if data.title is not None:
-        na.title = data.title.strip()
-    if data.done is not None:
-        na.done = data.done
-    db.commit()
-    db.refresh(na)
+        values["title"] = data.title.strip()
+    # Un único UPDATE ... RETURNING con la propiedad en subconsulta: el 404 sale de que no
+    # haya fila afectada
+    owned = (ProjectNextAction.id == next_action_id, _owned_by(current_user.id))
+    if values:
+        stmt = (
+            update(ProjectNextAction)
+            .where(*owned)
+            .values(**values)
+            .returning(*NEXT_ACTION_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        stmt = select(*NEXT_ACTION_COLUMNS).where(*owned)
+    na = (await db.execute(stmt)).first()
+    if na is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Siguiente acción no encontrada",
+        )
+    await db.commit()
     return na
 
 
@@ -118,13 +280,22 @@ def update_project_next_action(
     "/project-next-actions/{next_action_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-def delete_project_next_action(
+async def delete_project_next_action(
     next_action_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Elimina una siguiente acción."""
-    na = _get_next_action_for_user(db, next_action_id, current_user.id)
-    db.delete(na)
-    db.commit()
+    deleted = await db.scalar(
+        delete(ProjectNextAction)
+        .where(ProjectNextAction.id == next_action_id, _owned_by(current_user.id))
+        .returning(ProjectNextAction.id)
+        .execution_options(synchronize_session=False)
+    )
+    if deleted is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Siguiente acción no encontrada",
+        )
+    await db.commit()
     return None
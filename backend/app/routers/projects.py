@@ -1,17 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.database import get_db
-from app.models import User, Area, Project
+from app.etag import conditional_get, fingerprint
+from app.models import Area, Project, ProjectNextAction
+from app.pagination import MAX_PAGE_SIZE, decode_cursor, paginate
+from app.quick_find import QuickFindItem, quick_find_index
 from app.schemas import ProjectCreate, ProjectUpdate, ProjectResponse
 from app.routers.auth import get_current_user
+from app.serialization import NEXT_ACTION_COLUMNS, PROJECT_COLUMNS, encode_project, group_by, json_response
+from app.user_cache import CurrentUser
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
-def _ensure_area_belongs_to_user(db: Session, area_id: int, user_id: int) -> Area:
+async def _ensure_area_belongs_to_user(db: AsyncSession, area_id: int, user_id: int) -> Area:
     """Devuelve el área si existe y pertenece al usuario; si no, lanza 404."""
-    area = db.query(Area).filter(Area.id == area_id, Area.user_id == user_id).first()
+    area = await db.scalar(select(Area).where(Area.id == area_id, Area.user_id == user_id))
     if not area:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -20,114 +27,214 @@ def _ensure_area_belongs_to_user(db: Session, area_id: int, user_id: int) -> Are
     return area
 
 
+async def _get_project_for_user(db: AsyncSession, project_id: int, user_id: int) -> Project:
+    """
+    Devuelve el proyecto (con sus siguientes acciones cargadas) si su área pertenece
+    al usuario; si no, 404. En async no hay lazy loading: la relación se carga aquí.
+    """
+    project = await db.scalar(
+        select(Project)
+        .join(Area)
+        .where(Project.id == project_id, Area.user_id == user_id)
+        .options(selectinload(Project.next_actions))
+    )
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Proyecto no encontrado",
+        )
+    return project
+
+
+def _owned_by(user_id: int):
+    """Predicado de propiedad sin join: el área del proyecto es del usuario (subconsulta)."""
+    return Project.area_id.in_(select(Area.id).where(Area.user_id == user_id))
+
+
+def _projects_fingerprint(stmt):
+    """
+    Huella de los proyectos de `stmt` (los de la página con ?limit=) y de sus siguientes
+    acciones, que van embebidas en la respuesta.
+    """
+    projects = stmt.with_only_columns(Project.id, Project.updated_at).subquery()
+    return (
+        select(
+            *fingerprint(projects.c.id, projects.c.updated_at),
+            *fingerprint(ProjectNextAction.id, ProjectNextAction.updated_at),
+        )
+        .select_from(projects)
+        .outerjoin(ProjectNextAction, ProjectNextAction.project_id == projects.c.id)
+    )
+
+
+def projects_list_query(
+    user_id: int, *, area_id: int | None = None, after: tuple | None = None, limit: int | None = None
+):
+    """
+    Consulta de GET /projects (con limit + 1 filas) y la de su huella para el ETag.
+    after: (name, id) de la última fila de la página anterior. También la usa
+    scripts/check_query_plans.py.
+    """
+    q = select(*PROJECT_COLUMNS).join(Area).where(Area.user_id == user_id)
+    if area_id is not None:
+        q = q.where(Project.area_id == area_id)
+    if after is not None:
+        q = q.where(tuple_(Project.name, Project.id) > tuple_(*after))
+    q = q.order_by(Project.name, Project.id)
+    if limit is not None:
+        q = q.limit(limit + 1)
+    return q, _projects_fingerprint(q if limit is not None else q.order_by(None))
+
+
+def next_actions_of_query(project_ids: list[int]):
+    """Siguientes acciones de los proyectos de una página, en plano."""
+    return (
+        select(*NEXT_ACTION_COLUMNS)
+        .where(ProjectNextAction.project_id.in_(project_ids))
+        .order_by(ProjectNextAction.project_id, ProjectNextAction.id)
+    )
+
+
 @router.get("", response_model=list[ProjectResponse])
-def list_projects(
+async def list_projects(
+    request: Request,
+    response: Response,
     area_id: int | None = Query(None, description="Filtrar por área"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Tamaño de página"),
+    cursor: str | None = Query(None, description="Cursor X-Next-Cursor de la página anterior"),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    """Lista proyectos del usuario. Opcionalmente filtrados por área."""
-    q = db.query(Project).join(Area).filter(Area.user_id == current_user.id)
-    if area_id is not None:
-        q = q.filter(Project.area_id == area_id)
-    return q.order_by(Project.name).all()
+    """
+    Lista proyectos del usuario, por nombre. Opcionalmente filtrados por área.
+    Paginación por cursor sobre (name, id). Soporta If-None-Match (304).
+    """
+    after = decode_cursor(cursor, str, int) if cursor is not None else None
+    q, fp = projects_list_query(current_user.id, area_id=area_id, after=after, limit=limit)
+    not_modified = await conditional_get(db, request, response, fp, current_user.id)
+    if not_modified:
+        return not_modified
+    rows = (await db.execute(q)).all()
+    page = paginate(rows, limit, response, lambda p: (p.name, p.id))
+    next_actions = group_by(
+        (await db.execute(next_actions_of_query([p.id for p in page]))).all() if page else (),
+        "project_id",
+    )
+    return json_response([encode_project(p, next_actions.get(p.id, ())) for p in page], response)
 
 
 @router.post("", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
-def create_project(
+async def create_project(
     data: ProjectCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Crea un proyecto dentro de un área (el área debe ser del usuario)."""
-    _ensure_area_belongs_to_user(db, data.area_id, current_user.id)
+    await _ensure_area_belongs_to_user(db, data.area_id, current_user.id)
     project = Project(
         area_id=data.area_id,
         icon=data.icon,
         name=data.name,
         description=data.description,
         pinned=data.pinned,
+        next_actions=[],  # colección ya cargada (vacía): la respuesta no necesita otra consulta
     )
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    quick_find_index.upsert(current_user.id, QuickFindItem.from_project(project))
     return project
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
-def get_project(
+async def get_project(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    """Obtiene un proyecto por id (solo si su área pertenece al usuario)."""
-    project = (
-        db.query(Project)
-        .join(Area)
-        .filter(Project.id == project_id, Area.user_id == current_user.id)
-        .first()
+    """Obtiene un proyecto por id (solo si su área pertenece al usuario). Soporta If-None-Match (304)."""
+    not_modified = await conditional_get(
+        db,
+        request,
+        response,
+        _projects_fingerprint(
+            select(Project.id).join(Area).where(Area.user_id == current_user.id, Project.id == project_id)
+        ),
+        current_user.id,
+        not_found="Proyecto no encontrado",
     )
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Proyecto no encontrado",
-        )
-    return project
+    if not_modified:
+        return not_modified
+    return await _get_project_for_user(db, project_id, current_user.id)
 
 
 @router.patch("/{project_id}", response_model=ProjectResponse)
-def update_project(
+async def update_project(
     project_id: int,
     data: ProjectUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Actualiza un proyecto (solo si su área pertenece al usuario)."""
-    project = (
-        db.query(Project)
-        .join(Area)
-        .filter(Project.id == project_id, Area.user_id == current_user.id)
-        .first()
-    )
-    if not project:
+    values = data.model_dump(exclude_none=True)
+    # Un único UPDATE ... RETURNING con la propiedad en la subconsulta sobre areas.user_id
+    # y, si cambia, la del área nueva. Sin fila afectada se mira qué falló: primero el
+    # proyecto y luego el área
+    owned = (Project.id == project_id, _owned_by(current_user.id))
+    area_owned = ()
+    if data.area_id is not None:
+        area_owned = (select(Area.id).where(Area.id == data.area_id, Area.user_id == current_user.id).exists(),)
+    if values:
+        stmt = (
+            update(Project)
+            .where(*owned, *area_owned)
+            .values(**values)
+            .returning(*PROJECT_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        stmt = select(*PROJECT_COLUMNS).where(*owned)
+    project = (await db.execute(stmt)).first()
+    if project is None:
+        if area_owned and await db.scalar(select(Project.id).where(*owned)) is not None:
+            await _ensure_area_belongs_to_user(db, data.area_id, current_user.id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Proyecto no encontrado",
         )
-    if data.name is not None:
-        project.name = data.name
-    if data.icon is not None:
-        project.icon = data.icon
-    if data.description is not None:
-        project.description = data.description
-    if data.area_id is not None:
-        _ensure_area_belongs_to_user(db, data.area_id, current_user.id)
-        project.area_id = data.area_id
-    if data.pinned is not None:
-        project.pinned = data.pinned
-    db.commit()
-    db.refresh(project)
-    return project
+    # Las siguientes acciones, después y en plano
+    next_actions = (
+        await db.execute(
+            select(*NEXT_ACTION_COLUMNS)
+            .where(ProjectNextAction.project_id == project_id)
+            .order_by(ProjectNextAction.id)
+        )
+    ).all()
+    await db.commit()
+    quick_find_index.upsert(current_user.id, QuickFindItem.from_project(project))
+    return json_response(encode_project(project, next_actions))
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_project(
+async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Elimina un proyecto (solo si su área pertenece al usuario)."""
-    project = (
-        db.query(Project)
-        .join(Area)
-        .filter(Project.id == project_id, Area.user_id == current_user.id)
-        .first()
+    # Propiedad en subconsulta; las siguientes acciones caen por ON DELETE CASCADE
+    deleted = await db.scalar(
+        delete(Project)
+        .where(Project.id == project_id, _owned_by(current_user.id))
+        .returning(Project.id)
+        .execution_options(synchronize_session=False)
     )
-    if not project:
+    if deleted is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Proyecto no encontrado",
         )
-    db.delete(project)
-    db.commit()
+    await db.commit()
+    quick_find_index.remove(current_user.id, "project", deleted)
     return None
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.quick_find import prefix_key, quick_find_index
+from app.routers.auth import get_current_user
+from app.schemas import QuickFindResult
+from app.serialization import json_response, row_encoder
+from app.user_cache import CurrentUser
+
+MAX_QUICK_FIND_LIMIT = 50
+
+router = APIRouter(prefix="/quick-find", tags=["quick-find"])
+
+encode_quick_find_result = row_encoder(QuickFindResult)
+
+
+@router.get("", response_model=list[QuickFindResult])
+async def quick_find(
+    response: Response,
+    prefix: str = Query(..., min_length=1, max_length=100, description="Lo tecleado hasta ahora"),
+    limit: int = Query(10, ge=1, le=MAX_QUICK_FIND_LIMIT, description="Máximo de resultados"),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Saltar a un área o proyecto mientras se teclea: áreas y proyectos cuyo nombre tiene una
+    palabra que empieza por `prefix` (sin distinguir mayúsculas ni tildes) o cuyo icono
+    empieza por él. Primero los que empiezan así desde el inicio del nombre, luego por nombre.
+    Se sirve del índice en memoria del usuario; solo la primera petición consulta la BD.
+    """
+    key = prefix_key(prefix)
+    if not key:
+        return json_response([], response)
+    items = await quick_find_index.find(db, current_user.id, key, limit)
+    return json_response([encode_quick_find_result(item) for item in items], response)
@@ -0,0 +1,171 @@
+"""
+Búsqueda de texto completo en áreas, proyectos, siguientes acciones y one-shots.
+
+Cada tabla tiene una columna generada search_vector (configuración 'spanish', sin tildes,
+índice GIN; migrations/0008_search.py). No está en los modelos: la calcula Postgres y
+no debe viajar en las lecturas ni en los RETURNING del ORM.
+"""
+import re
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import (
+    Boolean,
+    Integer,
+    String,
+    and_,
+    cast,
+    func,
+    literal,
+    literal_column,
+    null,
+    or_,
+    select,
+    tuple_,
+    text,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models import Area, OneShotTask, Project, ProjectNextAction
+from app.pagination import MAX_PAGE_SIZE, decode_cursor, paginate
+from app.routers.auth import get_current_user
+from app.schemas import SearchResult
+from app.serialization import json_response, row_encoder
+from app.user_cache import CurrentUser
+
+SearchType = Literal["area", "project", "project_next_action", "one_shot_task"]
+
+MAX_SEARCH_TERMS = 10
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+encode_search_result = row_encoder(SearchResult)
+
+
+def _vector(model):
+    return literal_column(f"{model.__tablename__}.search_vector")
+
+
+def _tsquery(q: str):
+    """
+    Cada palabra como prefijo ('corr' encuentra 'correr') y todas obligatorias. Las palabras
+    se extraen con \\w+, así que el texto del usuario no puede inyectar operadores de tsquery.
+    """
+    terms = re.findall(r"\w+", q)[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    return func.to_tsquery("spanish", func.lifehub_search_text(" & ".join(f"{t}:*" for t in terms)))
+
+
+def _row(*columns):
+    """SELECT con los nombres de SearchResult: la unión toma los de la primera rama, que puede ser cualquiera."""
+    return select(*(column.label(name) for column, name in zip(columns, SearchResult.model_fields)))
+
+
+def _branches(user_id: int, query, types: set[str]) -> list:
+    """Un SELECT por tabla con las mismas columnas (las de SearchResult) para el UNION ALL."""
+    no_int, no_str, no_bool = cast(null(), Integer), cast(null(), String), cast(null(), Boolean)
+    branches = {
+        "area": _row(
+            literal("area"),
+            Area.id,
+            Area.name,
+            Area.description,
+            Area.id,
+            no_int,
+            no_bool,
+            func.ts_rank_cd(_vector(Area), query),
+        ).where(Area.user_id == user_id, _vector(Area).op("@@")(query)),
+        "project": _row(
+            literal("project"),
+            Project.id,
+            Project.name,
+            Project.description,
+            Project.area_id,
+            Project.id,
+            no_bool,
+            func.ts_rank_cd(_vector(Project), query),
+        )
+        .join(Area)
+        .where(Area.user_id == user_id, _vector(Project).op("@@")(query)),
+        "project_next_action": _row(
+            literal("project_next_action"),
+            ProjectNextAction.id,
+            ProjectNextAction.title,
+            no_str,
+            Project.area_id,
+            ProjectNextAction.project_id,
+            ProjectNextAction.done,
+            func.ts_rank_cd(_vector(ProjectNextAction), query),
+        )
+        .join(Project)
+        .join(Area)
+        .where(Area.user_id == user_id, _vector(ProjectNextAction).op("@@")(query)),
+        "one_shot_task": _row(
+            literal("one_shot_task"),
+            OneShotTask.id,
+            OneShotTask.title,
+            no_str,
+            OneShotTask.area_id,
+            no_int,
+            OneShotTask.done,
+            func.ts_rank_cd(_vector(OneShotTask), query),
+        ).where(OneShotTask.user_id == user_id, _vector(OneShotTask).op("@@")(query)),
+    }
+    return [branch for kind, branch in branches.items() if kind in types]
+
+
+def search_statement(
+    user_id: int, q: str, types: set[str] | None = None, cursor: str | None = None, limit: int = 20
+):
+    """SELECT de una página de resultados (limit + 1 filas), o None si `q` no tiene palabras."""
+    query = _tsquery(q)
+    if query is None:
+        return None
+    results = union_all(*_branches(user_id, query, types or set(SearchType.__args__))).subquery()
+    stmt = select(results)
+    if cursor is not None:
+        c_rank, c_type, c_id = decode_cursor(cursor, float, str, int)
+        stmt = stmt.where(
+            or_(
+                results.c.rank < c_rank,
+                and_(results.c.rank == c_rank, tuple_(results.c.type, results.c.id) > tuple_(c_type, c_id)),
+            )
+        )
+    return stmt.order_by(results.c.rank.desc(), results.c.type, results.c.id).limit(limit + 1)
+
+
+async def execute_search(db: AsyncSession, stmt) -> list:
+    """
+    asyncpg usa sentencias preparadas y, tras cinco ejecuciones, Postgres puede pasar a un
+    plan genérico que no conoce el usuario ni las palabras: recorre el GIN de todos los
+    usuarios (x10 más lento a 1M filas). Aquí el plan se calcula siempre con los valores.
+    """
+    await db.execute(text("SET LOCAL plan_cache_mode = force_custom_plan"))
+    return (await db.execute(stmt)).all()
+
+
+@router.get("", response_model=list[SearchResult])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Texto a buscar"),
+    type: list[SearchType] | None = Query(None, description="Limitar a uno o varios tipos"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE, description="Tamaño de página"),
+    cursor: str | None = Query(None, description="Cursor X-Next-Cursor de la página anterior"),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Busca en áreas y proyectos (nombre y descripción) y en siguientes acciones y one-shots
+    (título) del usuario. Sin distinguir mayúsculas ni tildes, con raíces en español
+    ('proyectos' encuentra 'proyecto') y cada palabra como prefijo. Orden por relevancia
+    (el nombre pesa más que la descripción); paginación por cursor sobre (rank, type, id).
+    """
+    stmt = search_statement(current_user.id, q, set(type) if type else None, cursor, limit)
+    if stmt is None:
+        return json_response([], response)
+    rows = await execute_search(db, stmt)
+    page = paginate(rows, limit, response, lambda r: (r.rank, r.type, r.id))
+    return json_response([encode_search_result(row) for row in page], response)
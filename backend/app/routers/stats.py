@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models import DailyCompletion, ProgressStat
+from app.routers.auth import get_current_user
+from app.schemas import StatsResponse
+from app.serialization import json_response
+from app.user_cache import CurrentUser
+
+MAX_STATS_DAYS = 366
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("", response_model=StatsResponse)
+async def get_stats(
+    response: Response,
+    days: int = Query(30, ge=1, le=MAX_STATS_DAYS, description="Días (UTC, incluido hoy) de hechas por día"),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Pendientes / hechas del usuario, por área y por proyecto, y hechas por día. Se leen de
+    progress_stats y daily_completions (mantenidas por triggers), sin agrupar las tareas:
+    el coste depende del nº de áreas y proyectos, no del de tareas.
+    """
+    counts = await db.execute(
+        select(ProgressStat.scope, ProgressStat.scope_id, ProgressStat.pending, ProgressStat.done).where(
+            ProgressStat.user_id == current_user.id,
+            or_(ProgressStat.pending != 0, ProgressStat.done != 0),
+        )
+    )
+    since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    completions = await db.execute(
+        select(DailyCompletion.day, DailyCompletion.completed)
+        .where(
+            DailyCompletion.user_id == current_user.id,
+            DailyCompletion.day >= since,
+            DailyCompletion.completed != 0,
+        )
+        .order_by(DailyCompletion.day)
+    )
+    stats = {"pending": 0, "done": 0, "areas": [], "projects": [], "completions": []}
+    for scope, scope_id, pending, done in counts:
+        if scope == "user":
+            stats.update(pending=pending, done=done)
+        else:
+            stats[f"{scope}s"].append({f"{scope}_id": scope_id, "pending": pending, "done": done})
+    stats["areas"].sort(key=lambda row: row["area_id"])
+    stats["projects"].sort(key=lambda row: row["project_id"])
+    stats["completions"] = [{"day": day, "completed": completed} for day, completed in completions]
+    return json_response(stats, response)
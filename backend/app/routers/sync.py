@@ -0,0 +1,99 @@
+import os
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.models import Area, DeletedRecord, OneShotTask, Project, ProjectNextAction
+from app.pagination import aware_datetime, decode_cursor, encode_cursor
+from app.schemas import SyncResponse
+from app.routers.auth import get_current_user
+from app.serialization import (
+    AREA_COLUMNS,
+    NEXT_ACTION_COLUMNS,
+    ONE_SHOT_TASK_COLUMNS,
+    PROJECT_COLUMNS,
+    encode_area,
+    encode_next_action,
+    encode_one_shot_task,
+    encode_project_summary,
+    json_response,
+)
+from app.user_cache import CurrentUser
+
+# updated_at es el now() de la transacción que escribe: una transacción que empezó antes
+# del cursor puede confirmar después. El cursor devuelto se retrasa este margen, a costa
+# de reenviar algunas filas (el cliente aplica los cambios como upserts idempotentes).
+SYNC_OVERLAP_SECONDS = float(os.getenv("SYNC_OVERLAP_SECONDS", "30"))
+# Tombstones más antiguos se pueden purgar (scripts/prune_deleted_records.py); un cursor
+# anterior a esta ventana recibe una instantánea completa.
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+def sync_queries(user_id: int, since_at: datetime | None):
+    """
+    Consultas de GET /sync (también para scripts/check_query_plans.py): filas de cada tabla
+    cambiadas desde since_at y tombstones; sin since_at, instantánea completa y sin tombstones.
+    """
+    # Solo las columnas de la respuesta (Rows de Core, serializadas con orjson), también en
+    # la instantánea completa, que es la lectura más grande de la API
+    areas = select(*AREA_COLUMNS).where(Area.user_id == user_id)
+    projects = select(*PROJECT_COLUMNS).join(Area).where(Area.user_id == user_id)
+    next_actions = select(*NEXT_ACTION_COLUMNS).join(Project).join(Area).where(Area.user_id == user_id)
+    tasks = select(*ONE_SHOT_TASK_COLUMNS).where(OneShotTask.user_id == user_id)
+    deleted = None
+    if since_at is not None:
+        areas = areas.where(Area.updated_at > since_at)
+        projects = projects.where(Project.updated_at > since_at)
+        next_actions = next_actions.where(ProjectNextAction.updated_at > since_at)
+        tasks = tasks.where(OneShotTask.updated_at > since_at)
+        deleted = (
+            select(DeletedRecord.table_name, DeletedRecord.record_id, DeletedRecord.deleted_at)
+            .where(DeletedRecord.user_id == user_id, DeletedRecord.deleted_at > since_at)
+            .order_by(DeletedRecord.id)
+        )
+    return (
+        areas.order_by(Area.id),
+        projects.order_by(Project.id),
+        next_actions.order_by(ProjectNextAction.id),
+        tasks.order_by(OneShotTask.id),
+        deleted,
+    )
+
+
+@router.get("", response_model=SyncResponse)
+async def sync(
+    since: str | None = Query(None, description="Cursor devuelto por la sincronización anterior"),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Cambios del usuario desde el cursor: áreas, proyectos, siguientes acciones y one-shots
+    creados o modificados, y tombstones de los borrados. Sin cursor (o con uno caducado)
+    devuelve todo con full = true. El cliente aplica primero los upserts y luego los borrados;
+    borrar un área o un proyecto implica borrar localmente sus hijos.
+    """
+    now = await db.scalar(select(func.now()))
+    since_at = decode_cursor(since, aware_datetime)[0] if since is not None else None
+    full = since_at is None or since_at < now - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+
+    areas, projects, next_actions, tasks, deleted_q = sync_queries(current_user.id, None if full else since_at)
+    deleted = (await db.execute(deleted_q)).all() if deleted_q is not None else []
+
+    return json_response(
+        {
+            "full": full,
+            "cursor": encode_cursor([now - timedelta(seconds=SYNC_OVERLAP_SECONDS)]),
+            "areas": [encode_area(r) for r in await db.execute(areas)],
+            "projects": [encode_project_summary(r) for r in await db.execute(projects)],
+            "project_next_actions": [encode_next_action(r) for r in await db.execute(next_actions)],
+            "one_shot_tasks": [encode_one_shot_task(r) for r in await db.execute(tasks)],
+            "deleted": [
+                {"table": d.table_name, "id": d.record_id, "deleted_at": d.deleted_at} for d in deleted
+            ],
+        }
+    )
@@ -1,5 +1,15 @@
-from datetime import datetime
-from pydantic import BaseModel
+from datetime import date, datetime
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field
+
+# Longitudes de las columnas de app/models.py: un valor más largo es un 422 al validar
+# (también fila a fila en POST /import), no un error de la BD al insertar.
+Name = Annotated[str, Field(max_length=255)]
+Description = Annotated[str, Field(max_length=1000)]
+Color = Annotated[str, Field(max_length=7)]
+Icon = Annotated[str, Field(max_length=20)]
+Title = Annotated[str, Field(max_length=500)]
 
 
 class UserCreate(BaseModel):
@@ -28,6 +38,11 @@ class Token(BaseModel):
     token_type: str = "bearer"
 
 
+class StreamToken(BaseModel):
+    stream_token: str
+    expires_in: int
+
+
 class TokenData(BaseModel):
     user_id: int | None = None
 
@@ -35,15 +50,15 @@ class TokenData(BaseModel):
 # --- Area ---
 
 class AreaCreate(BaseModel):
-    name: str
-    description: str | None = None
-    color: str | None = None  # hex #rrggbb
+    name: Name
+    description: Description | None = None
+    color: Color | None = None  # hex #rrggbb
 
 
 class AreaUpdate(BaseModel):
-    name: str | None = None
-    description: str | None = None
-    color: str | None = None
+    name: Name | None = None
+    description: Description | None = None
+    color: Color | None = None
 
 
 class AreaResponse(BaseModel):
@@ -63,26 +78,26 @@ class AreaResponse(BaseModel):
 
 class ProjectCreate(BaseModel):
     area_id: int
-    name: str
-    icon: str | None = None
-    description: str | None = None
+    name: Name
+    icon: Icon | None = None
+    description: Description | None = None
     pinned: bool = False
 
 
 class ProjectUpdate(BaseModel):
-    name: str | None = None
-    icon: str | None = None
-    description: str | None = None
+    name: Name | None = None
+    icon: Icon | None = None
+    description: Description | None = None
     area_id: int | None = None
     pinned: bool | None = None
 
 
 class ProjectNextActionCreate(BaseModel):
-    title: str
+    title: Title
 
 
 class ProjectNextActionUpdate(BaseModel):
-    title: str | None = None
+    title: Title | None = None
     done: bool | None = None
 
 
@@ -98,7 +113,33 @@ class ProjectNextActionResponse(BaseModel):
         from_attributes = True
 
 
-class ProjectResponse(BaseModel):
+class ProjectNextActionBatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: int | None = None  # obligatorio en update / delete
+    title: Title | None = None  # obligatorio en create
+    done: bool | None = None
+
+
+class ProjectNextActionBatchRequest(BaseModel):
+    operations: list[ProjectNextActionBatchOperation] = Field(..., max_length=500)
+
+
+class ProjectNextActionBatchResult(BaseModel):
+    index: int  # posición de la operación en la petición
+    op: str
+    ok: bool
+    id: int | None = None
+    next_action: ProjectNextActionResponse | None = None  # estado final (create / update)
+    detail: str | None = None  # motivo del error si ok = false
+
+
+class ProjectNextActionBatchResponse(BaseModel):
+    results: list[ProjectNextActionBatchResult]
+
+
+class ProjectSummaryResponse(BaseModel):
+    """Proyecto sin sus siguientes acciones (GET /sync las devuelve en su propia lista)."""
+
     id: int
     area_id: int
     icon: str | None
@@ -107,21 +148,24 @@ class ProjectResponse(BaseModel):
     pinned: bool
     created_at: datetime
     updated_at: datetime
-    next_actions: list["ProjectNextActionResponse"] = []
 
     class Config:
         from_attributes = True
 
 
+class ProjectResponse(ProjectSummaryResponse):
+    next_actions: list["ProjectNextActionResponse"] = []
+
+
 # --- OneShotTask ---
 
 class OneShotTaskCreate(BaseModel):
-    title: str
+    title: Title
     area_id: int | None = None  # null = One shot
 
 
 class OneShotTaskUpdate(BaseModel):
-    title: str | None = None
+    title: Title | None = None
     done: bool | None = None
     area_id: int | None = None
 
@@ -137,3 +181,154 @@ class OneShotTaskResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class OneShotTaskBatchOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: int | None = None  # obligatorio en update / delete
+    title: Title | None = None  # obligatorio en create
+    done: bool | None = None
+    area_id: int | None = None
+
+
+class OneShotTaskBatchRequest(BaseModel):
+    operations: list[OneShotTaskBatchOperation] = Field(..., max_length=500)
+
+
+class OneShotTaskBatchResult(BaseModel):
+    index: int  # posición de la operación en la petición
+    op: str
+    ok: bool
+    id: int | None = None
+    task: OneShotTaskResponse | None = None  # estado final (create / update)
+    detail: str | None = None  # motivo del error si ok = false
+
+
+class OneShotTaskBatchResponse(BaseModel):
+    results: list[OneShotTaskBatchResult]
+
+
+# --- Dashboard ---
+
+class DashboardAreaResponse(AreaResponse):
+    projects: list[ProjectResponse] = []
+    one_shot_tasks: list[OneShotTaskResponse] = []
+
+
+class DashboardResponse(BaseModel):
+    areas: list[DashboardAreaResponse]
+    one_shot_tasks: list[OneShotTaskResponse]  # sin área (One shot)
+
+
+# --- Sync ---
+
+class DeletedRecordResponse(BaseModel):
+    table: str  # areas | projects | project_next_actions | one_shot_tasks
+    id: int
+    deleted_at: datetime
+
+
+class SyncResponse(BaseModel):
+    full: bool  # true = instantánea completa: el cliente reemplaza su copia local
+    cursor: str  # pasar en ?since= en la siguiente sincronización
+    areas: list[AreaResponse]
+    projects: list[ProjectSummaryResponse]
+    project_next_actions: list[ProjectNextActionResponse]
+    one_shot_tasks: list[OneShotTaskResponse]
+    deleted: list[DeletedRecordResponse]
+
+
+# --- Import ---
+# Filas de POST /import (mismo formato que GET /export). `id`, `area_id` y `project_id`
+# son los del fichero: se usan para enlazar la jerarquía y se renumeran al insertar.
+
+class ImportAreaRow(AreaCreate):
+    type: Literal["area"]
+    id: int
+    created_at: datetime | None = None
+
+
+class ImportProjectRow(ProjectCreate):
+    type: Literal["project"]
+    id: int
+    created_at: datetime | None = None
+
+
+class ImportNextActionRow(ProjectNextActionCreate):
+    type: Literal["project_next_action"]
+    project_id: int
+    done: bool = False
+    created_at: datetime | None = None
+
+
+class ImportOneShotTaskRow(OneShotTaskCreate):
+    type: Literal["one_shot_task"]
+    done: bool = False
+    created_at: datetime | None = None
+
+
+ImportRow = Annotated[
+    ImportAreaRow | ImportProjectRow | ImportNextActionRow | ImportOneShotTaskRow,
+    Field(discriminator="type"),
+]
+
+
+class ImportResponse(BaseModel):
+    areas: int
+    projects: int
+    project_next_actions: int
+    one_shot_tasks: int
+    rows: int
+    seconds: float
+    rows_per_second: float
+
+
+# --- Search ---
+
+class SearchResult(BaseModel):
+    type: Literal["area", "project", "project_next_action", "one_shot_task"]
+    id: int
+    title: str  # name en áreas y proyectos
+    description: str | None = None  # solo áreas y proyectos
+    area_id: int | None = None
+    project_id: int | None = None
+    done: bool | None = None  # solo siguientes acciones y one-shots
+    rank: float
+
+
+# --- Quick find ---
+
+class QuickFindResult(BaseModel):
+    type: Literal["area", "project"]
+    id: int
+    name: str
+    icon: str | None = None  # solo proyectos
+    area_id: int  # en las áreas, su propio id
+
+
+# --- Stats ---
+
+class ProgressCounts(BaseModel):
+    pending: int = 0
+    done: int = 0
+
+
+class AreaProgress(ProgressCounts):
+    area_id: int
+
+
+class ProjectProgress(ProgressCounts):
+    project_id: int
+
+
+class DayCompletions(BaseModel):
+    day: date
+    completed: int
+
+
+class StatsResponse(ProgressCounts):
+    """Totales del usuario, por área y por proyecto (solo los que tienen tareas) y hechas por día."""
+
+    areas: list[AreaProgress]
+    projects: list[ProjectProgress]
+    completions: list[DayCompletions]
@@ -1,11 +1,32 @@
+import asyncio
 import os
 import bcrypt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 
 SECRET_KEY = os.getenv("SECRET_KEY", "lifehub-secret-key-cambiar-en-produccion")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 días
+# Token de vida corta para abrir /changes/stream: va en la URL (EventSource no
+# permite cabeceras) y acaba en logs de accesos, así que caduca enseguida y no vale como Bearer.
+# No es de un solo uso: hasta que caduca sirve para abrir más streams.
+STREAM_TOKEN_EXPIRE_SECONDS = int(os.getenv("STREAM_TOKEN_EXPIRE_SECONDS", "60"))
+STREAM_TOKEN_SCOPE = "changes-stream"
+
+# Coste de bcrypt (log2 de iteraciones). Los hashes con otro coste se rehashean al hacer login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# bcrypt corre en un pool de hilos propio (libera el GIL), separado del threadpool general,
+# para que una avalancha de logins no deje sin hilos al resto de la API.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "64"))  # operaciones en espera
+
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_hash_in_flight = 0
+
+
+class PasswordHasherBusy(RuntimeError):
+    """La cola de hashing está llena; el cliente debe reintentar más tarde."""
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -16,7 +37,34 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 def get_password_hash(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True si el hash se generó con un coste distinto de BCRYPT_ROUNDS (formato $2b$<coste>$...)."""
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+async def _run_in_hash_executor(fn, *args):
+    global _hash_in_flight
+    if _hash_in_flight >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE:
+        raise PasswordHasherBusy("Demasiadas operaciones de contraseña en curso")
+    _hash_in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+    finally:
+        _hash_in_flight -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_executor(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_hash_executor(get_password_hash, password)
 
 
 def create_access_token(data: dict) -> str:
@@ -26,9 +74,32 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def decode_access_token(token: str) -> dict | None:
+def create_stream_token(user_id: int, session_expires_at: float | None) -> str:
+    """Token corto para /changes/stream; el stream dura lo que el token de sesión que lo pidió."""
+    expire = datetime.utcnow() + timedelta(seconds=STREAM_TOKEN_EXPIRE_SECONDS)
+    to_encode = {"sub": str(user_id), "scope": STREAM_TOKEN_SCOPE, "exp": expire}
+    if session_expires_at is not None:
+        to_encode["session_exp"] = session_expires_at
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def _decode(token: str) -> dict | None:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
+
+
+def decode_access_token(token: str) -> dict | None:
+    """Payload de un token de sesión; None si no es válido o es un token con scope (p. ej. de stream)."""
+    payload = _decode(token)
+    if payload is None or "scope" in payload:
+        return None
+    return payload
+
+
+def decode_stream_token(token: str) -> dict | None:
+    payload = _decode(token)
+    if payload is None or payload.get("scope") != STREAM_TOKEN_SCOPE:
+        return None
+    return payload
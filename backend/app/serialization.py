@@ -0,0 +1,90 @@
+"""
+Serialización rápida de listados: filas ORM (o Row de Core) → dict → JSON con orjson.
+
+Con `response_model=list[XResponse]` FastAPI valida cada fila en un modelo Pydantic
+(from_attributes) y después lo vuelve a serializar; en listados grandes eso domina el
+tiempo de CPU. Los endpoints mantienen `response_model` (el esquema OpenAPI no cambia)
+pero devuelven directamente una FastJSONResponse, que FastAPI envía tal cual.
+Los campos salen de los propios schemas, así que no se desincronizan.
+
+Las lecturas seleccionan solo esas columnas (select(*AREA_COLUMNS)...) y trabajan con
+Rows de Core: sin entidades en el identity map, sin seguimiento de cambios ni relaciones.
+"""
+from collections.abc import Callable, Iterable
+from operator import attrgetter
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.models import Area, OneShotTask, Project, ProjectNextAction
+from app.schemas import (
+    AreaResponse,
+    OneShotTaskResponse,
+    ProjectNextActionResponse,
+    ProjectSummaryResponse,
+)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON con orjson. OPT_UTC_Z: fechas UTC con 'Z', igual que Pydantic."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def columns(model, schema: type[BaseModel]) -> list:
+    """Columnas del modelo que corresponden a los campos del schema, en el mismo orden."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+AREA_COLUMNS = columns(Area, AreaResponse)
+PROJECT_COLUMNS = columns(Project, ProjectSummaryResponse)
+NEXT_ACTION_COLUMNS = columns(ProjectNextAction, ProjectNextActionResponse)
+ONE_SHOT_TASK_COLUMNS = columns(OneShotTask, OneShotTaskResponse)
+
+
+def group_by(rows: Iterable, key: str) -> dict[Any, list]:
+    """Agrupa filas planas por una columna (p. ej. siguientes acciones por project_id)."""
+    groups: dict[Any, list] = {}
+    for row in rows:
+        groups.setdefault(getattr(row, key), []).append(row)
+    return groups
+
+
+def row_encoder(model: type[BaseModel]) -> Callable[[Any], dict]:
+    """Encoder fila → dict con los campos del schema (atributos de la entidad o de la Row)."""
+    fields = tuple(model.model_fields)
+    get = attrgetter(*fields)
+    return lambda row: dict(zip(fields, get(row)))
+
+
+encode_area = row_encoder(AreaResponse)
+encode_one_shot_task = row_encoder(OneShotTaskResponse)
+encode_next_action = row_encoder(ProjectNextActionResponse)
+encode_project_summary = row_encoder(ProjectSummaryResponse)
+
+
+def encode_project(project, next_actions: Iterable | None = None) -> dict:
+    """
+    ProjectResponse: proyecto + siguientes acciones. Con Rows de Core se pasan las
+    acciones de la segunda consulta; con entidades ORM se usa la relación cargada.
+    """
+    data = encode_project_summary(project)
+    data["next_actions"] = [
+        encode_next_action(na) for na in (project.next_actions if next_actions is None else next_actions)
+    ]
+    return data
+
+
+def json_response(content: Any, response: Response | None = None, status_code: int = 200) -> FastJSONResponse:
+    """
+    Respuesta ya serializada. Copia las cabeceras puestas en el `response` inyectado
+    (ETag, X-Next-Cursor), que FastAPI ignora cuando el endpoint devuelve una Response.
+    """
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
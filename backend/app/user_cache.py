@@ -0,0 +1,107 @@
+"""
+Caché en proceso del usuario autenticado (LRU con TTL).
+
+get_current_user consulta la tabla users en cada petición autenticada aunque la fila
+casi nunca cambia. Aquí se guarda un principal ligero (CurrentUser), desligado de
+cualquier sesión, para que los routers lo usen sin ir a la BD.
+Las entradas se invalidan al actualizar o borrar el usuario vía ORM, otra vez tras el
+commit (una petición concurrente pudo volver a cachear la fila antigua entretanto).
+La caché es por proceso: un UPDATE / DELETE de Core o de un script, o un cambio hecho en
+otro worker, no la invalida, así que un usuario borrado o cambiado puede seguir
+autenticado con los datos antiguos hasta USER_CACHE_TTL_SECONDS (60 s por defecto).
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.models import User
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """Usuario autenticado, sin estado ORM (seguro de compartir entre peticiones)."""
+
+    id: int
+    email: str
+    full_name: str | None
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            created_at=user.created_at,
+        )
+
+
+class UserCache:
+    """LRU acotado con caducidad por entrada. Con un lock: los eventos del ORM pueden llegar desde hilos (run_sync)."""
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[int, tuple[float, CurrentUser]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> CurrentUser | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user: CurrentUser) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(USER_CACHE_MAX_SIZE, USER_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _evict_user(mapper, connection, target: User) -> None:
+    user_cache.invalidate(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("evicted_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed_users(session: Session) -> None:
+    for user_id in session.info.pop("evicted_user_ids", ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_evicted_users(session: Session) -> None:
+    session.info.pop("evicted_user_ids", None)
@@ -1,17 +1,9 @@
 """
-Migración única que deja el esquema de la BD al día.
-- Crea las tablas si no existen (users, areas, projects) con todas las columnas.
-- Añade columnas que falten en BDs antiguas (p. ej. areas.color, projects.icon).
-
-Idempotente: se puede ejecutar en cada arranque (docker compose up).
+Esquema base: tablas users, areas, projects y one_shot_tasks con sus índices.
+Añade las columnas que faltan en BDs anteriores (areas.color, projects.icon, projects.pinned).
 """
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-
 from sqlalchemy import text
-from app.database import engine
+from sqlalchemy.engine import Connection
 
 # 1) Tablas completas (si no existen)
 SQL_TABLES = [
@@ -74,17 +66,10 @@ SQL_ALTERS = [
 ]
 
 
-def run():
-    with engine.connect() as conn:
-        for sql in SQL_TABLES:
-            conn.execute(text(sql))
-        for sql in SQL_INDEXES:
-            conn.execute(text(sql))
-        for sql in SQL_ALTERS:
-            conn.execute(text(sql))
-        conn.commit()
-    print("Migraciones aplicadas (esquema al día).")
-
-
-if __name__ == "__main__":
-    run()
+def upgrade(conn: Connection) -> None:
+    for sql in SQL_TABLES:
+        conn.execute(text(sql))
+    for sql in SQL_INDEXES:
+        conn.execute(text(sql))
+    for sql in SQL_ALTERS:
+        conn.execute(text(sql))
@@ -0,0 +1,29 @@
+"""
+Corrige el tipo de la columna one_shot_tasks.done a BOOLEAN si está como integer
+(BDs antiguas); si ya es boolean no hace nada.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# Convertir integer (0/1) a boolean; el DEFAULT 0 no se puede convertir, se quita antes
+ALTER_DONE_BOOLEAN = """
+ALTER TABLE one_shot_tasks
+ALTER COLUMN done DROP DEFAULT,
+ALTER COLUMN done TYPE boolean USING (COALESCE(done, 0)::int != 0);
+"""
+
+# Asegurar default por si acaso
+SET_DEFAULT = """
+ALTER TABLE one_shot_tasks ALTER COLUMN done SET DEFAULT false;
+"""
+
+DONE_TYPE = """
+SELECT data_type FROM information_schema.columns
+WHERE table_schema = current_schema() AND table_name = 'one_shot_tasks' AND column_name = 'done';
+"""
+
+
+def upgrade(conn: Connection) -> None:
+    if conn.scalar(text(DONE_TYPE)) in ("smallint", "integer", "bigint"):
+        conn.execute(text(ALTER_DONE_BOOLEAN))
+        conn.execute(text(SET_DEFAULT))
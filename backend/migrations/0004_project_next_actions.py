@@ -1,14 +1,9 @@
 """
 Crea la tabla project_next_actions, migra datos desde projects.next_action
-y elimina la columna next_action de projects. Idempotente.
+y elimina la columna next_action de projects.
 """
-import sys
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-
-from sqlalchemy import text, inspect
-from app.database import engine
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
 
 CREATE_TABLE = """
 CREATE TABLE IF NOT EXISTS project_next_actions (
@@ -30,20 +25,18 @@ WHERE next_action IS NOT NULL AND TRIM(next_action) <> '';
 """
 DROP_COLUMN = "ALTER TABLE projects DROP COLUMN IF EXISTS next_action;"
 
+HAS_NEXT_ACTION = """
+SELECT EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = 'projects' AND column_name = 'next_action'
+);
+"""
+
 
-if __name__ == "__main__":
-    with engine.connect() as conn:
-        conn.execute(text(CREATE_TABLE))
-        conn.execute(text(INDEX))
-        conn.commit()
+def upgrade(conn: Connection) -> None:
+    conn.execute(text(CREATE_TABLE))
+    conn.execute(text(INDEX))
     # Solo migrar y eliminar columna si next_action aún existe (evita duplicados)
-    insp = inspect(engine)
-    cols = [c["name"] for c in insp.get_columns("projects")]
-    if "next_action" in cols:
-        with engine.connect() as conn:
-            conn.execute(text(MIGRATE_DATA))
-            conn.execute(text(DROP_COLUMN))
-            conn.commit()
-        print("Tabla project_next_actions creada, datos migrados, columna projects.next_action eliminada.")
-    else:
-        print("Tabla project_next_actions ya existente; projects.next_action ya eliminada.")
+    if conn.scalar(text(HAS_NEXT_ACTION)):
+        conn.execute(text(MIGRATE_DATA))
+        conn.execute(text(DROP_COLUMN))
@@ -0,0 +1,30 @@
+"""
+Añade índices compuestos (y uno parcial) ajustados a las consultas reales de los routers:
+filtro por propietario + columnas del ORDER BY, para evitar ordenaciones explícitas.
+Comprobar los planes con scripts/check_query_plans.py.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+SQL_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_areas_user_id_name ON areas (user_id, name);",
+    "CREATE INDEX IF NOT EXISTS ix_projects_area_id_name_id ON projects (area_id, name, id);",
+    "CREATE INDEX IF NOT EXISTS ix_project_next_actions_project_id_id ON project_next_actions (project_id, id);",
+    """
+    CREATE INDEX IF NOT EXISTS ix_one_shot_tasks_user_done_created
+    ON one_shot_tasks (user_id, done, created_at DESC, id DESC);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_one_shot_tasks_user_pending
+    ON one_shot_tasks (user_id, created_at DESC, id DESC) WHERE done = false;
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_one_shot_tasks_area_done_created
+    ON one_shot_tasks (area_id, done, created_at DESC, id DESC);
+    """,
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for sql in SQL_INDEXES:
+        conn.execute(text(sql))
@@ -0,0 +1,87 @@
+"""
+Soporte de sincronización incremental (GET /sync):
+- Trigger set_updated_at: updated_at = now() en cualquier UPDATE, también los que no pasan por el ORM.
+- Tabla deleted_records (tombstones) rellenada por un trigger AFTER DELETE en areas, projects,
+  project_next_actions y one_shot_tasks. Si el padre ya no existe (borrado en cascada desde la BD)
+  no se registra el hijo: el tombstone del padre lo cubre.
+- Índices sobre updated_at / deleted_at para que el coste dependa del tamaño del cambio.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+TABLES = ("areas", "projects", "project_next_actions", "one_shot_tasks")
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS deleted_records (
+    id BIGSERIAL PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    table_name VARCHAR(50) NOT NULL,
+    record_id INTEGER NOT NULL,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+"""
+
+SET_UPDATED_AT = """
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+RECORD_DELETION = """
+CREATE OR REPLACE FUNCTION record_deletion() RETURNS trigger AS $$
+DECLARE
+    owner_id INTEGER;
+BEGIN
+    IF TG_TABLE_NAME IN ('areas', 'one_shot_tasks') THEN
+        owner_id := OLD.user_id;
+    ELSIF TG_TABLE_NAME = 'projects' THEN
+        SELECT user_id INTO owner_id FROM areas WHERE id = OLD.area_id;
+    ELSIF TG_TABLE_NAME = 'project_next_actions' THEN
+        SELECT a.user_id INTO owner_id
+        FROM projects p JOIN areas a ON a.id = p.area_id
+        WHERE p.id = OLD.project_id;
+    END IF;
+    IF owner_id IS NOT NULL THEN
+        INSERT INTO deleted_records (user_id, table_name, record_id) VALUES (owner_id, TG_TABLE_NAME, OLD.id);
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+SQL_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_areas_user_id_updated_at ON areas (user_id, updated_at);",
+    "CREATE INDEX IF NOT EXISTS ix_projects_updated_at ON projects (updated_at);",
+    "CREATE INDEX IF NOT EXISTS ix_project_next_actions_updated_at ON project_next_actions (updated_at);",
+    "CREATE INDEX IF NOT EXISTS ix_one_shot_tasks_user_id_updated_at ON one_shot_tasks (user_id, updated_at);",
+    "CREATE INDEX IF NOT EXISTS ix_deleted_records_user_id_deleted_at ON deleted_records (user_id, deleted_at);",
+]
+
+
+def triggers(table: str) -> list[str]:
+    return [
+        f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON {table};",
+        f"""
+        CREATE TRIGGER trg_{table}_updated_at BEFORE UPDATE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+        """,
+        f"DROP TRIGGER IF EXISTS trg_{table}_deleted ON {table};",
+        f"""
+        CREATE TRIGGER trg_{table}_deleted AFTER DELETE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION record_deletion();
+        """,
+    ]
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(text(CREATE_TABLE))
+    conn.execute(text(SET_UPDATED_AT))
+    conn.execute(text(RECORD_DELETION))
+    for table in TABLES:
+        for sql in triggers(table):
+            conn.execute(text(sql))
+    for sql in SQL_INDEXES:
+        conn.execute(text(sql))
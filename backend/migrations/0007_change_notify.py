@@ -0,0 +1,76 @@
+"""
+Feed de cambios en tiempo real: trigger AFTER INSERT/UPDATE/DELETE en areas, projects,
+project_next_actions y one_shot_tasks que hace pg_notify('lifehub_changes', json) con
+el usuario dueño, la tabla, la operación, el id y la fila nueva (sin las columnas que
+no están en la API: search_vector, completed_at).
+NOTIFY se entrega al confirmar la transacción, a todos los procesos que escuchan.
+Si el JSON supera el límite de NOTIFY (8000 bytes) se envía sin la fila. Con
+`SET LOCAL lifehub.skip_notify = 'on'` la transacción no notifica fila a fila.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+TABLES = ("areas", "projects", "project_next_actions", "one_shot_tasks")
+
+NOTIFY_CHANGE = """
+CREATE OR REPLACE FUNCTION notify_change() RETURNS trigger AS $$
+DECLARE
+    rec RECORD;
+    owner_id INTEGER;
+    payload TEXT;
+BEGIN
+    -- Cargas masivas (POST /import) lo desactivan con SET LOCAL y mandan un único resync.
+    IF current_setting('lifehub.skip_notify', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        rec := OLD;
+    ELSE
+        rec := NEW;
+    END IF;
+    IF TG_TABLE_NAME IN ('areas', 'one_shot_tasks') THEN
+        owner_id := rec.user_id;
+    ELSIF TG_TABLE_NAME = 'projects' THEN
+        SELECT user_id INTO owner_id FROM areas WHERE id = rec.area_id;
+    ELSIF TG_TABLE_NAME = 'project_next_actions' THEN
+        SELECT a.user_id INTO owner_id
+        FROM projects p JOIN areas a ON a.id = p.area_id
+        WHERE p.id = rec.project_id;
+    END IF;
+    IF owner_id IS NULL THEN
+        RETURN NULL;  -- hijo borrado en cascada: el evento del padre lo cubre
+    END IF;
+    payload := json_build_object(
+        'user_id', owner_id,
+        'table', TG_TABLE_NAME,
+        'op', lower(TG_OP),
+        'id', rec.id,
+        'data', CASE WHEN TG_OP = 'DELETE' THEN NULL ELSE to_jsonb(NEW) - 'search_vector' - 'completed_at' END
+    )::text;
+    IF octet_length(payload) > 7900 THEN
+        payload := json_build_object(
+            'user_id', owner_id, 'table', TG_TABLE_NAME, 'op', lower(TG_OP), 'id', rec.id, 'data', NULL
+        )::text;
+    END IF;
+    PERFORM pg_notify('lifehub_changes', payload);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def triggers(table: str) -> list[str]:
+    return [
+        f"DROP TRIGGER IF EXISTS trg_{table}_notify ON {table};",
+        f"""
+        CREATE TRIGGER trg_{table}_notify AFTER INSERT OR UPDATE OR DELETE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION notify_change();
+        """,
+    ]
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(text(NOTIFY_CHANGE))
+    for table in TABLES:
+        for sql in triggers(table):
+            conn.execute(text(sql))
@@ -0,0 +1,50 @@
+"""
+Búsqueda de texto completo (GET /search):
+- Función lifehub_search_text(text): quita tildes con translate() (IMMUTABLE, a diferencia
+  de la extensión unaccent, y sin depender de que esté instalada).
+- Columna generada search_vector (tsvector, configuración 'spanish') en areas y projects
+  (nombre con peso A, descripción con peso B), project_next_actions y one_shot_tasks (título).
+- Índice GIN sobre cada search_vector.
+Añadir la columna reescribe la tabla una vez.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+SEARCH_TEXT = """
+CREATE OR REPLACE FUNCTION lifehub_search_text(value text) RETURNS text AS $$
+    SELECT translate(
+        coalesce(value, ''),
+        'áéíóúüñàèìòùâêîôûäëïöçÁÉÍÓÚÜÑÀÈÌÒÙÂÊÎÔÛÄËÏÖÇ',
+        'aeiouunaeiouaeiouaeiocAEIOUUNAEIOUAEIOUAEIOC'
+    )
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+"""
+
+
+def weighted(column: str, weight: str) -> str:
+    return f"setweight(to_tsvector('spanish', lifehub_search_text({column})), '{weight}')"
+
+
+VECTORS = {
+    "areas": f"{weighted('name', 'A')} || {weighted('description', 'B')}",
+    "projects": f"{weighted('name', 'A')} || {weighted('description', 'B')}",
+    "project_next_actions": weighted("title", "A"),
+    "one_shot_tasks": weighted("title", "A"),
+}
+
+
+def statements(table: str, vector: str) -> list[str]:
+    return [
+        f"""
+        ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS ({vector}) STORED
+        """,
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)",
+    ]
+
+
+def upgrade(conn: Connection) -> None:
+    conn.execute(text(SEARCH_TEXT))
+    for table, vector in VECTORS.items():
+        for sql in statements(table, vector):
+            conn.execute(text(sql))
@@ -0,0 +1,259 @@
+"""
+Estadísticas de progreso (GET /stats) mantenidas por triggers, en la misma transacción
+que cada escritura:
+- Tablas progress_stats (pendientes / hechas por usuario, área y proyecto) y
+  daily_completions (hechas por día de compleción, UTC).
+- Columna completed_at en project_next_actions y one_shot_tasks (no está en los modelos):
+  trigger BEFORE que la pone al marcar done y la quita al desmarcar. Al añadirla, las ya
+  hechas toman su updated_at.
+- Triggers por sentencia (tablas de transición) en project_next_actions y one_shot_tasks:
+  un INSERT ... SELECT masivo (POST /import) actualiza los contadores una vez, no por fila.
+- Proyectos: al borrar uno se restan sus contadores antes de que la cascada borre sus
+  acciones (los triggers de las acciones ya no encuentran el proyecto y no hacen nada);
+  al moverlo de área, sus contadores pasan de un área a otra. Áreas: al borrar se quita
+  su fila. Usuarios: ON DELETE CASCADE.
+El recálculo inicial de los contadores lo hace 0012_progress_stats_backfill.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+ITEM_TABLES = ("project_next_actions", "one_shot_tasks")
+
+CREATE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS progress_stats (
+        scope VARCHAR(10) NOT NULL,
+        scope_id INTEGER NOT NULL,
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        pending INTEGER NOT NULL DEFAULT 0,
+        done INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (scope, scope_id)
+    );
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_progress_stats_user_id ON progress_stats (user_id);",
+    """
+    CREATE TABLE IF NOT EXISTS daily_completions (
+        user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        day DATE NOT NULL,
+        completed INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, day)
+    );
+    """,
+]
+
+# Solo se llama cuando hace falta (WHEN en los triggers): insertar hecha o cambiar done.
+SET_COMPLETED_AT = """
+CREATE OR REPLACE FUNCTION set_completed_at() RETURNS trigger AS $$
+BEGIN
+    IF NOT NEW.done THEN
+        NEW.completed_at := NULL;
+    ELSIF TG_OP = 'INSERT' THEN
+        -- Importadas ya hechas: cuentan el día en que se crearon, no el de la importación
+        NEW.completed_at := coalesce(NEW.completed_at, NEW.created_at, now());
+    ELSE
+        NEW.completed_at := now();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Una fila por tarea cambiada: usuario, área y proyecto a los que cuenta, con signo.
+# Si el padre ya no existe (borrado en cascada) la fila no sale: lo cubre el trigger del padre.
+ITEM_DELTAS = {
+    "project_next_actions": """
+        SELECT a.user_id, a.id AS area_id, p.id AS project_id, {sign} AS sign, r.done, r.completed_at
+        FROM {rows} r
+        JOIN projects p ON p.id = r.project_id
+        JOIN areas a ON a.id = p.area_id
+    """,
+    "one_shot_tasks": """
+        SELECT r.user_id, a.id AS area_id, NULL::integer AS project_id, {sign} AS sign, r.done, r.completed_at
+        FROM {rows} r
+        JOIN users u ON u.id = r.user_id
+        LEFT JOIN areas a ON a.id = r.area_id
+    """,
+}
+
+APPLY_DELTAS = """
+    WITH deltas AS ({deltas}),
+    scoped AS (
+        SELECT 'user' AS scope, user_id AS scope_id, user_id,
+               sum(sign * (NOT done)::int) AS pending, sum(sign * done::int) AS done
+        FROM deltas GROUP BY user_id
+        UNION ALL
+        SELECT 'area', area_id, user_id, sum(sign * (NOT done)::int), sum(sign * done::int)
+        FROM deltas WHERE area_id IS NOT NULL GROUP BY area_id, user_id
+        UNION ALL
+        SELECT 'project', project_id, user_id, sum(sign * (NOT done)::int), sum(sign * done::int)
+        FROM deltas WHERE project_id IS NOT NULL GROUP BY project_id, user_id
+    ),
+    progress AS (
+        INSERT INTO progress_stats AS s (scope, scope_id, user_id, pending, done)
+        SELECT * FROM scoped WHERE pending <> 0 OR done <> 0
+        ON CONFLICT (scope, scope_id)
+        DO UPDATE SET pending = s.pending + EXCLUDED.pending, done = s.done + EXCLUDED.done
+    )
+    INSERT INTO daily_completions AS c (user_id, day, completed)
+    SELECT user_id, (completed_at AT TIME ZONE 'UTC')::date, sum(sign)
+    FROM deltas WHERE done GROUP BY 1, 2 HAVING sum(sign) <> 0
+    ON CONFLICT (user_id, day) DO UPDATE SET completed = c.completed + EXCLUDED.completed
+"""
+
+
+def item_stats_function(table: str) -> str:
+    def apply(*sources: tuple[str, int]) -> str:
+        deltas = " UNION ALL ".join(ITEM_DELTAS[table].format(rows=rows, sign=sign) for rows, sign in sources)
+        return APPLY_DELTAS.format(deltas=deltas)
+
+    return f"""
+    CREATE OR REPLACE FUNCTION progress_stats_{table}() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            {apply(("new_rows", 1))};
+        ELSIF TG_OP = 'UPDATE' THEN
+            {apply(("new_rows", 1), ("old_rows", -1))};
+        ELSE
+            {apply(("old_rows", -1))};
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+
+PROJECT_DELETED = """
+CREATE OR REPLACE FUNCTION progress_stats_project_deleted() RETURNS trigger AS $$
+DECLARE
+    stats RECORD;
+BEGIN
+    -- BEFORE DELETE: las acciones siguen ahí para restar sus días de compleción
+    DELETE FROM progress_stats WHERE scope = 'project' AND scope_id = OLD.id
+    RETURNING user_id, pending, done INTO stats;
+    IF FOUND THEN
+        UPDATE progress_stats SET pending = pending - stats.pending, done = done - stats.done
+        WHERE (scope = 'area' AND scope_id = OLD.area_id) OR (scope = 'user' AND scope_id = stats.user_id);
+        UPDATE daily_completions c SET completed = c.completed - d.completed
+        FROM (
+            SELECT (completed_at AT TIME ZONE 'UTC')::date AS day, count(*) AS completed
+            FROM project_next_actions WHERE project_id = OLD.id AND done GROUP BY 1
+        ) d
+        WHERE c.user_id = stats.user_id AND c.day = d.day;
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+PROJECT_MOVED = """
+CREATE OR REPLACE FUNCTION progress_stats_project_moved() RETURNS trigger AS $$
+BEGIN
+    UPDATE progress_stats a SET pending = a.pending - s.pending, done = a.done - s.done
+    FROM progress_stats s
+    WHERE s.scope = 'project' AND s.scope_id = NEW.id AND a.scope = 'area' AND a.scope_id = OLD.area_id;
+    INSERT INTO progress_stats AS a (scope, scope_id, user_id, pending, done)
+    SELECT 'area', NEW.area_id, s.user_id, s.pending, s.done
+    FROM progress_stats s WHERE s.scope = 'project' AND s.scope_id = NEW.id
+    ON CONFLICT (scope, scope_id) DO UPDATE SET pending = a.pending + EXCLUDED.pending, done = a.done + EXCLUDED.done;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+AREA_DELETED = """
+CREATE OR REPLACE FUNCTION progress_stats_area_deleted() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM progress_stats WHERE scope = 'area' AND scope_id = OLD.id;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def item_triggers(table: str) -> list[str]:
+    return [
+        f"DROP TRIGGER IF EXISTS trg_{table}_completed_insert ON {table};",
+        f"""
+        CREATE TRIGGER trg_{table}_completed_insert BEFORE INSERT ON {table}
+        FOR EACH ROW WHEN (NEW.done) EXECUTE FUNCTION set_completed_at();
+        """,
+        f"DROP TRIGGER IF EXISTS trg_{table}_completed_update ON {table};",
+        f"""
+        CREATE TRIGGER trg_{table}_completed_update BEFORE UPDATE OF done ON {table}
+        FOR EACH ROW WHEN (OLD.done IS DISTINCT FROM NEW.done) EXECUTE FUNCTION set_completed_at();
+        """,
+        f"DROP TRIGGER IF EXISTS trg_{table}_stats_insert ON {table};",
+        f"""
+        CREATE TRIGGER trg_{table}_stats_insert AFTER INSERT ON {table}
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION progress_stats_{table}();
+        """,
+        f"DROP TRIGGER IF EXISTS trg_{table}_stats_update ON {table};",
+        f"""
+        CREATE TRIGGER trg_{table}_stats_update AFTER UPDATE ON {table}
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION progress_stats_{table}();
+        """,
+        f"DROP TRIGGER IF EXISTS trg_{table}_stats_delete ON {table};",
+        f"""
+        CREATE TRIGGER trg_{table}_stats_delete AFTER DELETE ON {table}
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION progress_stats_{table}();
+        """,
+    ]
+
+
+PARENT_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS trg_projects_stats_delete ON projects;",
+    """
+    CREATE TRIGGER trg_projects_stats_delete BEFORE DELETE ON projects
+    FOR EACH ROW EXECUTE FUNCTION progress_stats_project_deleted();
+    """,
+    "DROP TRIGGER IF EXISTS trg_projects_stats_move ON projects;",
+    """
+    CREATE TRIGGER trg_projects_stats_move AFTER UPDATE OF area_id ON projects
+    FOR EACH ROW WHEN (OLD.area_id IS DISTINCT FROM NEW.area_id)
+    EXECUTE FUNCTION progress_stats_project_moved();
+    """,
+    "DROP TRIGGER IF EXISTS trg_areas_stats_delete ON areas;",
+    """
+    CREATE TRIGGER trg_areas_stats_delete BEFORE DELETE ON areas
+    FOR EACH ROW EXECUTE FUNCTION progress_stats_area_deleted();
+    """,
+]
+
+# Solo en la tabla del esquema actual: otro esquema de la misma BD puede tener el mismo trigger
+INSTALLED = """
+    SELECT EXISTS (
+        SELECT 1 FROM pg_trigger
+        WHERE tgrelid = 'one_shot_tasks'::regclass AND tgname = 'trg_one_shot_tasks_stats_insert'
+    )
+"""
+
+
+def backfill_completed_at(table: str) -> list[str]:
+    """Sin triggers de usuario: ni updated_at ni notificaciones por cada fila ya hecha."""
+    return [
+        f"ALTER TABLE {table} DISABLE TRIGGER USER;",
+        f"UPDATE {table} SET completed_at = updated_at WHERE done AND completed_at IS NULL;",
+        f"ALTER TABLE {table} ENABLE TRIGGER USER;",
+    ]
+
+
+def upgrade(conn: Connection) -> None:
+    installed = conn.scalar(text(INSTALLED))
+    for sql in CREATE_TABLES:
+        conn.execute(text(sql))
+    for table in ITEM_TABLES:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS completed_at TIMESTAMPTZ;"))
+    if not installed:
+        for table in ITEM_TABLES:
+            for sql in backfill_completed_at(table):
+                conn.execute(text(sql))
+    conn.execute(text(SET_COMPLETED_AT))
+    for table in ITEM_TABLES:
+        conn.execute(text(item_stats_function(table)))
+        for sql in item_triggers(table):
+            conn.execute(text(sql))
+    for sql in (PROJECT_DELETED, PROJECT_MOVED, AREA_DELETED, *PARENT_TRIGGERS):
+        conn.execute(text(sql))
@@ -0,0 +1,23 @@
+"""
+Índices de GET /sync por padre: projects (area_id, updated_at) y project_next_actions
+(project_id, updated_at), en lugar de los de solo updated_at de 0006. Con estos, el delta
+de un usuario recorre sus áreas / proyectos y de cada uno solo las filas cambiadas; con los
+anteriores leía los cambios de todos los usuarios desde el cursor y filtraba después.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+SQL = [
+    "CREATE INDEX IF NOT EXISTS ix_projects_area_id_updated_at ON projects (area_id, updated_at);",
+    """
+    CREATE INDEX IF NOT EXISTS ix_project_next_actions_project_id_updated_at
+    ON project_next_actions (project_id, updated_at);
+    """,
+    "DROP INDEX IF EXISTS ix_projects_updated_at;",
+    "DROP INDEX IF EXISTS ix_project_next_actions_updated_at;",
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for sql in SQL:
+        conn.execute(text(sql))
@@ -0,0 +1,145 @@
+"""
+Contadores de GET /stats (0009_progress_stats) actualizados siempre en el mismo orden,
+para que dos transacciones que tocan los mismos contadores no se bloqueen en cruz
+(deadlock): primero progress_stats por (scope, scope_id) y después daily_completions por
+(user_id, day).
+- Triggers de las tareas: cada tabla con su sentencia y ORDER BY (antes un solo
+  INSERT ... ON CONFLICT por tabla, en el orden en que salían los grupos).
+- Borrar o mover un proyecto: bloquea antes sus filas (FOR UPDATE, en ese orden) y
+  después las modifica.
+Solo cambian las funciones; los triggers de la 0009 siguen llamándolas por su nombre.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+ITEM_TABLES = ("project_next_actions", "one_shot_tasks")
+
+# Igual que en la 0009: una fila por tarea cambiada, con signo.
+ITEM_DELTAS = {
+    "project_next_actions": """
+        SELECT a.user_id, a.id AS area_id, p.id AS project_id, {sign} AS sign, r.done, r.completed_at
+        FROM {rows} r
+        JOIN projects p ON p.id = r.project_id
+        JOIN areas a ON a.id = p.area_id
+    """,
+    "one_shot_tasks": """
+        SELECT r.user_id, a.id AS area_id, NULL::integer AS project_id, {sign} AS sign, r.done, r.completed_at
+        FROM {rows} r
+        JOIN users u ON u.id = r.user_id
+        LEFT JOIN areas a ON a.id = r.area_id
+    """,
+}
+
+APPLY_PROGRESS = """
+    WITH deltas AS ({deltas}),
+    scoped AS (
+        SELECT 'user' AS scope, user_id AS scope_id, user_id,
+               sum(sign * (NOT done)::int) AS pending, sum(sign * done::int) AS done
+        FROM deltas GROUP BY user_id
+        UNION ALL
+        SELECT 'area', area_id, user_id, sum(sign * (NOT done)::int), sum(sign * done::int)
+        FROM deltas WHERE area_id IS NOT NULL GROUP BY area_id, user_id
+        UNION ALL
+        SELECT 'project', project_id, user_id, sum(sign * (NOT done)::int), sum(sign * done::int)
+        FROM deltas WHERE project_id IS NOT NULL GROUP BY project_id, user_id
+    )
+    INSERT INTO progress_stats AS s (scope, scope_id, user_id, pending, done)
+    SELECT * FROM scoped WHERE pending <> 0 OR done <> 0
+    ORDER BY scope, scope_id
+    ON CONFLICT (scope, scope_id)
+    DO UPDATE SET pending = s.pending + EXCLUDED.pending, done = s.done + EXCLUDED.done
+"""
+
+# Solo las tareas hechas: las pendientes no tocan daily_completions
+APPLY_COMPLETIONS = """
+    WITH deltas AS ({deltas})
+    INSERT INTO daily_completions AS c (user_id, day, completed)
+    SELECT user_id, (completed_at AT TIME ZONE 'UTC')::date, sum(sign)
+    FROM deltas WHERE done GROUP BY 1, 2 HAVING sum(sign) <> 0
+    ORDER BY 1, 2
+    ON CONFLICT (user_id, day) DO UPDATE SET completed = c.completed + EXCLUDED.completed
+"""
+
+
+def item_stats_function(table: str) -> str:
+    def apply(*sources: tuple[str, int]) -> str:
+        deltas = " UNION ALL ".join(ITEM_DELTAS[table].format(rows=rows, sign=sign) for rows, sign in sources)
+        return f"{APPLY_PROGRESS.format(deltas=deltas)}; {APPLY_COMPLETIONS.format(deltas=deltas)}"
+
+    return f"""
+    CREATE OR REPLACE FUNCTION progress_stats_{table}() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            {apply(("new_rows", 1))};
+        ELSIF TG_OP = 'UPDATE' THEN
+            {apply(("new_rows", 1), ("old_rows", -1))};
+        ELSE
+            {apply(("old_rows", -1))};
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+
+PROJECT_DELETED = """
+CREATE OR REPLACE FUNCTION progress_stats_project_deleted() RETURNS trigger AS $$
+DECLARE
+    stats RECORD;
+BEGIN
+    PERFORM 1 FROM progress_stats
+    WHERE (scope = 'area' AND scope_id = OLD.area_id)
+       OR (scope = 'project' AND scope_id = OLD.id)
+       OR (scope = 'user' AND scope_id = (
+            SELECT user_id FROM progress_stats WHERE scope = 'project' AND scope_id = OLD.id))
+    ORDER BY scope, scope_id
+    FOR UPDATE;
+    -- BEFORE DELETE: las acciones siguen ahí para restar sus días de compleción
+    DELETE FROM progress_stats WHERE scope = 'project' AND scope_id = OLD.id
+    RETURNING user_id, pending, done INTO stats;
+    IF FOUND THEN
+        UPDATE progress_stats SET pending = pending - stats.pending, done = done - stats.done
+        WHERE (scope = 'area' AND scope_id = OLD.area_id) OR (scope = 'user' AND scope_id = stats.user_id);
+        PERFORM 1 FROM daily_completions
+        WHERE user_id = stats.user_id AND day IN (
+            SELECT (completed_at AT TIME ZONE 'UTC')::date
+            FROM project_next_actions WHERE project_id = OLD.id AND done)
+        ORDER BY day
+        FOR UPDATE;
+        UPDATE daily_completions c SET completed = c.completed - d.completed
+        FROM (
+            SELECT (completed_at AT TIME ZONE 'UTC')::date AS day, count(*) AS completed
+            FROM project_next_actions WHERE project_id = OLD.id AND done GROUP BY 1
+        ) d
+        WHERE c.user_id = stats.user_id AND c.day = d.day;
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+PROJECT_MOVED = """
+CREATE OR REPLACE FUNCTION progress_stats_project_moved() RETURNS trigger AS $$
+BEGIN
+    PERFORM 1 FROM progress_stats
+    WHERE (scope = 'area' AND scope_id IN (OLD.area_id, NEW.area_id)) OR (scope = 'project' AND scope_id = NEW.id)
+    ORDER BY scope, scope_id
+    FOR UPDATE;
+    UPDATE progress_stats a SET pending = a.pending - s.pending, done = a.done - s.done
+    FROM progress_stats s
+    WHERE s.scope = 'project' AND s.scope_id = NEW.id AND a.scope = 'area' AND a.scope_id = OLD.area_id;
+    INSERT INTO progress_stats AS a (scope, scope_id, user_id, pending, done)
+    SELECT 'area', NEW.area_id, s.user_id, s.pending, s.done
+    FROM progress_stats s WHERE s.scope = 'project' AND s.scope_id = NEW.id
+    ON CONFLICT (scope, scope_id) DO UPDATE SET pending = a.pending + EXCLUDED.pending, done = a.done + EXCLUDED.done;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade(conn: Connection) -> None:
+    for table in ITEM_TABLES:
+        conn.execute(text(item_stats_function(table)))
+    conn.execute(text(PROJECT_DELETED))
+    conn.execute(text(PROJECT_MOVED))
@@ -0,0 +1,67 @@
+"""
+Recalcula una vez los contadores de GET /stats (0009_progress_stats) desde las tablas.
+
+0009 instala los triggers pero no recalcula, y en versiones anteriores buscaba su trigger
+por nombre en toda la BD: en un esquema nuevo de una BD donde otro esquema ya lo tenía se
+saltaba el relleno de completed_at. Aquí se hacen ambos sin condición (en una BD sana no
+cambia nada).
+
+El SQL va aquí y no se importa de app/progress_stats.py: la migración debe hacer siempre
+lo mismo aunque ese módulo cambie.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+ITEM_TABLES = ("project_next_actions", "one_shot_tasks")
+
+# Tareas hechas antes de 0009 sin hora de compleción: toman su updated_at (sin triggers,
+# como en 0009; los contadores se recalculan justo después)
+COMPLETED_AT = [
+    sql
+    for table in ITEM_TABLES
+    for sql in (
+        f"ALTER TABLE {table} DISABLE TRIGGER USER",
+        f"UPDATE {table} SET completed_at = updated_at WHERE done AND completed_at IS NULL",
+        f"ALTER TABLE {table} ENABLE TRIGGER USER",
+    )
+]
+
+# Siguientes acciones (con el área y el usuario de su proyecto) y one-shots
+ITEMS = """
+    SELECT a.user_id, a.id AS area_id, p.id AS project_id, n.done, n.completed_at
+    FROM project_next_actions n
+    JOIN projects p ON p.id = n.project_id
+    JOIN areas a ON a.id = p.area_id
+    UNION ALL
+    SELECT user_id, area_id, NULL, done, completed_at FROM one_shot_tasks
+"""
+
+# Bloquea las escrituras de los triggers mientras se recalcula
+REBUILD = [
+    "LOCK TABLE progress_stats, daily_completions IN EXCLUSIVE MODE",
+    "DELETE FROM progress_stats",
+    f"""
+    INSERT INTO progress_stats (scope, scope_id, user_id, pending, done)
+    WITH items AS ({ITEMS})
+    SELECT 'user', user_id, user_id, count(*) FILTER (WHERE NOT done), count(*) FILTER (WHERE done)
+    FROM items GROUP BY user_id
+    UNION ALL
+    SELECT 'area', area_id, user_id, count(*) FILTER (WHERE NOT done), count(*) FILTER (WHERE done)
+    FROM items WHERE area_id IS NOT NULL GROUP BY area_id, user_id
+    UNION ALL
+    SELECT 'project', project_id, user_id, count(*) FILTER (WHERE NOT done), count(*) FILTER (WHERE done)
+    FROM items WHERE project_id IS NOT NULL GROUP BY project_id, user_id
+    """,
+    "DELETE FROM daily_completions",
+    f"""
+    INSERT INTO daily_completions (user_id, day, completed)
+    WITH items AS ({ITEMS})
+    SELECT user_id, (completed_at AT TIME ZONE 'UTC')::date, count(*)
+    FROM items WHERE done GROUP BY 1, 2
+    """,
+]
+
+
+def upgrade(conn: Connection) -> None:
+    for sql in (*COMPLETED_AT, *REBUILD):
+        conn.execute(text(sql))
@@ -0,0 +1,11 @@
+"""
+Migraciones del esquema, en orden: `NNNN_<nombre>.py` con una función
+`upgrade(conn: Connection)`. Las aplica scripts/run_migrations.py, cada una en su
+transacción, y anota la versión NNNN en la tabla schema_version.
+
+Una migración se aplica una sola vez, así que no hace falta que sea idempotente; sí debe
+poder ejecutarse dentro de una transacción (nada de CREATE INDEX CONCURRENTLY). Las
+0001-0009 vienen de los antiguos scripts run_add_* / run_alter_* y siguen siendo
+idempotentes: en una BD anterior a schema_version se vuelven a ejecutar sobre el esquema
+que ya existe.
+"""
@@ -0,0 +1,135 @@
+"""
+Benchmark: endpoint síncrono (def + SessionLocal, va al threadpool) frente a
+endpoint async (async def + AsyncSession) bajo mucha concurrencia.
+
+Las peticiones se lanzan directamente contra una app ASGI mínima (sin red) y cada
+consulta simula la latencia de red hasta la BD con pg_sleep. El endpoint síncrono
+queda limitado por los ~40 hilos del threadpool; el async solo por el pool de conexiones.
+
+Uso (con la BD levantada):
+    python scripts/bench_async_vs_sync.py --requests 2000 --concurrency 200 --latency-ms 50
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import DATABASE_URL, ASYNC_DATABASE_URL
+
+
+def build_app(latency: float, pool_size: int) -> FastAPI:
+    sync_engine = create_engine(DATABASE_URL, pool_size=pool_size, max_overflow=0)
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, pool_size=pool_size, max_overflow=0)
+    sync_session = sessionmaker(bind=sync_engine)
+    async_session = async_sessionmaker(async_engine)
+    query = text("SELECT pg_sleep(:latency)")
+
+    app = FastAPI()
+    app.state.sync_engine = sync_engine
+    app.state.async_engine = async_engine
+
+    @app.get("/sync")
+    def sync_endpoint():
+        with sync_session() as db:
+            db.execute(query, {"latency": latency})
+        return {"ok": True}
+
+    @app.get("/async")
+    async def async_endpoint():
+        async with async_session() as db:
+            await db.execute(query, {"latency": latency})
+        return {"ok": True}
+
+    return app
+
+
+async def call(app: FastAPI, path: str) -> int:
+    """Llama a la app ASGI con un GET mínimo y devuelve el status."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("bench", 0),
+        "server": ("bench", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def run(app: FastAPI, path: str, total: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            status = await call(app, path)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                raise RuntimeError(f"{path} devolvió {status}")
+
+    await call(app, path)  # calentar el pool
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{path:7} {total / elapsed:8.0f} req/s   "
+        f"p50 {statistics.median(latencies) * 1000:7.1f} ms   p99 {p99 * 1000:7.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Latencia simulada por consulta")
+    parser.add_argument("--pool-size", type=int, default=80, help="Conexiones por engine (< max_connections)")
+    args = parser.parse_args()
+
+    app = build_app(args.latency_ms / 1000, args.pool_size)
+    print(
+        f"{args.requests} peticiones, concurrencia {args.concurrency}, "
+        f"latencia BD {args.latency_ms} ms, pool {args.pool_size}"
+    )
+    asyncio.run(run(app, "/sync", args.requests, args.concurrency))
+    app.state.sync_engine.dispose()  # liberar conexiones antes de la ronda async
+    asyncio.run(run_async(app, args.requests, args.concurrency))
+
+
+async def run_async(app: FastAPI, total: int, concurrency: int) -> None:
+    try:
+        await run(app, "/async", total, concurrency)
+    finally:
+        await app.state.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
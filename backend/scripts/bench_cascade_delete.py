@@ -0,0 +1,133 @@
+"""
+Benchmark de borrado en cascada: eliminar un área con muchos proyectos y acciones.
+
+Compara tres caminos sobre la misma área (cada ronda en un SAVEPOINT que se deshace):
+  - cascada ORM (antes): hijos cargados en la sesión + db.delete(area); el ORM emite
+    un DELETE por acción y por proyecto antes del del área.
+  - ORM passive_deletes: db.get + db.delete(area); con passive_deletes=True el ORM no
+    carga los hijos y Postgres los borra por ON DELETE CASCADE.
+  - DELETE ... RETURNING: lo que hace ahora DELETE /areas/{id}, una sola sentencia.
+
+Mide tiempo (mediana) y pico de memoria (tracemalloc, en rondas aparte). Los triggers
+de sincronización / cambios (si están instalados) cuentan igual en los tres caminos.
+
+Uso: python scripts/bench_cascade_delete.py --projects 1000 --actions 50 --repeat 3
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.database import async_engine
+from app.models import Area, Project, ProjectNextAction
+
+SEED = [
+    "INSERT INTO users (email, password_hash) VALUES ('bench-cascade@lifehub.local', 'x')",
+    """
+    INSERT INTO areas (user_id, name)
+    SELECT id, 'Área grande' FROM users WHERE email = 'bench-cascade@lifehub.local'
+    """,
+    """
+    INSERT INTO projects (area_id, name)
+    SELECT ar.id, 'Proyecto ' || p
+    FROM areas ar JOIN users u ON u.id = ar.user_id, generate_series(1, :projects) p
+    WHERE u.email = 'bench-cascade@lifehub.local'
+    """,
+    """
+    INSERT INTO project_next_actions (project_id, title)
+    SELECT pr.id, 'Acción ' || n
+    FROM projects pr JOIN areas ar ON ar.id = pr.area_id JOIN users u ON u.id = ar.user_id,
+        generate_series(1, :actions) n
+    WHERE u.email = 'bench-cascade@lifehub.local'
+    """,
+]
+
+
+async def orm_cascade(db: AsyncSession, area_id: int) -> None:
+    area = await db.scalar(
+        select(Area)
+        .where(Area.id == area_id)
+        .options(selectinload(Area.projects).selectinload(Project.next_actions))
+    )
+    await db.delete(area)
+    await db.flush()
+
+
+async def orm_passive(db: AsyncSession, area_id: int) -> None:
+    area = await db.get(Area, area_id)
+    await db.delete(area)
+    await db.flush()
+
+
+async def single_delete(db: AsyncSession, area_id: int) -> None:
+    await db.scalar(
+        delete(Area)
+        .where(Area.id == area_id)
+        .returning(Area.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def measure(conn, fn, area_id: int, repeat: int) -> tuple[float, float]:
+    """Mediana de tiempo (ms) y de pico de memoria (MiB); tracemalloc solo en rondas aparte."""
+    times, peaks = [], []
+    for traced in [False] * repeat + [True] * repeat:
+        async with AsyncSession(bind=conn, join_transaction_mode="create_savepoint") as db:
+            if traced:
+                tracemalloc.start()
+            started = time.perf_counter()
+            await fn(db, area_id)
+            if traced:
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            else:
+                times.append(time.perf_counter() - started)
+            # Al cerrar la sesión se deshace el SAVEPOINT: el área sigue ahí para la siguiente ronda.
+            remaining = await db.scalar(
+                select(func.count()).select_from(ProjectNextAction).join(Project).where(Project.area_id == area_id)
+            )
+            assert remaining == 0, f"{fn.__name__}: quedan {remaining} acciones"
+    return statistics.median(times) * 1000, statistics.median(peaks) / 2**20
+
+
+async def main(projects: int, actions: int, repeat: int) -> None:
+    async with async_engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            for sql in SEED:
+                await conn.execute(text(sql), {"projects": projects, "actions": actions})
+            area_id = await conn.scalar(
+                text(
+                    "SELECT ar.id FROM areas ar JOIN users u ON u.id = ar.user_id "
+                    "WHERE u.email = 'bench-cascade@lifehub.local'"
+                )
+            )
+            print(f"Área con {projects} proyectos x {actions} acciones; mediana de {repeat} rondas")
+            for name, fn in (
+                ("cascada ORM (antes)", orm_cascade),
+                ("ORM passive_deletes", orm_passive),
+                ("DELETE ... RETURNING", single_delete),
+            ):
+                ms, mib = await measure(conn, fn, area_id, repeat)
+                print(f"{name:22} {ms:9.1f} ms {mib:8.1f} MiB")
+        finally:
+            await trans.rollback()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=1000)
+    parser.add_argument("--actions", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.projects, args.actions, args.repeat))
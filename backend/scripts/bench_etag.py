@@ -0,0 +1,143 @@
+"""
+Benchmark de la huella del ETag en los listados paginados (app/etag.py): agregados sobre
+todas las filas del usuario que cumplen el filtro (como antes) frente a agregados solo
+sobre las filas de la página (rows_fingerprint, como ahora), para ?limit=50 en la
+primera página y en una página a mitad del listado.
+
+Siembra un usuario con muchas filas dentro de una transacción y hace ROLLBACK al final.
+
+Uso: python scripts/bench_etag.py --tasks 100000 --projects 5000 --repeat 20
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select, text, tuple_
+
+from app.database import async_engine
+from app.etag import fingerprint
+from app.models import Area, OneShotTask, Project, ProjectNextAction
+from app.routers.one_shot_tasks import tasks_list_query
+from app.routers.projects import _projects_fingerprint
+from app.serialization import PROJECT_COLUMNS
+
+EMAIL = "bench-etag@lifehub.local"
+PAGE = 50
+
+SEED = [
+    f"INSERT INTO users (email, password_hash) VALUES ('{EMAIL}', 'x')",
+    f"""
+    INSERT INTO areas (user_id, name)
+    SELECT u.id, 'Área ' || a FROM users u, generate_series(1, 10) a WHERE u.email = '{EMAIL}'
+    """,
+    f"""
+    INSERT INTO projects (area_id, name)
+    SELECT ar.id, 'Proyecto ' || p
+    FROM areas ar JOIN users u ON u.id = ar.user_id, generate_series(1, :projects / 10) p
+    WHERE u.email = '{EMAIL}'
+    """,
+    f"""
+    INSERT INTO project_next_actions (project_id, title)
+    SELECT pr.id, 'Acción ' || n
+    FROM projects pr JOIN areas ar ON ar.id = pr.area_id JOIN users u ON u.id = ar.user_id,
+        generate_series(1, 4) n
+    WHERE u.email = '{EMAIL}'
+    """,
+    f"""
+    INSERT INTO one_shot_tasks (user_id, title, done, created_at)
+    SELECT u.id, 'Tarea ' || t, t % 3 = 0, now() - t * interval '1 minute'
+    FROM users u, generate_series(1, :tasks) t WHERE u.email = '{EMAIL}'
+    """,
+    "ANALYZE areas, projects, project_next_actions, one_shot_tasks",
+]
+
+
+def projects_page(uid: int, after=None):
+    q = select(*PROJECT_COLUMNS).join(Area).where(Area.user_id == uid)
+    if after is not None:
+        q = q.where(tuple_(Project.name, Project.id) > tuple_(*after))
+    return q.order_by(Project.name, Project.id).limit(PAGE + 1)
+
+
+async def median_ms(conn, stmt, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        (await conn.execute(stmt)).one()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+async def main(tasks: int, projects: int, repeat: int) -> None:
+    async with async_engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            for sql in SEED:
+                await conn.execute(text(sql), {"tasks": tasks, "projects": projects})
+            uid = await conn.scalar(text(f"SELECT id FROM users WHERE email = '{EMAIL}'"))
+            middle_task = (
+                await conn.execute(
+                    select(OneShotTask.done, OneShotTask.created_at, OneShotTask.id)
+                    .where(OneShotTask.user_id == uid)
+                    .order_by(OneShotTask.done, OneShotTask.created_at.desc(), OneShotTask.id.desc())
+                    .offset(tasks // 2)
+                    .limit(1)
+                )
+            ).one()
+            middle_project = (
+                await conn.execute(
+                    select(Project.name, Project.id)
+                    .join(Area)
+                    .where(Area.user_id == uid)
+                    .order_by(Project.name, Project.id)
+                    .offset(projects // 2)
+                    .limit(1)
+                )
+            ).one()
+            whole_tasks = select(*fingerprint(OneShotTask.id, OneShotTask.updated_at, OneShotTask.area_id)).where(
+                OneShotTask.user_id == uid
+            )
+            whole_projects = (
+                select(
+                    *fingerprint(Project.id, Project.updated_at),
+                    *fingerprint(ProjectNextAction.id, ProjectNextAction.updated_at),
+                )
+                .select_from(Project)
+                .join(Area)
+                .outerjoin(ProjectNextAction)
+                .where(Area.user_id == uid)
+            )
+            cases = [
+                (f"one-shots ({tasks})", whole_tasks, [
+                    ("primera página", tasks_list_query(uid, limit=PAGE)[1]),
+                    ("página a mitad", tasks_list_query(uid, after=tuple(middle_task), limit=PAGE)[1]),
+                ]),
+                (f"proyectos ({projects} x 4 acciones)", whole_projects, [
+                    ("primera página", _projects_fingerprint(projects_page(uid))),
+                    ("página a mitad", _projects_fingerprint(projects_page(uid, middle_project))),
+                ]),
+            ]
+            print(f"Huella del ETag con ?limit={PAGE}; mediana de {repeat} rondas")
+            for name, whole, pages in cases:
+                t_whole = await median_ms(conn, whole, repeat)
+                print(f"{name}: todas las filas {t_whole:7.2f} ms")
+                for label, stmt in pages:
+                    t_page = await median_ms(conn, stmt, repeat)
+                    print(f"  {label:15} {t_page:7.2f} ms (x{t_whole / t_page:.0f})")
+        finally:
+            await trans.rollback()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100000)
+    parser.add_argument("--projects", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.projects, args.repeat))
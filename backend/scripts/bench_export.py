@@ -0,0 +1,103 @@
+"""
+Benchmark de GET /export: pico de memoria (tracemalloc) y velocidad de export_chunks
+para cuentas de distinto tamaño. Con cursor del servidor y bloques de EXPORT_CHUNK_ROWS
+el pico debe quedarse plano aunque la cuenta crezca.
+
+Siembra un usuario dentro de una transacción y hace ROLLBACK al final.
+
+Uso: python scripts/bench_export.py --sizes 10000 100000 --format ndjson
+"""
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_engine
+from app.routers.export import EXPORT_CHUNK_ROWS, ExportFormat, export_chunks
+
+SEED = [
+    "INSERT INTO users (email, password_hash) VALUES ('bench-export@lifehub.local', 'x')",
+    """
+    INSERT INTO areas (user_id, name)
+    SELECT id, 'Área ' || a FROM users, generate_series(1, 10) a WHERE email = 'bench-export@lifehub.local'
+    """,
+    """
+    INSERT INTO projects (area_id, name)
+    SELECT ar.id, 'Proyecto ' || p
+    FROM areas ar JOIN users u ON u.id = ar.user_id, generate_series(1, :rows / 100) p
+    WHERE u.email = 'bench-export@lifehub.local'
+    """,
+    """
+    INSERT INTO project_next_actions (project_id, title)
+    SELECT pr.id, 'Acción ' || n
+    FROM projects pr JOIN areas ar ON ar.id = pr.area_id JOIN users u ON u.id = ar.user_id,
+        generate_series(1, 4) n
+    WHERE u.email = 'bench-export@lifehub.local'
+    """,
+    """
+    INSERT INTO one_shot_tasks (user_id, title, done)
+    SELECT u.id, 'Tarea número ' || t || ' con un título realista', t % 3 = 0
+    FROM users u, generate_series(1, :rows) t WHERE u.email = 'bench-export@lifehub.local'
+    """,
+    # Estadísticas al día: sin ellas el planificador elige mal tras sembrar (y deshacer) mucho.
+    "ANALYZE areas, projects, project_next_actions, one_shot_tasks",
+]
+
+
+async def run(conn, uid: int, fmt: ExportFormat, traced: bool) -> tuple[int, float, int]:
+    async with AsyncSession(bind=conn, join_transaction_mode="create_savepoint") as db:
+        if traced:
+            tracemalloc.start()
+        started = time.perf_counter()
+        size = 0
+        async for chunk in export_chunks(db, uid, fmt):
+            size += len(chunk)
+        elapsed = time.perf_counter() - started
+        peak = 0
+        if traced:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return size, elapsed, peak
+
+
+async def main(sizes: list[int], fmt: ExportFormat) -> None:
+    print(f"formato {fmt.value}, bloques de {EXPORT_CHUNK_ROWS} filas")
+    async with async_engine.connect() as conn:
+        for rows in sizes:
+            trans = await conn.begin()
+            try:
+                for sql in SEED:
+                    await conn.execute(text(sql), {"rows": rows})
+                uid = await conn.scalar(text("SELECT id FROM users WHERE email = 'bench-export@lifehub.local'"))
+                total = await conn.scalar(
+                    text(
+                        "SELECT (SELECT count(*) FROM one_shot_tasks WHERE user_id = :u)"
+                        " + (SELECT count(*) FROM projects p JOIN areas a ON a.id = p.area_id WHERE a.user_id = :u) * 5"
+                        " + 10"
+                    ),
+                    {"u": uid},
+                )
+                size, elapsed, _ = await run(conn, uid, fmt, traced=False)
+                _, _, peak = await run(conn, uid, fmt, traced=True)
+                print(
+                    f"{total:8} filas  {size / 2**20:7.1f} MiB  {elapsed * 1000:8.0f} ms  "
+                    f"{total / elapsed:8.0f} filas/s  pico {peak / 2**20:5.1f} MiB"
+                )
+            finally:
+                await trans.rollback()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--format", type=ExportFormat, default=ExportFormat.ndjson)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.format))
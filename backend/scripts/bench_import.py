@@ -0,0 +1,109 @@
+"""
+Benchmark de POST /import: genera un fichero de ~100k filas en el formato de GET /export
+(10 áreas, proyectos con 4 acciones cada uno y el resto one-shots), lo pasa por el parser
+en trozos de 64 KiB e import_rows (validación + COPY a staging + INSERT ... SELECT) y
+mide filas por segundo. Todo dentro de una transacción que se deshace al final.
+
+Uso: python scripts/bench_import.py --rows 100000 --format ndjson
+"""
+import argparse
+import asyncio
+import csv
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.data_import import IMPORT_CHUNK_ROWS, import_rows
+from app.database import async_engine
+from app.routers.export import CSV_FIELDS, ExportFormat
+from app.routers.imports import PARSERS
+
+CHUNK_BYTES = 64 * 1024
+
+
+def generate(rows: int) -> list[dict]:
+    projects = rows // 100
+    data = [{"type": "area", "id": a, "name": f"Área {a}", "color": "#336699"} for a in range(1, 11)]
+    data += [
+        {"type": "project", "id": p, "area_id": p % 10 + 1, "name": f"Proyecto {p}", "pinned": p % 7 == 0}
+        for p in range(1, projects + 1)
+    ]
+    data += [
+        {"type": "project_next_action", "project_id": p, "title": f"Acción {n} del proyecto {p}", "done": n == 1}
+        for p in range(1, projects + 1)
+        for n in range(1, 5)
+    ]
+    data += [
+        {
+            "type": "one_shot_task",
+            "area_id": t % 11 or None,
+            "title": f"Tarea número {t} con un título realista",
+            "done": t % 3 == 0,
+        }
+        for t in range(1, rows - len(data) + 1)
+    ]
+    return data
+
+
+def encode(data: list[dict], fmt: ExportFormat) -> bytes:
+    if fmt is ExportFormat.ndjson:
+        return b"".join(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in data)
+    if fmt is ExportFormat.csv:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, CSV_FIELDS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(data)
+        return buffer.getvalue().encode()
+    tables: dict[str, list] = {}
+    for row in data:
+        key = {"area": "areas", "project": "projects", "project_next_action": "project_next_actions"}.get(
+            row["type"], "one_shot_tasks"
+        )
+        tables.setdefault(key, []).append({k: v for k, v in row.items() if k != "type"})
+    return orjson.dumps(tables)
+
+
+async def chunks(body: bytes):
+    for start in range(0, len(body), CHUNK_BYTES):
+        yield body[start : start + CHUNK_BYTES]
+
+
+async def main(rows: int, fmt: ExportFormat) -> None:
+    body = encode(generate(rows), fmt)
+    async with async_engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            await conn.execute(
+                text("INSERT INTO users (email, password_hash) VALUES ('bench-import@lifehub.local', 'x')")
+            )
+            uid = await conn.scalar(text("SELECT id FROM users WHERE email = 'bench-import@lifehub.local'"))
+            async with AsyncSession(bind=conn, join_transaction_mode="create_savepoint") as db:
+                started = time.perf_counter()
+                result = await import_rows(db, uid, PARSERS[fmt](chunks(body)))
+                elapsed = time.perf_counter() - started
+            print(
+                f"{fmt.value}: {result['rows']} filas ({len(body) / 2**20:.1f} MiB, bloques de {IMPORT_CHUNK_ROWS}) "
+                f"en {elapsed * 1000:.0f} ms -> {result['rows'] / elapsed:,.0f} filas/s"
+            )
+            print(
+                f"  áreas {result['areas']}, proyectos {result['projects']}, "
+                f"acciones {result['project_next_actions']}, one-shots {result['one_shot_tasks']}"
+            )
+        finally:
+            await trans.rollback()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--format", type=ExportFormat, default=ExportFormat.ndjson)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.format))
@@ -0,0 +1,88 @@
+"""
+Microbenchmark del índice de GET /quick-find (app/quick_find.py), sin BD:
+- construir el índice de un usuario con N proyectos repartidos en 20 áreas,
+- latencia de una búsqueda por prefijo (1, 2 y 5 letras, con tildes, emoji),
+- alta / cambio / baja incremental,
+- memoria real (tracemalloc) frente a la estimación que usa el LRU.
+
+Uso: python scripts/bench_quick_find.py --projects 2000 --repeat 2000
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.quick_find import QuickFindItem, UserIndex, prefix_key
+
+WORDS = [
+    "Reunión", "cliente", "Niños", "colegio", "presentación", "Salud", "correr", "Casa",
+    "reforma", "Viaje", "Japón", "facturas", "Mudanza", "guitarra", "Lectura", "jardín",
+]
+ICONS = ["🏃", "🎒", "🏠", "✈️", "💼", "📚", None, None]
+PREFIXES = ["c", "co", "Cole", "reunion", "niñ", "japo", "🎒", "zzz"]
+
+
+def generate(projects: int) -> list[QuickFindItem]:
+    rnd = random.Random(42)
+    items = [QuickFindItem("area", a, f"{rnd.choice(WORDS)} {a}", None, a) for a in range(1, 21)]
+    items += [
+        QuickFindItem(
+            "project", p, " ".join(rnd.sample(WORDS, 3)) + f" {p}", rnd.choice(ICONS), p % 20 + 1
+        )
+        for p in range(1, projects + 1)
+    ]
+    return items
+
+
+def timed(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main(projects: int, repeat: int) -> None:
+    items = generate(projects)
+
+    started = time.perf_counter()
+    index = UserIndex(items, ttl_seconds=3600)
+    build_ms = (time.perf_counter() - started) * 1000
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    traced = UserIndex(items, ttl_seconds=3600)
+    real = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del traced
+    print(
+        f"{len(items)} elementos, {len(index.keys)} claves: índice en {build_ms:.1f} ms; "
+        f"memoria real {real / 1024:.0f} KiB, estimada {index.bytes / 1024:.0f} KiB"
+    )
+
+    for prefix in PREFIXES:
+        key = prefix_key(prefix)
+        samples = timed(lambda: index.find(key, 10), repeat)
+        matches = len(index.find(key, len(items)))
+        print(
+            f"  {prefix!r:10} mediana {statistics.median(samples):.3f} ms  "
+            f"p99 {statistics.quantiles(samples, n=100)[98]:.3f} ms  ({matches} coincidencias en total)"
+        )
+
+    new = QuickFindItem("project", projects + 1, "Proyecto nuevo con nombre largo", "🆕", 1)
+    renamed = QuickFindItem("project", projects + 1, "Proyecto renombrado", "🆕", 2)
+    samples = timed(lambda: (index.add(new), index.add(renamed), index.remove("project", projects + 1)), repeat)
+    print(f"  alta + cambio + baja: mediana {statistics.median(samples):.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.projects, args.repeat)
@@ -0,0 +1,144 @@
+"""
+Benchmark de lectura: entidades ORM (select(Modelo) + selectinload) frente a columnas
+de Core (select(*COLUMNAS) + segunda consulta plana para las siguientes acciones),
+como hacen ahora los listados. Mide tiempo (consulta + encoders) y pico de memoria
+(tracemalloc) por petición.
+
+Siembra un usuario con muchas filas dentro de una transacción y hace ROLLBACK al final.
+
+Uso: python scripts/bench_read_paths.py --tasks 10000 --projects 2000 --repeat 5
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.database import async_engine
+from app.models import Area, OneShotTask, Project, ProjectNextAction
+from app.serialization import (
+    NEXT_ACTION_COLUMNS,
+    ONE_SHOT_TASK_COLUMNS,
+    PROJECT_COLUMNS,
+    encode_one_shot_task,
+    encode_project,
+    group_by,
+)
+
+SEED = [
+    "INSERT INTO users (email, password_hash) VALUES ('bench-read@lifehub.local', 'x')",
+    """
+    INSERT INTO areas (user_id, name)
+    SELECT u.id, 'Área ' || a FROM users u, generate_series(1, 10) a WHERE u.email = 'bench-read@lifehub.local'
+    """,
+    """
+    INSERT INTO projects (area_id, name)
+    SELECT ar.id, 'Proyecto ' || p
+    FROM areas ar JOIN users u ON u.id = ar.user_id, generate_series(1, :projects / 10) p
+    WHERE u.email = 'bench-read@lifehub.local'
+    """,
+    """
+    INSERT INTO project_next_actions (project_id, title)
+    SELECT pr.id, 'Acción ' || n
+    FROM projects pr JOIN areas ar ON ar.id = pr.area_id JOIN users u ON u.id = ar.user_id,
+        generate_series(1, 4) n
+    WHERE u.email = 'bench-read@lifehub.local'
+    """,
+    """
+    INSERT INTO one_shot_tasks (user_id, title, done)
+    SELECT u.id, 'Tarea número ' || t || ' con un título realista', t % 3 = 0
+    FROM users u, generate_series(1, :tasks) t WHERE u.email = 'bench-read@lifehub.local'
+    """,
+]
+
+
+async def tasks_orm(db: AsyncSession, uid: int) -> list:
+    rows = (await db.scalars(select(OneShotTask).where(OneShotTask.user_id == uid))).all()
+    return [encode_one_shot_task(t) for t in rows]
+
+
+async def tasks_core(db: AsyncSession, uid: int) -> list:
+    rows = (await db.execute(select(*ONE_SHOT_TASK_COLUMNS).where(OneShotTask.user_id == uid))).all()
+    return [encode_one_shot_task(t) for t in rows]
+
+
+async def projects_orm(db: AsyncSession, uid: int) -> list:
+    rows = (
+        await db.scalars(
+            select(Project).join(Area).where(Area.user_id == uid).options(selectinload(Project.next_actions))
+        )
+    ).all()
+    return [encode_project(p) for p in rows]
+
+
+async def projects_core(db: AsyncSession, uid: int) -> list:
+    rows = (await db.execute(select(*PROJECT_COLUMNS).join(Area).where(Area.user_id == uid))).all()
+    next_actions = group_by(
+        (
+            await db.execute(
+                select(*NEXT_ACTION_COLUMNS)
+                .where(ProjectNextAction.project_id.in_([p.id for p in rows]))
+                .order_by(ProjectNextAction.project_id, ProjectNextAction.id)
+            )
+        ).all(),
+        "project_id",
+    )
+    return [encode_project(p, next_actions.get(p.id, ())) for p in rows]
+
+
+async def measure(conn, fn, uid: int, repeat: int) -> tuple[float, float, int]:
+    """
+    Mediana de tiempo (ms) y pico de memoria (MiB) con sesión nueva por ronda. El pico
+    se mide en rondas aparte: tracemalloc ralentiza mucho y falsearía los tiempos.
+    """
+    times, peaks = [], []
+    for traced in [False] * repeat + [True] * repeat:
+        async with AsyncSession(bind=conn, join_transaction_mode="create_savepoint") as db:
+            if traced:
+                tracemalloc.start()
+            started = time.perf_counter()
+            result = await fn(db, uid)
+            if traced:
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            else:
+                times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000, statistics.median(peaks) / 2**20, len(result)
+
+
+async def main(tasks: int, projects: int, repeat: int) -> None:
+    async with async_engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            for sql in SEED:
+                await conn.execute(text(sql), {"tasks": tasks, "projects": projects})
+            uid = await conn.scalar(text("SELECT id FROM users WHERE email = 'bench-read@lifehub.local'"))
+            print(f"{tasks} one-shots, {projects} proyectos x 4 acciones; mediana de {repeat} rondas")
+            for name, orm, core in (("tasks", tasks_orm, tasks_core), ("projects", projects_orm, projects_core)):
+                t_orm, m_orm, n = await measure(conn, orm, uid, repeat)
+                t_core, m_core, _ = await measure(conn, core, uid, repeat)
+                print(
+                    f"{name:9} ({n} filas)  ORM {t_orm:7.1f} ms {m_orm:6.1f} MiB   "
+                    f"Core {t_core:7.1f} ms {m_core:6.1f} MiB   "
+                    f"tiempo x{t_orm / t_core:.1f}, memoria x{m_orm / m_core:.1f}"
+                )
+        finally:
+            await trans.rollback()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--projects", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.tasks, args.projects, args.repeat))
@@ -0,0 +1,125 @@
+"""
+Benchmark de GET /search a escala: siembra ~1M filas repartidas entre usuarios (áreas,
+proyectos, siguientes acciones y one-shots con títulos de un vocabulario en español) y
+mide la latencia de la consulta del endpoint (primera página de 20) para palabras
+frecuentes, raras, prefijos cortos y varias palabras.
+
+Siembra dentro de una transacción y hace ROLLBACK al final. Requiere la migración 0008_search.
+
+Uso: python scripts/bench_search.py --users 200 --rows-per-user 5000 --repeat 20
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_engine
+from app.routers.search import execute_search, search_statement
+
+WORDS = (
+    "comprar llamar revisar preparar enviar correo informe reunión médico dentista gimnasio correr "
+    "nadar leer libro estudiar examen proyecto presentación cliente factura banco seguro coche taller "
+    "casa limpieza cocina cena compra mercado regalo cumpleaños viaje billete hotel maleta pasaporte "
+    "niños colegio deberes jardín plantas pintar mueble ordenador copia seguridad contraseña actualizar "
+    "escribir artículo blog vídeo curso inglés guitarra ensayo concierto familia abuela visita"
+).split()
+RARE_WORD = "murciélago"  # ~1 de cada 1000 filas
+
+TITLE = """
+array_to_string(ARRAY[
+    (CAST(:words AS text[]))[1 + floor(random() * CAST(:n AS int))::int], (CAST(:words AS text[]))[1 + floor(random() * CAST(:n AS int))::int],
+    (CAST(:words AS text[]))[1 + floor(random() * CAST(:n AS int))::int], (CAST(:words AS text[]))[1 + floor(random() * CAST(:n AS int))::int],
+    CASE WHEN random() < 0.001 THEN CAST(:rare AS text) END
+], ' ')
+"""
+
+SEED = [
+    """
+    INSERT INTO users (email, password_hash)
+    SELECT 'bench-search-' || u || '@lifehub.local', 'x' FROM generate_series(1, :users) u
+    """,
+    """
+    INSERT INTO areas (user_id, name, description)
+    SELECT u.id, 'Área ' || a, """ + TITLE + """
+    FROM users u, generate_series(1, 10) a WHERE u.email LIKE 'bench-search-%'
+    """,
+    """
+    INSERT INTO projects (area_id, name, description)
+    SELECT ar.id, """ + TITLE + ", " + TITLE + """
+    FROM areas ar JOIN users u ON u.id = ar.user_id, generate_series(1, :per_user / 500) p
+    WHERE u.email LIKE 'bench-search-%'
+    """,
+    """
+    INSERT INTO project_next_actions (project_id, title)
+    SELECT pr.id, """ + TITLE + """
+    FROM projects pr JOIN areas ar ON ar.id = pr.area_id JOIN users u ON u.id = ar.user_id,
+        generate_series(1, 4) n
+    WHERE u.email LIKE 'bench-search-%'
+    """,
+    """
+    INSERT INTO one_shot_tasks (user_id, title, done)
+    SELECT u.id, """ + TITLE + """, random() < 0.3
+    FROM users u, generate_series(1, :per_user - :per_user / 50 * 5 - 10) t
+    WHERE u.email LIKE 'bench-search-%'
+    """,
+    "ANALYZE users, areas, projects, project_next_actions, one_shot_tasks",
+]
+
+QUERIES = ["correo", RARE_WORD, "co", "reunion cliente", "niño colegio", "presentaciones"]
+
+
+async def main(users: int, per_user: int, repeat: int) -> None:
+    params = {"users": users, "per_user": per_user, "words": WORDS, "n": len(WORDS), "rare": RARE_WORD}
+    async with async_engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            started = time.perf_counter()
+            for sql in SEED:
+                await conn.execute(text(sql), params)
+            total = await conn.scalar(
+                text(
+                    "SELECT (SELECT count(*) FROM areas) + (SELECT count(*) FROM projects)"
+                    " + (SELECT count(*) FROM project_next_actions) + (SELECT count(*) FROM one_shot_tasks)"
+                )
+            )
+            uid = await conn.scalar(text("SELECT id FROM users WHERE email = 'bench-search-1@lifehub.local'"))
+            print(f"{total} filas ({users} usuarios x ~{per_user}) sembradas en {time.perf_counter() - started:.0f} s")
+            async with AsyncSession(bind=conn, join_transaction_mode="create_savepoint") as db:
+                for q in QUERIES:
+                    stmt = search_statement(uid, q)
+                    times = []
+                    for _ in range(repeat):
+                        t0 = time.perf_counter()
+                        rows = await execute_search(db, stmt)
+                        times.append(time.perf_counter() - t0)
+                    matches = await db.scalar(
+                        text(
+                            "SELECT count(*) FROM one_shot_tasks WHERE user_id = :u AND search_vector @@ "
+                            "to_tsquery('spanish', lifehub_search_text(:q))"
+                        ),
+                        {"u": uid, "q": " & ".join(f"{w}:*" for w in q.split())},
+                    )
+                    print(
+                        f"{q!r:20} mediana {statistics.median(times) * 1000:6.1f} ms  "
+                        f"p95 {sorted(times)[int(len(times) * 0.95) - 1] * 1000:6.1f} ms  "
+                        f"({len(rows)} filas de página, {matches} one-shots coinciden)"
+                    )
+        finally:
+            await trans.rollback()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--rows-per-user", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.rows_per_user, args.repeat))
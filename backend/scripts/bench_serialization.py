@@ -0,0 +1,144 @@
+"""
+Microbenchmark: serializar un listado de N filas con el camino de FastAPI
+(response_model + validación Pydantic from_attributes + JSONResponse) frente al
+camino rápido (encoders de app/serialization.py + orjson).
+
+No necesita BD: las filas son entidades ORM transitorias. Se llama a una app ASGI
+mínima con los dos endpoints y se comprueba que ambos cuerpos son idénticos.
+
+Uso: python scripts/bench_serialization.py --rows 10000 --repeat 20
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI
+
+from app.models import OneShotTask, Project, ProjectNextAction
+from app.schemas import OneShotTaskResponse, ProjectResponse
+from app.serialization import encode_one_shot_task, encode_project, json_response
+
+
+def build_rows(n: int) -> tuple[list[OneShotTask], list[Project]]:
+    now = datetime.now(timezone.utc)
+    tasks = [
+        OneShotTask(
+            id=i,
+            user_id=1,
+            area_id=i % 7 or None,
+            title=f"Tarea número {i} con un título realista",
+            done=i % 3 == 0,
+            created_at=now - timedelta(minutes=i),
+            updated_at=now,
+        )
+        for i in range(1, n + 1)
+    ]
+    projects = []
+    for i in range(1, n // 5 + 1):  # proyectos con 4 siguientes acciones: ~n filas en total
+        project = Project(
+            id=i,
+            area_id=i % 7 + 1,
+            icon=None,
+            name=f"Proyecto {i}",
+            description="Descripción del proyecto",
+            pinned=False,
+            created_at=now,
+            updated_at=now,
+        )
+        project.next_actions = [
+            ProjectNextAction(
+                id=i * 10 + k, project_id=i, title=f"Acción {k}", done=False, created_at=now, updated_at=now
+            )
+            for k in range(4)
+        ]
+        projects.append(project)
+    return tasks, projects
+
+
+def build_app(tasks: list[OneShotTask], projects: list[Project]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/tasks/pydantic", response_model=list[OneShotTaskResponse])
+    async def tasks_pydantic():
+        return tasks
+
+    @app.get("/tasks/fast", response_model=list[OneShotTaskResponse])
+    async def tasks_fast():
+        return json_response([encode_one_shot_task(t) for t in tasks])
+
+    @app.get("/projects/pydantic", response_model=list[ProjectResponse])
+    async def projects_pydantic():
+        return projects
+
+    @app.get("/projects/fast", response_model=list[ProjectResponse])
+    async def projects_fast():
+        return json_response([encode_project(p) for p in projects])
+
+    return app
+
+
+async def call(app: FastAPI, path: str) -> bytes:
+    """GET mínimo contra la app ASGI; devuelve el cuerpo."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("bench", 0),
+        "server": ("bench", 80),
+    }
+    body = bytearray()
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return bytes(body)
+
+
+async def bench(app: FastAPI, path: str, repeat: int) -> tuple[float, bytes]:
+    body = await call(app, path)  # calentar
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await call(app, path)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), body
+
+
+async def main(rows: int, repeat: int) -> None:
+    tasks, projects = build_rows(rows)
+    app = build_app(tasks, projects)
+    print(f"{rows} one-shots / {len(projects)} proyectos x 4 acciones, mediana de {repeat} repeticiones")
+    for name in ("tasks", "projects"):
+        before, body_before = await bench(app, f"/{name}/pydantic", repeat)
+        after, body_after = await bench(app, f"/{name}/fast", repeat)
+        same = "idéntico" if body_before == body_after else "DISTINTO"
+        print(
+            f"{name:9} pydantic {before * 1000:8.1f} ms   orjson {after * 1000:8.1f} ms   "
+            f"x{before / after:4.1f}   ({len(body_after) / 1024:.0f} KiB, cuerpo {same})"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
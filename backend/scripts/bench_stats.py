@@ -0,0 +1,162 @@
+"""
+Benchmark de las estadísticas de progreso (GET /stats, migrations/0009_progress_stats.py).
+
+Siembra un usuario con P proyectos x A acciones y T one-shots (más otros usuarios de
+relleno) dentro de una transacción que se deshace al final, y mide:
+  - lectura: GET /stats desde progress_stats frente al GROUP BY sobre las tablas que
+    sustituye (mismo resultado, se comprueba),
+  - coste de los triggers en escrituras: marcar / desmarcar tareas de una en una,
+    INSERT ... SELECT masivo y borrar el área (cascada), con y sin los triggers de stats.
+
+Uso: python scripts/bench_stats.py --projects 200 --actions 50 --tasks 10000 --repeat 200
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text
+
+from app.database import async_engine
+from app.progress_stats import EXPECTED_PROGRESS, ITEMS
+
+EMAIL = "bench-stats@lifehub.local"
+FILLER_USERS = 50
+
+SEED = [
+    """
+    INSERT INTO users (email, password_hash)
+    SELECT 'bench-stats-' || u || '@lifehub.local', 'x' FROM generate_series(0, :filler) u
+    """,
+    """
+    INSERT INTO areas (user_id, name)
+    SELECT id, 'Área ' || a FROM users, generate_series(1, 10) a WHERE email LIKE 'bench-stats-%'
+    """,
+    """
+    INSERT INTO projects (area_id, name)
+    SELECT ar.id, 'Proyecto ' || p
+    FROM areas ar JOIN users u ON u.id = ar.user_id, generate_series(1, :projects / 10) p
+    WHERE u.email LIKE 'bench-stats-%'
+    """,
+    """
+    INSERT INTO project_next_actions (project_id, title, done)
+    SELECT pr.id, 'Acción ' || n, n % 3 = 0
+    FROM projects pr JOIN areas ar ON ar.id = pr.area_id JOIN users u ON u.id = ar.user_id,
+        generate_series(1, :actions) n
+    WHERE u.email LIKE 'bench-stats-%'
+    """,
+    """
+    INSERT INTO one_shot_tasks (user_id, area_id, title, done)
+    SELECT u.id, (SELECT id FROM areas WHERE user_id = u.id ORDER BY id OFFSET t % 11 LIMIT 1), 'Tarea ' || t, t % 4 = 0
+    FROM users u, generate_series(1, :tasks) t
+    WHERE u.email LIKE 'bench-stats-%'
+    """,
+    "UPDATE users SET email = :email WHERE email = 'bench-stats-0@lifehub.local'",
+    "ANALYZE users, areas, projects, project_next_actions, one_shot_tasks, progress_stats, daily_completions",
+]
+
+FROM_SUMMARY = """
+    SELECT scope, scope_id, pending, done FROM progress_stats
+    WHERE user_id = :uid AND (pending <> 0 OR done <> 0)
+"""
+# Lo mismo agrupando las tareas del usuario (lo que se evita en cada carga)
+USER_ITEMS = """
+    SELECT a.user_id, a.id AS area_id, p.id AS project_id, n.done, n.completed_at
+    FROM project_next_actions n
+    JOIN projects p ON p.id = n.project_id
+    JOIN areas a ON a.id = p.area_id
+    WHERE a.user_id = :uid
+    UNION ALL
+    SELECT user_id, area_id, NULL, done, completed_at FROM one_shot_tasks WHERE user_id = :uid
+"""
+FROM_TABLES = f"SELECT scope, scope_id, pending, done FROM ({EXPECTED_PROGRESS.replace(ITEMS, USER_ITEMS)}) e"
+
+STATS_TRIGGERS = {
+    table: tuple(f"trg_{table}_{name}" for name in ("stats_insert", "stats_update", "stats_delete",
+                                                     "completed_insert", "completed_update"))
+    for table in ("project_next_actions", "one_shot_tasks")
+}
+STATS_TRIGGERS |= {
+    "projects": ("trg_projects_stats_delete", "trg_projects_stats_move"),
+    "areas": ("trg_areas_stats_delete",),
+}
+
+
+async def set_stats_triggers(conn, enabled: bool) -> None:
+    action = "ENABLE" if enabled else "DISABLE"
+    for table, names in STATS_TRIGGERS.items():
+        for name in names:
+            await conn.execute(text(f"ALTER TABLE {table} {action} TRIGGER {name}"))
+
+
+async def timed(conn, sql: str, params: list[dict] | dict) -> float:
+    started = time.perf_counter()
+    for p in params if isinstance(params, list) else [params]:
+        await conn.execute(text(sql), p)
+    return (time.perf_counter() - started) * 1000
+
+
+async def main(projects: int, actions: int, tasks: int, repeat: int) -> None:
+    async with async_engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            params = {"filler": FILLER_USERS, "projects": projects, "actions": actions, "tasks": tasks, "email": EMAIL}
+            for sql in SEED:
+                await conn.execute(text(sql), params)
+            uid = await conn.scalar(text("SELECT id FROM users WHERE email = :email"), {"email": EMAIL})
+            print(f"Usuario con {projects} proyectos x {actions} acciones y {tasks} one-shots (+{FILLER_USERS} iguales)")
+
+            summary = sorted((await conn.execute(text(FROM_SUMMARY), {"uid": uid})).all())
+            grouped = sorted((await conn.execute(text(FROM_TABLES), {"uid": uid})).all())
+            assert summary == grouped, "progress_stats no coincide con las tablas"
+            for label, sql in (("GROUP BY sobre las tablas", FROM_TABLES), ("progress_stats", FROM_SUMMARY)):
+                samples = [await timed(conn, sql, {"uid": uid}) for _ in range(max(repeat // 10, 5))]
+                print(f"  lectura {label:28} mediana {statistics.median(samples):7.2f} ms ({len(summary)} filas)")
+
+            task_ids = (await conn.scalars(
+                text("SELECT id FROM one_shot_tasks WHERE user_id = :uid ORDER BY id LIMIT :n"), {"uid": uid, "n": repeat}
+            )).all()
+            action_ids = (await conn.scalars(
+                text("""
+                    SELECT n.id FROM project_next_actions n JOIN projects p ON p.id = n.project_id
+                    JOIN areas a ON a.id = p.area_id WHERE a.user_id = :uid ORDER BY n.id LIMIT :n
+                """),
+                {"uid": uid, "n": repeat},
+            )).all()
+            area_id = await conn.scalar(text("SELECT min(id) FROM areas WHERE user_id = :uid"), {"uid": uid})
+            toggle_task = "UPDATE one_shot_tasks SET done = NOT done WHERE id = :id"
+            toggle_action = "UPDATE project_next_actions SET done = NOT done WHERE id = :id"
+            bulk = """
+                INSERT INTO one_shot_tasks (user_id, title, done)
+                SELECT :uid, 'Masiva ' || t, t % 2 = 0 FROM generate_series(1, 100000) t
+            """
+            for enabled in (False, True):
+                label = "con triggers" if enabled else "sin triggers"
+                await set_stats_triggers(conn, enabled)
+                nested = await conn.begin_nested()
+                per_task = await timed(conn, toggle_task, [{"id": i} for i in task_ids]) / len(task_ids)
+                per_action = await timed(conn, toggle_action, [{"id": i} for i in action_ids]) / len(action_ids)
+                bulk_ms = await timed(conn, bulk, {"uid": uid})
+                cascade_ms = await timed(conn, "DELETE FROM areas WHERE id = :id", {"id": area_id})
+                await nested.rollback()
+                print(
+                    f"  {label}: marcar one-shot {per_task:.3f} ms, marcar acción {per_action:.3f} ms, "
+                    f"INSERT 100k {bulk_ms:.0f} ms, borrar área ({projects // 10} proyectos) {cascade_ms:.0f} ms"
+                )
+        finally:
+            await trans.rollback()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--actions", type=int, default=50)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.projects, args.actions, args.tasks, args.repeat))
@@ -0,0 +1,273 @@
+"""
+Comprueba con EXPLAIN que las consultas principales de los routers usan índices: los
+listados y las huellas de su ETag, el dashboard, la sincronización, la exportación y la
+búsqueda, construidas con las mismas funciones que usan los routers.
+
+Siembra un volumen realista de datos dentro de una transacción (usuarios, áreas,
+proyectos, siguientes acciones y one-shots), ejecuta ANALYZE y EXPLAIN de cada consulta
+y falla (exit 1) si alguna cae en un Seq Scan, en una ordenación explícita (Sort) que el
+índice debería evitar, en un recorrido entero de un índice que filtra por usuario o padre
+fuera del índice, o (sincronización y exportación) si no usa el índice esperado. Al
+terminar hace ROLLBACK: la BD queda como estaba.
+
+Con pocas filas por usuario el planner puede preferir ordenar en memoria aunque exista
+el índice, así que se penaliza Seq Scan (enable_seqscan = off) y, en las consultas en
+las que no se permite, Sort (enable_sort = off). Sin Seq Scan el planner puede recorrer
+entera la clave primaria y filtrar después: eso también cuenta como fallo.
+
+Uso: python scripts/check_query_plans.py
+"""
+import json
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import func, select, text
+
+from app.database import engine
+from app.models import Area, OneShotTask, Project
+from app.routers.areas import areas_list_query
+from app.routers.dashboard import dashboard_queries
+from app.routers.export import EXPORT_TABLES
+from app.routers.one_shot_tasks import tasks_list_query
+from app.routers.project_next_actions import next_actions_list_query
+from app.routers.projects import next_actions_of_query, projects_list_query
+from app.routers.search import search_statement
+from app.routers.sync import sync_queries
+
+USERS = 200
+AREAS_PER_USER = 10
+PROJECTS_PER_AREA = 10
+ACTIONS_PER_PROJECT = 5
+TASKS_PER_USER = 200
+PAGE = 50  # los constructores piden limit + 1 filas
+
+# Columnas de usuario o padre: filtrar por ellas fuera del índice es recorrerlo entero
+PARENT_FILTER = re.compile(r"\b(user_id|area_id|project_id)\b")
+
+# Índices por usuario o padre de cada tabla (exportación: cualquiera sirve para no leer
+# las filas de otros usuarios)
+PARENT_INDEXES = {
+    "areas": {"ix_areas_user_id", "ix_areas_user_id_name", "ix_areas_user_id_updated_at"},
+    "projects": {"ix_projects_area_id", "ix_projects_area_id_name_id", "ix_projects_area_id_updated_at"},
+    "project_next_actions": {
+        "ix_project_next_actions_project_id",
+        "ix_project_next_actions_project_id_id",
+        "ix_project_next_actions_project_id_updated_at",
+    },
+    "one_shot_tasks": {
+        "ix_one_shot_tasks_user_id",
+        "ix_one_shot_tasks_user_done_created",
+        "ix_one_shot_tasks_user_id_updated_at",
+    },
+}
+
+# Índices por usuario o padre y updated_at de la sincronización (0006, 0010)
+SYNC_INDEXES = {
+    "areas": "ix_areas_user_id_updated_at",
+    "projects": "ix_projects_area_id_updated_at",
+    "project_next_actions": "ix_project_next_actions_project_id_updated_at",
+    "one_shot_tasks": "ix_one_shot_tasks_user_id_updated_at",
+    "deleted_records": "ix_deleted_records_user_id_deleted_at",
+}
+
+SEED = [
+    """
+    INSERT INTO users (email, password_hash, full_name)
+    SELECT 'plan-check-' || u || '@lifehub.local', 'x', NULL FROM generate_series(1, :users) u
+    """,
+    """
+    INSERT INTO areas (user_id, name)
+    SELECT u.id, 'Área ' || a FROM users u, generate_series(1, :areas) a
+    WHERE u.email LIKE 'plan-check-%'
+    """,
+    """
+    INSERT INTO projects (area_id, name)
+    SELECT ar.id, 'Proyecto ' || p FROM areas ar JOIN users u ON u.id = ar.user_id,
+        generate_series(1, :projects) p
+    WHERE u.email LIKE 'plan-check-%'
+    """,
+    """
+    INSERT INTO project_next_actions (project_id, title, done)
+    SELECT pr.id, 'Acción ' || n, n % 2 = 0
+    FROM projects pr JOIN areas ar ON ar.id = pr.area_id JOIN users u ON u.id = ar.user_id,
+        generate_series(1, :actions) n
+    WHERE u.email LIKE 'plan-check-%'
+    """,
+    """
+    INSERT INTO one_shot_tasks (user_id, area_id, title, done, created_at)
+    SELECT u.id, CASE WHEN t % 3 = 0 THEN NULL ELSE (
+               SELECT min(id) FROM areas WHERE user_id = u.id) END,
+           'Tarea ' || t, t % 5 <> 0, now() - t * interval '1 hour'
+    FROM users u, generate_series(1, :tasks) t
+    WHERE u.email LIKE 'plan-check-%'
+    """,
+]
+
+
+def queries(conn, user_id: int, area_id: int, project_id: int) -> list[tuple[str, object, bool, set[str]]]:
+    """
+    (nombre, consulta, permite Sort, índices aceptados: el plan debe usar alguno; vacío =
+    sin exigencia). Las consultas salen de los mismos constructores que usan los routers
+    (y sus huellas para el ETag); los cursores, de filas reales a mitad de cada listado.
+    """
+    task_after = tuple(
+        conn.execute(
+            select(OneShotTask.done, OneShotTask.created_at, OneShotTask.id)
+            .where(OneShotTask.user_id == user_id)
+            .order_by(OneShotTask.done, OneShotTask.created_at.desc(), OneShotTask.id.desc())
+            .offset(TASKS_PER_USER // 10)
+            .limit(1)
+        ).one()
+    )
+    project_after = tuple(
+        conn.execute(
+            select(Project.name, Project.id)
+            .join(Area)
+            .where(Area.user_id == user_id)
+            .order_by(Project.name, Project.id)
+            .offset(AREAS_PER_USER * PROJECTS_PER_AREA // 2)
+            .limit(1)
+        ).one()
+    )
+    since_at = conn.scalar(select(func.now() - text("interval '1 hour'")))
+
+    listed = [
+        # (nombre, (consulta, huella), permite Sort en la consulta, permite Sort en la huella)
+        ("areas.list_areas", areas_list_query(user_id), False, False),
+        ("projects.list_projects?area_id", projects_list_query(user_id, area_id=area_id, limit=PAGE), False, False),
+        # Proyectos de todas las áreas del usuario: el orden global por nombre cruza
+        # áreas, así que un Sort (top-N) sobre sus proyectos es esperable.
+        ("projects.list_projects", projects_list_query(user_id, limit=PAGE), True, True),
+        ("projects.list_projects?cursor", projects_list_query(user_id, after=project_after, limit=PAGE), True, True),
+        ("project_next_actions.list", next_actions_list_query(project_id, limit=PAGE), False, False),
+        ("project_next_actions.list?cursor", next_actions_list_query(project_id, after=0, limit=PAGE), False, False),
+        ("one_shot_tasks.list", tasks_list_query(user_id, limit=PAGE), False, False),
+        ("one_shot_tasks.list?done=false", tasks_list_query(user_id, done=False, limit=PAGE), False, False),
+        ("one_shot_tasks.list?area_id", tasks_list_query(user_id, area_id=area_id, limit=PAGE), False, False),
+        ("one_shot_tasks.list?no_area", tasks_list_query(user_id, no_area=True, limit=PAGE), False, False),
+        ("one_shot_tasks.list?cursor", tasks_list_query(user_id, after=task_after, limit=PAGE), False, False),
+    ]
+    checks = []
+    for name, (stmt, fp), sort_allowed, fp_sort_allowed in listed:
+        checks += [(name, stmt, sort_allowed, set()), (f"{name} (huella)", fp, fp_sort_allowed, set())]
+    # Subconsulta de proyectos.list_projects: acciones de los proyectos de la página
+    checks.append(("projects.next_actions_of", next_actions_of_query([project_id]), False, set()))
+
+    # GET /dashboard: el árbol completo, ordenado en la BD; proyectos y acciones de todas
+    # las áreas cruzan índices, así que ahí un Sort es esperable.
+    dashboard_fp, *dashboard = dashboard_queries(user_id)
+    checks.append(("dashboard (huella)", dashboard_fp, False, set()))
+    checks += [
+        (f"dashboard.{name}", stmt, sort_allowed, set())
+        for name, stmt, sort_allowed in zip(
+            ("areas", "projects", "project_next_actions", "one_shot_tasks"), dashboard, (False, True, True, False)
+        )
+    ]
+
+    # GET /sync: cambios desde el cursor por el índice de updated_at de cada tabla (el orden
+    # por id de cada delta es pequeño, Sort permitido)
+    checks += [
+        (f"sync.{name}", stmt, True, {SYNC_INDEXES[name]})
+        for name, stmt in zip(
+            ("areas", "projects", "project_next_actions", "one_shot_tasks", "deleted_records"),
+            sync_queries(user_id, since_at),
+        )
+    ]
+
+    # GET /export: por id dentro de cada tabla del usuario (Sort sobre sus filas, permitido)
+    checks += [(f"export.{key}", query(user_id), True, PARENT_INDEXES[key]) for _, key, query, _ in EXPORT_TABLES]
+
+    # GET /search: la unión se ordena por rank, que no sale de ningún índice
+    checks += [
+        ("search", search_statement(user_id, "tarea"), True, set()),
+        ("search?type=project", search_statement(user_id, "proyecto", {"project"}), True, set()),
+    ]
+    return checks
+
+
+def plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def full_index_scan(node: dict) -> bool:
+    """Recorrido de índice sin condición de índice que filtra por usuario o padre después."""
+    if node["Node Type"] == "Bitmap Heap Scan":
+        bounded = all("Index Cond" in child for child in plan_nodes(node) if child["Node Type"] == "Bitmap Index Scan")
+    elif node["Node Type"] in ("Index Scan", "Index Only Scan"):
+        bounded = "Index Cond" in node
+    else:
+        return False
+    return not bounded and bool(PARENT_FILTER.search(node.get("Filter", "")))
+
+
+def main() -> int:
+    failures = 0
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            params = {
+                "users": USERS,
+                "areas": AREAS_PER_USER,
+                "projects": PROJECTS_PER_AREA,
+                "actions": ACTIONS_PER_PROJECT,
+                "tasks": TASKS_PER_USER,
+            }
+            for sql in SEED:
+                conn.execute(text(sql), params)
+            for table in ("users", "areas", "projects", "project_next_actions", "one_shot_tasks"):
+                conn.execute(text(f"ANALYZE {table}"))
+            conn.execute(text("SET LOCAL enable_seqscan = off"))
+
+            user_id, area_id, project_id = conn.execute(
+                text(
+                    """
+                    SELECT u.id, ar.id, pr.id
+                    FROM users u JOIN areas ar ON ar.user_id = u.id JOIN projects pr ON pr.area_id = ar.id
+                    WHERE u.email = 'plan-check-1@lifehub.local'
+                    ORDER BY ar.id, pr.id LIMIT 1
+                    """
+                )
+            ).one()
+
+            for name, stmt, sort_allowed, expected in queries(conn, user_id, area_id, project_id):
+                conn.execute(text(f"SET LOCAL enable_sort = {'on' if sort_allowed else 'off'}"))
+                compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+                plan = conn.exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+                ).scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                nodes = list(plan_nodes(plan[0]["Plan"]))
+                problems = [
+                    f"{n['Node Type']} on {n['Relation Name']}" for n in nodes if n["Node Type"] == "Seq Scan"
+                ]
+                problems += [
+                    f"{n['Node Type']} on {n.get('Index Name', n.get('Relation Name'))} (Filter: {n['Filter']})"
+                    for n in nodes
+                    if full_index_scan(n)
+                ]
+                if not sort_allowed:
+                    problems += [n["Node Type"] for n in nodes if n["Node Type"] in ("Sort", "Incremental Sort")]
+                used = {n["Index Name"] for n in nodes if "Index Name" in n}
+                if expected and not expected & used:
+                    problems.append(f"no usa {' / '.join(sorted(expected))}")
+                summary = " -> ".join(
+                    n["Node Type"] + (f" ({n['Index Name']})" if "Index Name" in n else "") for n in nodes
+                )
+                if problems:
+                    failures += 1
+                    print(f"FAIL {name}: {', '.join(problems)}\n     {summary}")
+                else:
+                    print(f"ok   {name}: {summary}")
+        finally:
+            trans.rollback()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""
+Purga tombstones (deleted_records) más antiguos que SYNC_TOMBSTONE_RETENTION_DAYS.
+Los clientes con un cursor anterior reciben una instantánea completa en GET /sync.
+Pensado para cron / tarea periódica.
+
+Uso: python scripts/prune_deleted_records.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import text
+from app.database import engine
+from app.routers.sync import SYNC_TOMBSTONE_RETENTION_DAYS
+
+SQL = "DELETE FROM deleted_records WHERE deleted_at < now() - make_interval(days => :days);"
+
+if __name__ == "__main__":
+    with engine.connect() as conn:
+        result = conn.execute(text(SQL), {"days": SYNC_TOMBSTONE_RETENTION_DAYS})
+        conn.commit()
+    print(f"Tombstones purgados: {result.rowcount}")
@@ -0,0 +1,47 @@
+"""
+Comprueba y recalcula los contadores de GET /stats (progress_stats, daily_completions)
+desde las tablas. Los triggers los mantienen al día; la deriva solo aparece si alguien
+escribió con los triggers desactivados o se restauró una copia parcial.
+
+Muestra las filas que no cuadran y, sin --check, lo recalcula todo en una transacción
+(las escrituras concurrentes esperan a que termine).
+
+Uso: python scripts/rebuild_progress_stats.py [--check]
+  --check  solo comprueba; sale con código 1 si hay deriva (para cron / CI)
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database import engine
+from app.progress_stats import drift, rebuild
+
+SHOWN_ROWS = 20
+
+
+def report(progress: list, completions: list) -> None:
+    print(f"Deriva: {len(progress)} filas de progress_stats, {len(completions)} de daily_completions")
+    for row in progress[:SHOWN_ROWS]:
+        print(
+            f"  {row.scope} {row.scope_id}: pendientes {row.pending} (debería {row.expected_pending}), "
+            f"hechas {row.done} (debería {row.expected_done})"
+        )
+    for row in completions[:SHOWN_ROWS]:
+        print(f"  usuario {row.user_id} {row.day}: hechas {row.completed} (debería {row.expected_completed})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="Solo comprobar (exit 1 si hay deriva)")
+    args = parser.parse_args()
+    with engine.connect() as conn:
+        progress, completions = drift(conn)
+        report(progress, completions)
+        if args.check:
+            conn.rollback()
+            sys.exit(1 if progress or completions else 0)
+        rebuild(conn)
+        conn.commit()
+    print("Contadores recalculados.")
@@ -0,0 +1,123 @@
+"""
+Aplica las migraciones pendientes de backend/migrations/ (NNNN_<nombre>.py) en orden.
+
+- La versión aplicada se guarda en la tabla schema_version (una fila por migración).
+- Si el esquema está al día sale tras una sola consulta, sin importar las migraciones.
+- Si hay pendientes toma un advisory lock de Postgres: con varias réplicas arrancando a
+  la vez, una migra y las demás esperan y después ven que ya no queda nada.
+- Cada migración va en su propia transacción junto con su fila de schema_version: si
+  falla, no queda a medias y el siguiente arranque la reintenta.
+
+Uso: python scripts/run_migrations.py [--status]
+  --status  muestra las migraciones aplicadas y pendientes sin aplicar nada
+"""
+import argparse
+import importlib
+import re
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from sqlalchemy import exc, text
+from sqlalchemy.engine import Connection
+from app.database import engine
+
+MIGRATIONS_DIR = BACKEND_DIR / "migrations"
+MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+# Clave del advisory lock (cualquier bigint fijo que no use otra parte de la app)
+LOCK_KEY = 7_245_031_001
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    duration_ms INTEGER NOT NULL
+);
+"""
+CURRENT_VERSION = "SELECT coalesce(max(version), 0) FROM schema_version"
+RECORD = "INSERT INTO schema_version (version, name, duration_ms) VALUES (:version, :name, :duration_ms)"
+UNDEFINED_TABLE = "42P01"
+
+
+def available() -> list[tuple[int, str]]:
+    """(versión, nombre del módulo) de cada fichero de migrations/, en orden."""
+    found = {}
+    for path in MIGRATIONS_DIR.glob("*.py"):
+        match = MIGRATION_FILE.match(path.name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in found:
+            sys.exit(f"Versión de migración repetida: {found[version]} y {path.stem}")
+        found[version] = path.stem
+    return sorted(found.items())
+
+
+def current_version(conn: Connection) -> int | None:
+    """Última versión aplicada; None si schema_version aún no existe (BD nueva o anterior)."""
+    try:
+        return conn.scalar(text(CURRENT_VERSION))
+    except exc.ProgrammingError as e:
+        if getattr(e.orig, "pgcode", None) != UNDEFINED_TABLE:
+            raise
+        conn.rollback()
+        return None
+
+
+def migrate(conn: Connection, migrations: list[tuple[int, str]]) -> None:
+    conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": LOCK_KEY})
+    conn.execute(text(CREATE_TABLE))
+    conn.commit()
+    try:
+        # Otra réplica pudo migrar mientras esperábamos el lock
+        version = current_version(conn)
+        for number, name in migrations:
+            if number <= version:
+                continue
+            print(f"  {name}...", flush=True)
+            started = time.perf_counter()
+            importlib.import_module(f"migrations.{name}").upgrade(conn)
+            duration_ms = round((time.perf_counter() - started) * 1000)
+            conn.execute(text(RECORD), {"version": number, "name": name, "duration_ms": duration_ms})
+            conn.commit()
+            print(f"  {name} aplicada en {duration_ms} ms.")
+    finally:
+        conn.rollback()
+        conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": LOCK_KEY})
+        conn.commit()
+
+
+def status(conn: Connection, migrations: list[tuple[int, str]]) -> None:
+    applied = {}
+    if current_version(conn) is not None:
+        applied = {row.version: row for row in conn.execute(text("SELECT * FROM schema_version"))}
+    for number, name in migrations:
+        row = applied.get(number)
+        print(f"  {name}: " + (f"aplicada {row.applied_at:%Y-%m-%d %H:%M} ({row.duration_ms} ms)" if row else "pendiente"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--status", action="store_true", help="Solo mostrar el estado")
+    args = parser.parse_args()
+    migrations = available()
+    latest = migrations[-1][0] if migrations else 0
+    with engine.connect() as conn:
+        if args.status:
+            status(conn, migrations)
+            sys.exit(0)
+        version = current_version(conn)
+        if version is not None and version >= latest:
+            if version > latest:
+                print(f"Aviso: la BD está en la versión {version}, posterior a la última migración conocida ({latest}).")
+            print(f"Esquema al día (versión {version}).")
+            sys.exit(0)
+        conn.rollback()
+        print(f"Aplicando migraciones (versión {version or 0} -> {latest})...")
+        migrate(conn, migrations)
+    print(f"Esquema al día (versión {latest}).")
@@ -0,0 +1,58 @@
+"""
+Tests de comportamiento contra una BD PostgreSQL real (DATABASE_URL, como el backend).
+
+Al empezar se aplican las migraciones pendientes (scripts/run_migrations.py). Cada test
+registra su propio usuario, así que no hace falta vaciar la BD entre tests; aun así,
+usa una BD de pruebas. Si no hay BD accesible, los tests se saltan.
+
+Uso (desde backend/): DATABASE_URL=postgresql://... python -m pytest -q
+"""
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from sqlalchemy import exc, text
+
+from app.database import engine
+
+PASSWORD = "test-password"
+
+
+@pytest.fixture(scope="session")
+def database():
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except exc.OperationalError as e:
+        pytest.skip(f"Sin BD de pruebas en DATABASE_URL: {e.orig}")
+    subprocess.run([sys.executable, str(BACKEND_DIR / "scripts" / "run_migrations.py")], check=True)
+    return engine
+
+
+@pytest.fixture(scope="session")
+def client(database):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+def register(client) -> dict:
+    """Registra un usuario nuevo y devuelve las cabeceras con su token."""
+    email = f"test-{uuid.uuid4().hex}@lifehub.local"
+    assert client.post("/auth/register", json={"email": email, "password": PASSWORD}).status_code == 200
+    token = client.post("/auth/login", json={"email": email, "password": PASSWORD}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def auth(client) -> dict:
+    return register(client)
@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+from app import change_feed as change_feed_module
+from app.change_feed import ChangeFeed
+from app.security import create_access_token, create_stream_token, decode_access_token, decode_stream_token
+
+
+def notify(feed: ChangeFeed, user_id: int, **event) -> None:
+    feed._on_notification(None, 0, change_feed_module.CHANGE_FEED_CHANNEL, json.dumps({"user_id": user_id, **event}))
+
+
+def test_slow_subscriber_overflows_into_a_single_resync(monkeypatch):
+    monkeypatch.setattr(change_feed_module, "CHANGE_FEED_QUEUE_SIZE", 2)
+    feed = ChangeFeed("postgresql://sin-conexion")
+    monkeypatch.setattr(feed, "start", lambda: None)  # sin LISTEN: los eventos se inyectan a mano
+
+    async def scenario():
+        slow, other = feed.subscribe(1), feed.subscribe(2)
+        for n in range(4):
+            notify(feed, 1, table="areas", op="UPDATE", id=n)
+        notify(feed, 2, table="areas", op="INSERT", id=99)
+
+        # Lo pendiente se descarta y queda solo la marca de resync; el resto de usuarios no se entera
+        assert slow.overflowed and slow.queue.qsize() == 1 and slow.queue.get_nowait() is None
+        assert feed.events_dropped == 1
+        assert other.queue.get_nowait() == {"table": "areas", "op": "INSERT", "id": 99}
+
+        slow.overflowed = False  # lo que hace el stream tras enviar `resync`
+        notify(feed, 1, table="areas", op="DELETE", id=7)
+        assert slow.queue.get_nowait() == {"table": "areas", "op": "DELETE", "id": 7}
+
+        notify(feed, 1, op="resync")  # POST /import: cambio masivo
+        assert slow.overflowed and slow.queue.get_nowait() is None
+        feed.unsubscribe(slow)
+        feed.unsubscribe(other)
+        assert feed.snapshot()["subscribers"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_stream_tokens_and_session_tokens_are_not_interchangeable():
+    stream_token = create_stream_token(7, session_expires_at=1_900_000_000)
+    assert decode_access_token(stream_token) is None
+    assert decode_stream_token(stream_token)["session_exp"] == 1_900_000_000
+    assert decode_stream_token(create_access_token({"sub": "7"})) is None
+
+
+def test_stream_token_is_issued_to_the_session_and_not_a_bearer(client, auth):
+    response = client.post("/changes/stream-token", headers=auth)
+    assert response.status_code == 200
+    stream_token = response.json()["stream_token"]
+    assert client.get("/auth/me", headers={"Authorization": f"Bearer {stream_token}"}).status_code == 401
+
+    session_token = auth["Authorization"].split(" ", 1)[1]
+    assert client.get("/changes/stream", params={"stream_token": session_token}).status_code == 401
+    assert client.post("/changes/stream-token").status_code == 401
@@ -0,0 +1,48 @@
+def test_dashboard_nests_areas_projects_and_next_actions(client, auth):
+    home = client.post("/areas", json={"name": "Casa"}, headers=auth).json()["id"]
+    work = client.post("/areas", json={"name": "Trabajo"}, headers=auth).json()["id"]
+    kitchen = client.post("/projects", json={"area_id": home, "name": "Cocina"}, headers=auth).json()["id"]
+    garden = client.post("/projects", json={"area_id": home, "name": "Jardín"}, headers=auth).json()["id"]
+    report = client.post("/projects", json={"area_id": work, "name": "Informe"}, headers=auth).json()["id"]
+    for project, title in ((kitchen, "Pintar"), (kitchen, "Cambiar grifo"), (report, "Escribir índice")):
+        client.post(f"/projects/{project}/next-actions", json={"title": title}, headers=auth)
+    # Un lote es una transacción: las tres comparten created_at y solo el id desempata
+    operations = [
+        {"op": "create", "title": "Regar", "area_id": home},
+        {"op": "create", "title": "Llamar", "area_id": home},
+        {"op": "create", "title": "Suelta"},
+    ]
+    created = client.post("/one-shot-tasks/batch", json={"operations": operations}, headers=auth).json()
+    watered, called, loose = (result["id"] for result in created["results"])
+
+    dashboard = client.get("/dashboard", headers=auth).json()
+
+    areas = {area["name"]: area for area in dashboard["areas"]}
+    assert list(areas) == ["Casa", "Trabajo"]
+    assert [p["id"] for p in areas["Casa"]["projects"]] == [kitchen, garden]
+    assert [a["title"] for a in areas["Casa"]["projects"][0]["next_actions"]] == ["Pintar", "Cambiar grifo"]
+    assert areas["Casa"]["projects"][1]["next_actions"] == []
+    assert [a["title"] for a in areas["Trabajo"]["projects"][0]["next_actions"]] == ["Escribir índice"]
+    assert [t["id"] for t in areas["Casa"]["one_shot_tasks"]] == [called, watered]
+    assert areas["Trabajo"]["one_shot_tasks"] == []
+    assert [t["id"] for t in dashboard["one_shot_tasks"]] == [loose]
+
+
+def test_dashboard_query_count_does_not_grow_with_projects(client, auth):
+    area = client.post("/areas", json={"name": "Casa"}, headers=auth).json()["id"]
+
+    def add_project(n: int) -> None:
+        project = client.post("/projects", json={"area_id": area, "name": f"Proyecto {n}"}, headers=auth).json()
+        client.post(f"/projects/{project['id']}/next-actions", json={"title": "Acción"}, headers=auth)
+        client.post("/one-shot-tasks", json={"title": f"Tarea {n}", "area_id": area}, headers=auth)
+
+    counts = []
+    for total in (1, 10):
+        while len(client.get("/projects", headers=auth).json()) < total:
+            add_project(total)
+        response = client.get("/dashboard", headers=auth)
+        assert response.headers["x-cache"] == "MISS"
+        assert sum(len(p["next_actions"]) for p in response.json()["areas"][0]["projects"]) == total
+        counts.append(int(response.headers["x-db-queries"]))
+
+    assert counts[0] == counts[1] > 0
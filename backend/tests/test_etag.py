@@ -0,0 +1,51 @@
+from sqlalchemy import select, text
+
+from app.etag import fingerprint
+from app.models import OneShotTask
+
+
+def test_one_shot_etag_changes_when_area_is_deleted(client, auth):
+    area = client.post("/areas", json={"name": "Temporal"}, headers=auth).json()
+    task = client.post("/one-shot-tasks", json={"title": "En área", "area_id": area["id"]}, headers=auth).json()
+    first = client.get("/one-shot-tasks", headers=auth)
+    assert client.get("/one-shot-tasks", headers={**auth, "If-None-Match": first.headers["etag"]}).status_code == 304
+
+    assert client.delete(f"/areas/{area['id']}", headers=auth).status_code == 204
+
+    after = client.get("/one-shot-tasks", headers={**auth, "If-None-Match": first.headers["etag"]})
+    assert after.status_code == 200
+    assert after.json() == [{**task, "area_id": None, "updated_at": after.json()[0]["updated_at"]}]
+
+
+def test_one_shot_fingerprint_sees_area_id_changes_without_updated_at(database, client, auth):
+    """ON DELETE SET NULL sin triggers (p. ej. antes de la migración de updated_at)."""
+    area = client.post("/areas", json={"name": "Temporal"}, headers=auth).json()
+    task = client.post("/one-shot-tasks", json={"title": "En área", "area_id": area["id"]}, headers=auth).json()
+    stmt = select(*fingerprint(OneShotTask.id, OneShotTask.updated_at, OneShotTask.area_id)).where(
+        OneShotTask.id == task["id"]
+    )
+    with database.connect() as conn:
+        before = conn.execute(stmt).one()
+        conn.execute(text("SET LOCAL session_replication_role = replica"))  # sin triggers de usuario
+        conn.execute(text("UPDATE one_shot_tasks SET area_id = NULL WHERE id = :id"), {"id": task["id"]})
+        after = conn.execute(stmt).one()
+        conn.rollback()
+    assert before[:3] == after[:3]
+    assert before != after
+
+
+def test_page_etag_only_covers_the_page(client, auth):
+    """Con ?limit= la huella es la de la página (y la fila de más que decide X-Next-Cursor)."""
+    oldest, middle, newest = (
+        client.post("/one-shot-tasks", json={"title": title}, headers=auth).json() for title in ("A", "B", "C")
+    )
+    params = {"limit": 1}
+    page = client.get("/one-shot-tasks", params=params, headers=auth)
+    assert [t["id"] for t in page.json()] == [newest["id"]]
+    conditional = {**auth, "If-None-Match": page.headers["etag"]}
+
+    client.patch(f"/one-shot-tasks/{oldest['id']}", json={"title": "A2"}, headers=auth)
+    assert client.get("/one-shot-tasks", params=params, headers=conditional).status_code == 304
+
+    client.patch(f"/one-shot-tasks/{middle['id']}", json={"done": True}, headers=auth)
+    assert client.get("/one-shot-tasks", params=params, headers=conditional).status_code == 200
@@ -0,0 +1,48 @@
+import asyncio
+import gzip
+import os
+
+import orjson
+
+from app.routers import export
+
+
+def test_gzip_export_matches_the_plain_one(client, auth, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_CHUNK_ROWS", 2)  # varios bloques por tabla
+    area = client.post("/areas", json={"name": "Casa"}, headers=auth).json()["id"]
+    for n in range(5):
+        client.post("/one-shot-tasks", json={"title": f"Tarea {n}", "area_id": area}, headers=auth)
+
+    plain = client.get("/export", headers=auth)
+    packed = client.get("/export", params={"gzip": "true"}, headers=auth)
+
+    assert packed.status_code == 200
+    assert packed.headers["content-type"] == "application/gzip"
+    assert packed.headers["content-disposition"].endswith('.ndjson.gz"')
+    assert "content-encoding" not in packed.headers  # el cliente recibe el .gz tal cual
+    assert gzip.decompress(packed.content) == plain.content
+    rows = [orjson.loads(line) for line in plain.content.splitlines()]
+    assert [row["type"] for row in rows] == ["area"] + ["one_shot_task"] * 5
+
+
+def test_gzip_emits_compressed_data_before_the_source_ends():
+    """Se comprime bloque a bloque: la salida empieza antes de leer toda la exportación."""
+    blocks = [os.urandom(64 * 1024) for _ in range(4)]
+    read = []
+
+    async def source():
+        for block in blocks:
+            read.append(block)
+            yield block
+
+    async def scenario():
+        output, read_when_first_output = [], None
+        async for data in export._gzip(source()):
+            if read_when_first_output is None:
+                read_when_first_output = len(read)
+            output.append(data)
+        return output, read_when_first_output
+
+    output, read_when_first_output = asyncio.run(scenario())
+    assert read_when_first_output < len(blocks)
+    assert gzip.decompress(b"".join(output)) == b"".join(blocks)
@@ -0,0 +1,71 @@
+import gzip
+import json
+
+
+def ndjson(*rows) -> bytes:
+    return "".join(json.dumps(row) + "\n" for row in rows).encode()
+
+
+def test_import_remaps_ids_and_links_the_hierarchy(client, auth):
+    body = ndjson(
+        {"type": "area", "id": 7, "name": "Casa", "color": "#123456"},
+        {"type": "project", "id": 70, "area_id": 7, "name": "Reforma", "icon": "🏠"},
+        {"type": "project_next_action", "project_id": 70, "title": "Pedir presupuesto", "done": True},
+        {"type": "one_shot_task", "area_id": 7, "title": "Comprar bombillas"},
+        {"type": "one_shot_task", "area_id": None, "title": "Suelta", "user_id": 999},
+    )
+    response = client.post("/import", content=gzip.compress(body), params={"gzip": "true"}, headers=auth)
+    assert response.status_code == 200, response.text
+    counts = response.json()
+    assert (counts["areas"], counts["projects"], counts["project_next_actions"], counts["one_shot_tasks"]) == (1, 1, 1, 2)
+
+    [area] = client.get("/areas", headers=auth).json()
+    [project] = client.get("/projects", headers=auth).json()
+    assert project["area_id"] == area["id"] and project["icon"] == "🏠"
+    assert [(na["title"], na["done"]) for na in project["next_actions"]] == [("Pedir presupuesto", True)]
+    tasks = {t["title"]: t["area_id"] for t in client.get("/one-shot-tasks", headers=auth).json()}
+    assert tasks == {"Comprar bombillas": area["id"], "Suelta": None}
+
+
+def test_import_reports_row_errors_and_inserts_nothing(client, auth):
+    body = ndjson(
+        {"type": "area", "id": 1, "name": "ok", "color": "#12345678"},
+        {"type": "project", "id": 2, "area_id": 99, "name": "Huérfano"},
+        {"type": "project_next_action", "project_id": 2, "title": "x" * 501},
+        {"type": "area", "id": 3, "name": "n" * 256},
+    )
+    response = client.post("/import", content=body, headers=auth)
+
+    assert response.status_code == 422
+    errors = response.json()["detail"]
+    assert [e["row"] for e in errors] == [1, 3, 4]
+    assert errors[0]["error"].startswith("color:")
+    assert client.get("/areas", headers=auth).json() == []
+
+
+def test_import_reports_orphan_references(client, auth):
+    body = ndjson(
+        {"type": "area", "id": 1, "name": "ok"},
+        {"type": "project", "id": 2, "area_id": 99, "name": "Huérfano"},
+    )
+    response = client.post("/import", content=body, headers=auth)
+    assert response.status_code == 422
+    assert [e["row"] for e in response.json()["detail"]] == [2]
+
+
+def test_over_long_values_are_422_on_regular_writes(client, auth):
+    assert client.post("/areas", json={"name": "ok", "color": "#12345678"}, headers=auth).status_code == 422
+    assert client.post("/one-shot-tasks", json={"title": "x" * 501}, headers=auth).status_code == 422
+
+
+def test_malformed_bodies_are_422_not_500(client, auth):
+    cases = [
+        ("csv", b"type,id,name\narea,1,ok\narea,2,\xff\n", "UTF-8 incorrecto en la línea 3"),
+        ("json", b'{"areas": [{"id": 1, "name": "\xff"}]}', "UTF-8 incorrecto en el byte 30"),
+        ("json", b'{[1]: []}', "tabla desconocida"),
+    ]
+    for format, body, error in cases:
+        response = client.post("/import", content=body, params={"format": format}, headers=auth)
+        assert response.status_code == 422, response.text
+        [detail] = response.json()["detail"]
+        assert error in detail["error"]
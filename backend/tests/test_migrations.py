@@ -0,0 +1,129 @@
+"""
+scripts/run_migrations.py sobre un esquema vacío propio de cada test (search_path), sin
+tocar el de la BD de pruebas.
+"""
+import importlib.util
+import os
+import subprocess
+import sys
+import types
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from app.progress_stats import drift
+from conftest import BACKEND_DIR
+
+SCRIPT = BACKEND_DIR / "scripts" / "run_migrations.py"
+
+spec = importlib.util.spec_from_file_location("run_migrations", SCRIPT)
+run_migrations = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(run_migrations)
+
+LATEST = run_migrations.available()[-1][0]
+
+
+@pytest.fixture
+def schema(database):
+    name = f"test_migrations_{uuid.uuid4().hex[:12]}"
+    with database.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {name}"))
+    yield name
+    with database.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {name} CASCADE"))
+
+
+def schema_url(database, schema: str) -> str:
+    url = database.url.update_query_dict({"options": f"-csearch_path={schema}"})
+    return url.render_as_string(hide_password=False)
+
+
+def run(database, schema: str, *args: str) -> str:
+    env = {**os.environ, "DATABASE_URL": schema_url(database, schema)}
+    result = subprocess.run([sys.executable, str(SCRIPT), *args], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def versions(database, schema: str) -> list[int]:
+    with database.connect() as conn:
+        return list(conn.scalars(text(f"SELECT version FROM {schema}.schema_version ORDER BY version")))
+
+
+def test_fresh_schema_applies_every_migration_once(database, schema):
+    output = run(database, schema)
+
+    assert f"Aplicando migraciones (versión 0 -> {LATEST})" in output
+    assert versions(database, schema) == list(range(1, LATEST + 1))
+    with database.connect() as conn:
+        tables = set(conn.scalars(text("SELECT tablename FROM pg_tables WHERE schemaname = :s"), {"s": schema}))
+        triggers = conn.scalar(
+            text(f"SELECT count(*) FROM pg_trigger WHERE tgrelid = '{schema}.one_shot_tasks'::regclass AND NOT tgisinternal")
+        )
+    assert {"users", "areas", "projects", "project_next_actions", "one_shot_tasks", "progress_stats"} <= tables
+    assert triggers > 0
+
+    assert run(database, schema) == f"Esquema al día (versión {LATEST}).\n"
+    assert "pendiente" not in run(database, schema, "--status")
+
+
+def test_concurrent_runners_apply_each_migration_once(database, schema):
+    with ThreadPoolExecutor(2) as pool:
+        outputs = list(pool.map(lambda _: run(database, schema), range(2)))
+
+    assert all(f"Esquema al día (versión {LATEST})." in output for output in outputs)
+    assert versions(database, schema) == list(range(1, LATEST + 1))
+
+
+def test_failed_migration_rolls_back_and_releases_the_lock(database, schema, monkeypatch):
+    run(database, schema)
+
+    def upgrade(conn):
+        conn.execute(text("CREATE TABLE half_done (id INTEGER)"))
+        conn.execute(text("SELECT 1 / 0"))
+
+    monkeypatch.setitem(sys.modules, "migrations.9999_broken", types.SimpleNamespace(upgrade=upgrade))
+    engine = create_engine(make_url(schema_url(database, schema)))
+    try:
+        with engine.connect() as conn, pytest.raises(Exception, match="division by zero"):
+            run_migrations.migrate(conn, [*run_migrations.available(), (9999, "9999_broken")])
+        with engine.connect() as conn:
+            assert conn.scalar(text("SELECT to_regclass('half_done')")) is None
+            assert conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": run_migrations.LOCK_KEY})
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": run_migrations.LOCK_KEY})
+    finally:
+        engine.dispose()
+    assert versions(database, schema)[-1] == LATEST
+
+
+def test_stats_are_rebuilt_for_data_that_predates_them(database, schema):
+    """0009 solo instala los triggers; 0012 calcula los contadores de lo que ya había."""
+    engine = create_engine(make_url(schema_url(database, schema)))
+    migrations = run_migrations.available()
+    before_stats = [m for m in migrations if m[0] < 9]
+    try:
+        with engine.connect() as conn:
+            run_migrations.migrate(conn, before_stats)
+            conn.execute(text("INSERT INTO users (email, password_hash) VALUES ('stats@lifehub.local', 'x')"))
+            conn.execute(text("INSERT INTO areas (user_id, name) SELECT id, 'Casa' FROM users"))
+            conn.execute(text("INSERT INTO projects (area_id, name) SELECT id, 'Reforma' FROM areas"))
+            conn.execute(
+                text(
+                    "INSERT INTO project_next_actions (project_id, title, done) "
+                    "SELECT p.id, 'Acción ' || n, n = 1 FROM projects p, generate_series(1, 3) n"
+                )
+            )
+            conn.execute(text("INSERT INTO one_shot_tasks (user_id, title, done) SELECT id, 'Hecha', true FROM users"))
+            conn.commit()
+
+            run_migrations.migrate(conn, migrations)
+            user = conn.execute(text("SELECT pending, done FROM progress_stats WHERE scope = 'user'")).one()
+            completed = conn.scalar(text("SELECT sum(completed) FROM daily_completions"))
+            assert drift(conn) == ([], [])
+    finally:
+        engine.dispose()
+    assert tuple(user) == (2, 2)
+    assert completed == 2
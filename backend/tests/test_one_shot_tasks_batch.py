@@ -0,0 +1,57 @@
+from conftest import register
+
+
+def batch(client, auth, *operations):
+    response = client.post("/one-shot-tasks/batch", json={"operations": list(operations)}, headers=auth)
+    assert response.status_code == 200, response.text
+    return response.json()["results"]
+
+
+def test_batch_applies_valid_operations_and_reports_the_rest(client, auth):
+    area = client.post("/areas", json={"name": "Casa"}, headers=auth).json()
+    keep, remove = (client.post("/one-shot-tasks", json={"title": t}, headers=auth).json() for t in ("A", "B"))
+
+    results = batch(
+        client,
+        auth,
+        {"op": "create", "title": " Nueva ", "area_id": area["id"], "done": True},
+        {"op": "update", "id": keep["id"], "done": True},
+        {"op": "delete", "id": remove["id"]},
+        {"op": "create", "title": "  "},
+        {"op": "update", "id": keep["id"], "title": "otra vez"},
+        {"op": "delete", "id": 2_000_000_000},
+        {"op": "create", "title": "X", "area_id": 2_000_000_000},
+    )
+
+    assert [r["ok"] for r in results] == [True, True, True, False, False, False, False]
+    assert [r["index"] for r in results] == list(range(7))
+    assert results[0]["task"]["title"] == "Nueva" and results[0]["task"]["area_id"] == area["id"]
+    assert results[1]["task"] == {**keep, "done": True, "updated_at": results[1]["task"]["updated_at"]}
+    assert results[3]["detail"] == "El título es obligatorio"
+    assert results[4]["detail"] == "Tarea repetida en el lote"
+    assert results[5]["detail"] == "Tarea no encontrada"
+    assert results[6]["detail"] == "Área no encontrada"
+    titles = {t["title"]: t["done"] for t in client.get("/one-shot-tasks", headers=auth).json()}
+    assert titles == {"Nueva": True, "A": True}
+
+
+def test_batch_cannot_touch_other_users_tasks(client, auth):
+    other = register(client)
+    task = client.post("/one-shot-tasks", json={"title": "Ajena"}, headers=other).json()
+    area = client.post("/areas", json={"name": "Ajena"}, headers=other).json()
+
+    results = batch(
+        client,
+        auth,
+        {"op": "update", "id": task["id"], "title": "Mía"},
+        {"op": "delete", "id": task["id"]},
+        {"op": "create", "title": "En área ajena", "area_id": area["id"]},
+    )
+
+    assert [(r["ok"], r["detail"]) for r in results] == [
+        (False, "Tarea no encontrada"),
+        (False, "Tarea no encontrada"),
+        (False, "Área no encontrada"),
+    ]
+    assert client.get(f"/one-shot-tasks/{task['id']}", headers=other).json()["title"] == "Ajena"
+    assert client.get("/one-shot-tasks", headers=auth).json() == []
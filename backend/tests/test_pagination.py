@@ -0,0 +1,82 @@
+from datetime import datetime
+
+import pytest
+
+from app.pagination import encode_cursor
+
+
+def page_through(client, auth, url, limit, **params) -> list[int]:
+    """Recorre el listado con ?limit= siguiendo X-Next-Cursor; ids en el orden recibido."""
+    ids, cursor = [], None
+    while True:
+        query = {**params, "limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(url, params=query, headers=auth)
+        assert response.status_code == 200, response.text
+        ids += [row["id"] for row in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return ids
+        assert len(ids) < 1000
+
+
+def test_one_shot_pages_have_no_duplicates_or_gaps_with_tied_keys(client, auth):
+    area = client.post("/areas", json={"name": "Casa"}, headers=auth).json()["id"]
+    # Un lote es una transacción: todas comparten created_at y solo el id desempata
+    operations = [
+        {"op": "create", "title": f"Tarea {n}", "done": n % 3 == 0, "area_id": area if n % 2 else None}
+        for n in range(11)
+    ]
+    assert client.post("/one-shot-tasks/batch", json={"operations": operations}, headers=auth).status_code == 200
+    for n in range(3):
+        client.post("/one-shot-tasks", json={"title": f"Suelta {n}"}, headers=auth)
+
+    cases = [{}, {"done": "true"}, {"done": "false"}, {"area_id": area}, {"no_area": "true"}]
+    for params in cases:
+        full = client.get("/one-shot-tasks", params=params, headers=auth).json()
+        for limit in (1, 2, 5):
+            assert page_through(client, auth, "/one-shot-tasks", limit, **params) == [t["id"] for t in full]
+
+    assert len(client.get("/one-shot-tasks", headers=auth).json()) == 14
+    done = client.get("/one-shot-tasks", params={"done": "true"}, headers=auth).json()
+    assert len(done) == 4 and all(t["done"] for t in done)
+    in_area = client.get("/one-shot-tasks", params={"area_id": area}, headers=auth).json()
+    assert len(in_area) == 5 and all(t["area_id"] == area for t in in_area)
+    no_area = client.get("/one-shot-tasks", params={"no_area": "true"}, headers=auth).json()
+    assert len(no_area) == 9 and all(t["area_id"] is None for t in no_area)
+    # Pendientes primero; dentro de cada grupo, más recientes (y a igualdad, id mayor) antes
+    full = client.get("/one-shot-tasks", headers=auth).json()
+    keys = [(t["done"], t["created_at"], t["id"]) for t in full]
+    assert keys == sorted(keys, key=lambda k: (k[0], -datetime.fromisoformat(k[1]).timestamp(), -k[2]))
+
+
+def test_project_and_next_action_pages_follow_the_full_listing(client, auth):
+    area = client.post("/areas", json={"name": "Trabajo"}, headers=auth).json()["id"]
+    for name in ("B", "A", "B", "C", "A"):
+        client.post("/projects", json={"area_id": area, "name": name}, headers=auth)
+    full = client.get("/projects", headers=auth).json()
+    assert [p["name"] for p in full] == ["A", "A", "B", "B", "C"]
+    for limit in (1, 2):
+        assert page_through(client, auth, "/projects", limit) == [p["id"] for p in full]
+        assert page_through(client, auth, "/projects", limit, area_id=area) == [p["id"] for p in full]
+
+    url = f"/projects/{full[0]['id']}/next-actions"
+    for n in range(5):
+        client.post(url, json={"title": f"Acción {n}"}, headers=auth)
+    actions = [na["id"] for na in client.get(url, headers=auth).json()]
+    assert page_through(client, auth, url, 2) == actions == sorted(actions)
+
+
+@pytest.mark.parametrize(
+    "url, cursor",
+    [
+        ("/one-shot-tasks", "no-es-un-cursor"),
+        ("/one-shot-tasks", encode_cursor([False, "ayer", 1])),
+        ("/one-shot-tasks", encode_cursor([False, datetime(2024, 1, 1), 1])),
+        ("/one-shot-tasks", encode_cursor([1, 2])),
+        ("/projects", encode_cursor(["A"])),
+    ],
+)
+def test_malformed_cursor_is_400(client, auth, url, cursor):
+    response = client.get(url, params={"limit": 2, "cursor": cursor}, headers=auth)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor inválido"
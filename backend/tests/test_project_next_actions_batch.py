@@ -0,0 +1,65 @@
+from conftest import register
+
+
+def create_project(client, auth, name="Proyecto"):
+    area = client.post("/areas", json={"name": "Área"}, headers=auth).json()
+    return client.post("/projects", json={"area_id": area["id"], "name": name}, headers=auth).json()
+
+
+def batch(client, auth, project_id, *operations):
+    response = client.post(
+        f"/projects/{project_id}/next-actions/batch", json={"operations": list(operations)}, headers=auth
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["results"]
+
+
+def test_batch_applies_valid_operations_and_reports_the_rest(client, auth):
+    project = create_project(client, auth)
+    url = f"/projects/{project['id']}/next-actions"
+    keep, remove = (client.post(url, json={"title": t}, headers=auth).json() for t in ("A", "B"))
+
+    results = batch(
+        client,
+        auth,
+        project["id"],
+        {"op": "create", "title": "Nueva"},
+        {"op": "update", "id": keep["id"], "done": True},
+        {"op": "delete", "id": remove["id"]},
+        {"op": "delete", "id": remove["id"]},
+        {"op": "update", "id": keep["id"], "title": ""},
+        {"op": "delete", "id": 2_000_000_000},
+    )
+
+    assert [r["ok"] for r in results] == [True, True, True, False, False, False]
+    assert results[1]["next_action"]["done"] is True
+    assert results[3]["detail"] == "Siguiente acción repetida en el lote"
+    assert results[5]["detail"] == "Siguiente acción no encontrada"
+    assert {(na["title"], na["done"]) for na in client.get(url, headers=auth).json()} == {("Nueva", False), ("A", True)}
+
+
+def test_batch_only_touches_actions_of_the_given_project(client, auth):
+    project = create_project(client, auth, "Uno")
+    sibling = create_project(client, auth, "Dos")
+    action = client.post(f"/projects/{sibling['id']}/next-actions", json={"title": "De Dos"}, headers=auth).json()
+
+    results = batch(
+        client,
+        auth,
+        project["id"],
+        {"op": "update", "id": action["id"], "done": True},
+        {"op": "delete", "id": action["id"]},
+    )
+
+    assert [r["ok"] for r in results] == [False, False]
+    assert client.get(f"/projects/{sibling['id']}/next-actions", headers=auth).json() == [action]
+
+
+def test_batch_on_another_users_project_is_404(client, auth):
+    project = create_project(client, register(client))
+    response = client.post(
+        f"/projects/{project['id']}/next-actions/batch",
+        json={"operations": [{"op": "create", "title": "Intrusa"}]},
+        headers=auth,
+    )
+    assert response.status_code == 404
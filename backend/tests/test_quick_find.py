@@ -0,0 +1,31 @@
+from app.quick_find import quick_find_index
+
+
+def test_index_follows_creates_renames_and_deletes(client, auth):
+    def names(prefix: str) -> list[str]:
+        response = client.get("/quick-find", params={"prefix": prefix}, headers=auth)
+        assert response.status_code == 200
+        return [item["name"] for item in response.json()]
+
+    home = client.post("/areas", json={"name": "Casa"}, headers=auth).json()["id"]
+    client.post("/projects", json={"area_id": home, "name": "Cocina nueva"}, headers=auth)
+    assert names("coc") == ["Cocina nueva"]  # construye el índice del usuario
+    builds = quick_find_index.builds
+
+    work = client.post("/areas", json={"name": "Comercial"}, headers=auth).json()["id"]
+    patio = client.post("/projects", json={"area_id": home, "name": "Patio"}, headers=auth).json()["id"]
+    client.post("/projects", json={"area_id": work, "name": "Cotizaciones"}, headers=auth)
+    assert names("co") == ["Cocina nueva", "Comercial", "Cotizaciones"]
+    assert names("nue") == ["Cocina nueva"]
+
+    client.patch(f"/projects/{patio}", json={"name": "Jardín"}, headers=auth)
+    assert names("pat") == []
+    assert names("jardin") == ["Jardín"]
+
+    assert client.delete(f"/projects/{patio}", headers=auth).status_code == 204
+    assert names("jar") == []
+    # Borrar un área se lleva sus proyectos (ON DELETE CASCADE) también del índice
+    assert client.delete(f"/areas/{work}", headers=auth).status_code == 204
+    assert names("co") == ["Cocina nueva"]
+
+    assert quick_find_index.builds == builds  # todo lo anterior sin volver a leer la BD
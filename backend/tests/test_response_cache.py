@@ -0,0 +1,68 @@
+import asyncio
+
+from sqlalchemy import text
+from starlette.requests import Request
+
+from app.response_cache import MemoryCacheBackend, user_id_from_request
+from app.routers import metrics
+from app.security import create_access_token
+from app.user_cache import user_cache
+
+
+def test_memory_versions_are_bounded_and_never_go_back():
+    backend = MemoryCacheBackend(max_bytes=1024, ttl_seconds=60, max_users=2)
+
+    async def scenario():
+        await backend.bump_version(1)
+        written = await backend.get_version(1)
+        await backend.bump_version(2)
+        await backend.bump_version(3)  # desaloja la versión del usuario 1
+        assert backend.info()["users"] == 2
+        assert await backend.get_version(1) >= written
+        await backend.bump_version(1)
+        assert await backend.get_version(1) > written
+        assert await backend.get_version(99) == backend._floor
+
+    asyncio.run(scenario())
+
+
+def test_token_with_non_numeric_sub_is_not_a_cache_user():
+    def request(sub: str) -> Request:
+        token = create_access_token({"sub": sub})
+        return Request({"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+    assert user_id_from_request(request("42")) == 42
+    assert user_id_from_request(request("no-numerico")) is None
+
+
+def test_cache_hits_keep_cors_headers(client, auth):
+    headers = {**auth, "Origin": "http://localhost:5173"}
+    miss = client.get("/areas", headers=headers)
+    hit = client.get("/areas", headers=headers)
+    assert (miss.headers["x-cache"], hit.headers["x-cache"]) == ("MISS", "HIT")
+    assert "access-control-allow-origin" in miss.headers
+    assert "access-control-allow-origin" in hit.headers
+    assert "ETag" in hit.headers["access-control-expose-headers"]
+
+
+def test_cache_hit_is_not_served_to_a_deleted_user(database, client, auth):
+    client.post("/areas", json={"name": "Cacheada"}, headers=auth)
+    assert client.get("/areas", headers=auth).headers["x-cache"] == "MISS"
+    assert client.get("/areas", headers=auth).headers["x-cache"] == "HIT"
+    user_id = client.get("/auth/me", headers=auth).json()["id"]
+
+    with database.begin() as conn:  # borrado fuera del ORM: no invalida user_cache
+        conn.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+    user_cache.invalidate(user_id)  # lo que haría la caducidad del TTL
+
+    assert client.get("/areas", headers=auth).status_code == 401
+
+
+def test_metrics_require_the_metrics_token(client, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "")
+    assert client.get("/metrics/db-pool").status_code == 404
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "secreto")
+    assert client.get("/metrics/db-pool").status_code == 403
+    assert client.get("/metrics/db-pool", headers={"X-Metrics-Token": "otro"}).status_code == 403
+    response = client.get("/metrics/response-cache", headers={"X-Metrics-Token": "secreto"})
+    assert response.status_code == 200 and "hits" in response.json()
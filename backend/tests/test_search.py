@@ -0,0 +1,41 @@
+import pytest
+
+from conftest import register
+
+
+@pytest.mark.parametrize("types", [["project"], ["one_shot_task", "project_next_action"]])
+def test_type_filter_without_areas(client, auth, types):
+    """La unión toma los nombres de columna de la primera rama, sea cual sea."""
+    area = client.post("/areas", json={"name": "Huerto"}, headers=auth).json()["id"]
+    project = client.post("/projects", json={"area_id": area, "name": "Huerto urbano"}, headers=auth).json()["id"]
+    client.post(f"/projects/{project}/next-actions", json={"title": "Comprar semillas de huerto"}, headers=auth)
+    client.post("/one-shot-tasks", json={"title": "Regar el huerto"}, headers=auth)
+
+    response = client.get("/search", params={"q": "huerto", "type": types}, headers=auth)
+
+    assert response.status_code == 200
+    assert sorted(r["type"] for r in response.json()) == sorted(types)
+    assert all(r["rank"] > 0 for r in response.json())
+
+
+def test_spanish_stems_and_accents(client, auth):
+    area = client.post("/areas", json={"name": "Logística"}, headers=auth).json()["id"]
+    project = client.post("/projects", json={"area_id": area, "name": "Mudanza en camión"}, headers=auth).json()["id"]
+    task = client.post("/one-shot-tasks", json={"title": "Revisar canciones"}, headers=auth).json()["id"]
+    other = register(client)
+    client.post("/areas", json={"name": "Camión ajeno"}, headers=other)
+
+    def found(q: str) -> set[tuple[str, int]]:
+        response = client.get("/search", params={"q": q}, headers=auth)
+        assert response.status_code == 200
+        return {(r["type"], r["id"]) for r in response.json()}
+
+    # Sin tildes en la consulta o en el texto, en ambos sentidos
+    assert found("camion") == found("CAMIÓN") == {("project", project)}
+    assert found("logistica") == {("area", area)}
+    # Plural → raíz del singular, y prefijos
+    assert found("camiones") == {("project", project)}
+    assert found("canción") == {("one_shot_task", task)}
+    assert found("mudan") == {("project", project)}
+    # Todas las palabras son obligatorias
+    assert found("mudanza canciones") == set()
@@ -0,0 +1,31 @@
+from app.progress_stats import drift
+
+
+def stats(client, auth):
+    response = client.get("/stats", headers=auth)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    areas = {row["area_id"]: (row["pending"], row["done"]) for row in body["areas"]}
+    projects = {row["project_id"]: (row["pending"], row["done"]) for row in body["projects"]}
+    return (body["pending"], body["done"]), areas, projects, sum(row["completed"] for row in body["completions"])
+
+
+def test_counters_follow_batches_moves_and_deletes(client, auth, database):
+    home, work = (client.post("/areas", json={"name": name}, headers=auth).json()["id"] for name in ("Casa", "Trabajo"))
+    project = client.post("/projects", json={"area_id": home, "name": "Reforma"}, headers=auth).json()["id"]
+    operations = [{"op": "create", "title": f"Acción {n}", "done": n < 2} for n in range(5)]
+    response = client.post(f"/projects/{project}/next-actions/batch", json={"operations": operations}, headers=auth)
+    assert response.status_code == 200, response.text
+    tasks = [{"op": "create", "title": "Suelta"}, {"op": "create", "title": "En casa", "area_id": home, "done": True}]
+    assert client.post("/one-shot-tasks/batch", json={"operations": tasks}, headers=auth).status_code == 200
+
+    assert stats(client, auth) == ((4, 3), {home: (3, 3)}, {project: (3, 2)}, 3)
+
+    assert client.patch(f"/projects/{project}", json={"area_id": work}, headers=auth).status_code == 200
+    assert stats(client, auth) == ((4, 3), {home: (0, 1), work: (3, 2)}, {project: (3, 2)}, 3)
+
+    assert client.delete(f"/projects/{project}", headers=auth).status_code == 204
+    assert stats(client, auth) == ((1, 1), {home: (0, 1)}, {}, 1)
+
+    with database.begin() as conn:
+        assert drift(conn) == ([], [])
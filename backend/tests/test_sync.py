@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from app.pagination import encode_cursor
+from conftest import register
+
+
+def test_full_snapshot_then_delta_with_tombstones(client, auth):
+    area = client.post("/areas", json={"name": "Trabajo"}, headers=auth).json()
+    project = client.post("/projects", json={"area_id": area["id"], "name": "Informe"}, headers=auth).json()
+    action = client.post(f"/projects/{project['id']}/next-actions", json={"title": "Borrador"}, headers=auth).json()
+    task = client.post("/one-shot-tasks", json={"title": "Llamar"}, headers=auth).json()
+
+    full = client.get("/sync", headers=auth).json()
+    assert full["full"] is True
+    assert [a["id"] for a in full["areas"]] == [area["id"]]
+    assert full["projects"] == [{k: v for k, v in project.items() if k != "next_actions"}]
+    assert full["project_next_actions"] == [action]
+    assert full["one_shot_tasks"] == [task]
+    assert full["deleted"] == []
+
+    client.patch(f"/one-shot-tasks/{task['id']}", json={"done": True}, headers=auth)
+    client.delete(f"/areas/{area['id']}", headers=auth)
+    delta = client.get("/sync", params={"since": full["cursor"]}, headers=auth).json()
+
+    assert delta["full"] is False
+    assert [(t["id"], t["done"]) for t in delta["one_shot_tasks"]] == [(task["id"], True)]
+    assert delta["areas"] == delta["projects"] == delta["project_next_actions"] == []
+    # Los hijos borrados en cascada no llevan tombstone: los cubre el del área
+    assert [(d["table"], d["id"]) for d in delta["deleted"]] == [("areas", area["id"])]
+
+
+def test_sync_only_returns_the_users_own_rows(client, auth):
+    other = register(client)
+    area = client.post("/areas", json={"name": "Ajena"}, headers=other).json()
+    client.post("/projects", json={"area_id": area["id"], "name": "Ajeno"}, headers=other)
+    client.post("/one-shot-tasks", json={"title": "Ajena"}, headers=other)
+    mine = client.get("/sync", headers=auth).json()
+    cursor = mine["cursor"]
+    client.delete(f"/areas/{area['id']}", headers=other)
+
+    for response in (mine, client.get("/sync", params={"since": cursor}, headers=auth).json()):
+        assert response["areas"] == response["projects"] == response["one_shot_tasks"] == []
+        assert response["deleted"] == []
+
+
+def test_cursor_without_timezone_is_rejected(client, auth):
+    naive = encode_cursor([datetime(2024, 1, 1)])
+    response = client.get("/sync", params={"since": naive}, headers=auth)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor inválido"